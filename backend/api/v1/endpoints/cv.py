@@ -1,12 +1,15 @@
-import io
+import time
 from typing import List
 
-from fastapi import APIRouter, Depends
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, Depends, File, Request, Response, UploadFile
+from fastapi.responses import FileResponse, HTMLResponse, RedirectResponse, StreamingResponse
 from dependency_injector.wiring import Provide, inject
+from starlette.background import BackgroundTask
 
 from app.core.container import Container
 from app.core.dependencies import get_current_user
+from app.core.etag import cache_headers, is_not_modified, make_etag, not_modified
+from app.core.timing import StageTimer
 from app.models.user import User
 from app.schemas.cv import (
     CertificateItem,
@@ -17,15 +20,33 @@ from app.schemas.cv import (
     PersonalInfoUpdate,
     ResumeCreateRequest,
     ResumeListItem,
+    ResumePatch,
     ResumeResponse,
     SkillItem,
     TemplateUpdate,
 )
+from app.schemas.export import (
+    BulkExportRequest,
+    ExportJobCreate,
+    ExportJobResponse,
+    LayoutEstimate,
+)
+from app.services.bulk_export import BulkExporter
 from app.services.cv_service import CvService
-from app.services.export_service import ExportService
+from app.services.export_admission import ExportAdmission
+from app.services.export_job_service import ExportJobService
+from app.services.export_renderer import ExportRenderer, template_label, timed_body
+from app.services.export_service import MEDIA_TYPES, PREVIEW_MEDIA_TYPE, ExportService, export_filename
+from app.services.layout_estimator import LayoutEstimator
+from app.services.photo_service import PhotoService
+from app.services.photo_variants import PHOTO_CONTENT_TYPE
+from app.services.text_export import TEXT_FORMATS
 
 router = APIRouter(tags=["Resumes"])
 
+# Part of the ETag of GET /{resume_id}; bump when ResumeResponse changes shape.
+RESUME_REPRESENTATION = "resume-v2"
+
 
 @router.post("", response_model=ResumeResponse)
 @inject
@@ -38,6 +59,64 @@ async def create_resume(
     return ResumeResponse.model_validate(resume)
 
 
+@router.post("/bulk-export")
+@inject
+async def bulk_export(
+    data: BulkExportRequest,
+    current_user: User = Depends(get_current_user),
+    service: CvService = Depends(Provide[Container.cv_service]),
+    exporter: BulkExporter = Depends(Provide[Container.bulk_exporter]),
+    admission: ExportAdmission = Depends(Provide[Container.export_admission]),
+):
+    resume_ids = list(dict.fromkeys(data.resume_ids))
+    resumes = await service.get_resumes_for_export(resume_ids, current_user)
+    token = await admission.acquire(current_user.id)
+
+    async def body():
+        # The archive renders while it streams, so the slot is held until
+        # the last chunk has been sent, and its lease is renewed on the way.
+        renewed = time.monotonic()
+        try:
+            async for chunk in exporter.stream_zip(resumes, data.formats):
+                if time.monotonic() - renewed > admission.lease / 3:
+                    await admission.renew(token, current_user.id)
+                    renewed = time.monotonic()
+                yield chunk
+        finally:
+            await admission.release(token, current_user.id)
+
+    try:
+        # The background task also releases the slot when the body never
+        # starts (client gone before the first chunk); release is idempotent.
+        return StreamingResponse(
+            body(),
+            media_type="application/zip",
+            headers={"Content-Disposition": 'attachment; filename="resumes.zip"'},
+            background=BackgroundTask(admission.release, token, current_user.id),
+        )
+    except Exception:
+        await admission.release(token, current_user.id)
+        raise
+
+
+@router.get("/photos/{photo_hash}/{variant}.jpg")
+@inject
+async def get_photo_variant(
+    photo_hash: str,
+    variant: str,
+    service: PhotoService = Depends(Provide[Container.photo_service]),
+):
+    # Variants are content-addressed and never change.
+    path, url = service.get_variant(photo_hash, variant)
+    if url:
+        return RedirectResponse(url)
+    return FileResponse(
+        path,
+        media_type=PHOTO_CONTENT_TYPE,
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
+
+
 @router.get("", response_model=List[ResumeListItem])
 @inject
 async def list_resumes(
@@ -52,11 +131,26 @@ async def list_resumes(
 @inject
 async def get_resume(
     resume_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
     service: CvService = Depends(Provide[Container.cv_service]),
-) -> ResumeResponse:
-    resume = await service.get_resume(resume_id, current_user)
-    return ResumeResponse.model_validate(resume)
+) -> Response:
+    # The document comes from the version-keyed cache when it is current
+    # (no database query at all), otherwise from one query that builds it
+    # in PostgreSQL; either way the ETag is derived from its version.
+    cached = await service.get_cached_resume_document(resume_id, current_user)
+    if cached is None and request.headers.get("if-none-match"):
+        # A revalidation is answered from the version alone; the document
+        # is only built when the client's copy is out of date.
+        stamp = await service.get_resume_stamp(resume_id, current_user)
+        etag = make_etag(resume_id, stamp.version, RESUME_REPRESENTATION)
+        if is_not_modified(request, etag):
+            return not_modified(etag)
+    version, document = cached or await service.get_resume_document(resume_id, current_user)
+    etag = make_etag(resume_id, version, RESUME_REPRESENTATION)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+    return Response(document, media_type="application/json", headers=cache_headers(etag))
 
 
 @router.delete("/{resume_id}")
@@ -70,6 +164,24 @@ async def delete_resume(
     return {"detail": "Resume deleted"}
 
 
+@router.patch("/{resume_id}", response_model=ResumeResponse)
+@inject
+async def save_resume(
+    resume_id: int,
+    data: ResumePatch,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    service: CvService = Depends(Provide[Container.cv_service]),
+) -> ResumeResponse:
+    # One transaction for an autosave that touches several parts of the
+    # resume, instead of one request (and commit) per section PUT.
+    resume = await service.save_resume(resume_id, current_user, data)
+    response.headers.update(
+        cache_headers(make_etag(resume.id, resume.version, RESUME_REPRESENTATION))
+    )
+    return ResumeResponse.model_validate(resume)
+
+
 @router.put("/{resume_id}/personal-info", response_model=ResumeResponse)
 @inject
 async def update_personal_info(
@@ -90,8 +202,8 @@ async def replace_education(
     current_user: User = Depends(get_current_user),
     service: CvService = Depends(Provide[Container.cv_service]),
 ):
-    await service.replace_education(resume_id, current_user, items)
-    return {"detail": "Education updated"}
+    sync = await service.replace_education(resume_id, current_user, items)
+    return {"detail": "Education updated", **sync.summary()}
 
 
 @router.put("/{resume_id}/experience")
@@ -102,8 +214,8 @@ async def replace_experience(
     current_user: User = Depends(get_current_user),
     service: CvService = Depends(Provide[Container.cv_service]),
 ):
-    await service.replace_experience(resume_id, current_user, items)
-    return {"detail": "Experience updated"}
+    sync = await service.replace_experience(resume_id, current_user, items)
+    return {"detail": "Experience updated", **sync.summary()}
 
 
 @router.put("/{resume_id}/skills")
@@ -114,8 +226,8 @@ async def replace_skills(
     current_user: User = Depends(get_current_user),
     service: CvService = Depends(Provide[Container.cv_service]),
 ):
-    await service.replace_skills(resume_id, current_user, items)
-    return {"detail": "Skills updated"}
+    sync = await service.replace_skills(resume_id, current_user, items)
+    return {"detail": "Skills updated", **sync.summary()}
 
 
 @router.put("/{resume_id}/languages")
@@ -126,8 +238,8 @@ async def replace_languages(
     current_user: User = Depends(get_current_user),
     service: CvService = Depends(Provide[Container.cv_service]),
 ):
-    await service.replace_languages(resume_id, current_user, items)
-    return {"detail": "Languages updated"}
+    sync = await service.replace_languages(resume_id, current_user, items)
+    return {"detail": "Languages updated", **sync.summary()}
 
 
 @router.put("/{resume_id}/certificates")
@@ -138,8 +250,8 @@ async def replace_certificates(
     current_user: User = Depends(get_current_user),
     service: CvService = Depends(Provide[Container.cv_service]),
 ):
-    await service.replace_certificates(resume_id, current_user, items)
-    return {"detail": "Certificates updated"}
+    sync = await service.replace_certificates(resume_id, current_user, items)
+    return {"detail": "Certificates updated", **sync.summary()}
 
 
 @router.put("/{resume_id}/custom-sections")
@@ -150,8 +262,8 @@ async def replace_custom_sections(
     current_user: User = Depends(get_current_user),
     service: CvService = Depends(Provide[Container.cv_service]),
 ):
-    await service.replace_custom_sections(resume_id, current_user, items)
-    return {"detail": "Custom sections updated"}
+    sync = await service.replace_custom_sections(resume_id, current_user, items)
+    return {"detail": "Custom sections updated", **sync.summary()}
 
 
 @router.put("/{resume_id}/template", response_model=ResumeResponse)
@@ -166,19 +278,129 @@ async def update_template(
     return ResumeResponse.model_validate(resume)
 
 
-@router.get("/{resume_id}/export/pdf")
+@router.post("/{resume_id}/photo", response_model=ResumeResponse)
 @inject
-async def export_pdf(
+async def upload_photo(
+    resume_id: int,
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_user),
+    service: PhotoService = Depends(Provide[Container.photo_service]),
+) -> ResumeResponse:
+    resume = await service.upload(resume_id, current_user, file)
+    return ResumeResponse.model_validate(resume)
+
+
+@router.get("/{resume_id}/preview", response_class=HTMLResponse)
+@inject
+async def preview_resume(
     resume_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
     service: CvService = Depends(Provide[Container.cv_service]),
 ):
+    timer = StageTimer()
+    with timer.stage("db"):
+        stamp = await service.get_resume_stamp(resume_id, current_user)
+    etag = _export_etag(stamp.id, stamp.updated_at, stamp.template_name, "html")
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    with timer.stage("db"):
+        resume = await service.get_resume_for_export(resume_id, current_user)
+    # Rendered inline: precompiled templates plus the fragment cache keep
+    # this to a few milliseconds, less than a round trip to the pool.
+    with timer.stage("html"):
+        html = ExportService.render_preview(resume)
+    return Response(
+        content=html,
+        media_type=PREVIEW_MEDIA_TYPE,
+        headers={
+            "Server-Timing": timer.server_timing(),
+            **cache_headers(_export_etag(resume.id, resume.updated_at, resume.template_name, "html")),
+        },
+    )
+
+
+@router.get("/{resume_id}/layout", response_model=LayoutEstimate)
+@inject
+async def estimate_layout(
+    resume_id: int,
+    request: Request,
+    response: Response,
+    current_user: User = Depends(get_current_user),
+    service: CvService = Depends(Provide[Container.cv_service]),
+    estimator: LayoutEstimator = Depends(Provide[Container.layout_estimator]),
+) -> LayoutEstimate:
+    stamp = await service.get_resume_stamp(resume_id, current_user)
+    etag = _export_etag(stamp.id, stamp.updated_at, stamp.template_name, "layout")
+    if is_not_modified(request, etag):
+        return not_modified(etag)
     resume = await service.get_resume_for_export(resume_id, current_user)
-    pdf_bytes = ExportService.generate_pdf(resume)
+    response.headers.update(
+        cache_headers(_export_etag(resume.id, resume.updated_at, resume.template_name, "layout"))
+    )
+    return estimator.estimate(resume)
+
+
+def _export_etag(resume_id: int, updated_at, template_name, fmt: str) -> str:
+    return make_etag(resume_id, updated_at, fmt, ExportService.layout_version(fmt, template_name))
+
+
+async def _export_response(
+    request: Request,
+    resume_id: int,
+    fmt: str,
+    user: User,
+    service: CvService,
+    renderer: ExportRenderer,
+    admission: ExportAdmission,
+) -> Response:
+    timer = StageTimer()
+    with timer.stage("db"):
+        stamp = await service.get_resume_stamp(resume_id, user)
+    etag = _export_etag(stamp.id, stamp.updated_at, stamp.template_name, fmt)
+    if is_not_modified(request, etag):
+        return not_modified(etag)
+
+    with timer.stage("db"):
+        resume = await service.get_resume_for_export(resume_id, user)
+    if fmt in TEXT_FORMATS:
+        # Rendered in this process in microseconds; nothing to admit.
+        artifact = await renderer.render(resume, fmt, timer)
+    else:
+        with timer.stage("admission"):
+            token = await admission.acquire(user.id)
+        try:
+            artifact = await renderer.render(resume, fmt, timer)
+        finally:
+            await admission.release(token, user.id)
     return StreamingResponse(
-        io.BytesIO(pdf_bytes),
-        media_type="application/pdf",
-        headers={"Content-Disposition": f'attachment; filename="resume_{resume_id}.pdf"'},
+        timed_body(artifact, fmt, template_label(resume)),
+        media_type=MEDIA_TYPES[fmt],
+        # The body removes a spool file once sent; this covers a body that
+        # never starts because the client went away first.
+        background=BackgroundTask(artifact.discard),
+        headers={
+            "Content-Length": str(artifact.size),
+            "Content-Disposition": f'attachment; filename="{export_filename(f"resume_{resume_id}", fmt)}"',
+            "Server-Timing": timer.server_timing(),
+            **cache_headers(_export_etag(resume.id, resume.updated_at, resume.template_name, fmt)),
+        },
+    )
+
+
+@router.get("/{resume_id}/export/pdf")
+@inject
+async def export_pdf(
+    resume_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    service: CvService = Depends(Provide[Container.cv_service]),
+    renderer: ExportRenderer = Depends(Provide[Container.export_renderer]),
+    admission: ExportAdmission = Depends(Provide[Container.export_admission]),
+):
+    return await _export_response(
+        request, resume_id, "pdf", current_user, service, renderer, admission
     )
 
 
@@ -186,13 +408,70 @@ async def export_pdf(
 @inject
 async def export_docx(
     resume_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
     service: CvService = Depends(Provide[Container.cv_service]),
+    renderer: ExportRenderer = Depends(Provide[Container.export_renderer]),
+    admission: ExportAdmission = Depends(Provide[Container.export_admission]),
 ):
-    resume = await service.get_resume_for_export(resume_id, current_user)
-    docx_bytes = ExportService.generate_docx(resume)
-    return StreamingResponse(
-        io.BytesIO(docx_bytes),
-        media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        headers={"Content-Disposition": f'attachment; filename="resume_{resume_id}.docx"'},
+    return await _export_response(
+        request, resume_id, "docx", current_user, service, renderer, admission
+    )
+
+
+@router.get("/{resume_id}/export/txt")
+@inject
+async def export_txt(
+    resume_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    service: CvService = Depends(Provide[Container.cv_service]),
+    renderer: ExportRenderer = Depends(Provide[Container.export_renderer]),
+    admission: ExportAdmission = Depends(Provide[Container.export_admission]),
+):
+    return await _export_response(
+        request, resume_id, "txt", current_user, service, renderer, admission
     )
+
+
+@router.get("/{resume_id}/export/markdown")
+@inject
+async def export_markdown(
+    resume_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    service: CvService = Depends(Provide[Container.cv_service]),
+    renderer: ExportRenderer = Depends(Provide[Container.export_renderer]),
+    admission: ExportAdmission = Depends(Provide[Container.export_admission]),
+):
+    return await _export_response(
+        request, resume_id, "markdown", current_user, service, renderer, admission
+    )
+
+
+@router.get("/{resume_id}/export/json-resume")
+@inject
+async def export_json_resume(
+    resume_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    service: CvService = Depends(Provide[Container.cv_service]),
+    renderer: ExportRenderer = Depends(Provide[Container.export_renderer]),
+    admission: ExportAdmission = Depends(Provide[Container.export_admission]),
+):
+    return await _export_response(
+        request, resume_id, "json-resume", current_user, service, renderer, admission
+    )
+
+
+@router.post("/{resume_id}/exports", response_model=ExportJobResponse)
+@inject
+async def create_export_job(
+    resume_id: int,
+    data: ExportJobCreate,
+    current_user: User = Depends(get_current_user),
+    service: CvService = Depends(Provide[Container.cv_service]),
+    job_service: ExportJobService = Depends(Provide[Container.export_job_service]),
+) -> ExportJobResponse:
+    resume = await service.get_resume_for_export(resume_id, current_user)
+    return await job_service.enqueue(resume, data.format, current_user)
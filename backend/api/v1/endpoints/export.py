@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import FileResponse
+from dependency_injector.wiring import Provide, inject
+
+from app.core.container import Container
+from app.core.dependencies import get_current_user
+from app.models.user import User
+from app.schemas.export import ExportJobResponse
+from app.services.export_job_service import ExportJobService
+from app.services.export_service import MEDIA_TYPES, export_filename
+
+router = APIRouter(tags=["Exports"])
+
+
+@router.get("/{job_id}", response_model=ExportJobResponse)
+@inject
+async def get_export_job(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    service: ExportJobService = Depends(Provide[Container.export_job_service]),
+) -> ExportJobResponse:
+    return await service.get_status(job_id, current_user)
+
+
+@router.get("/{job_id}/download")
+@inject
+async def download_export(
+    job_id: str,
+    current_user: User = Depends(get_current_user),
+    service: ExportJobService = Depends(Provide[Container.export_job_service]),
+):
+    artifact = await service.get_local_artifact(job_id, current_user)
+    if artifact is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Export is not ready",
+        )
+    path, fmt = artifact
+    return FileResponse(path, media_type=MEDIA_TYPES[fmt], filename=export_filename("resume", fmt))
@@ -1,4 +1,7 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+
+from app.core.dependencies import get_current_admin_user
+from app.core.metrics import metrics
 
 router = APIRouter(tags=["Home"])
 
@@ -6,3 +9,9 @@ router = APIRouter(tags=["Home"])
 @router.get("/health")
 async def health():
     return {"status": "ok"}
+
+
+# Export and cache internals; not for the public.
+@router.get("/metrics", dependencies=[Depends(get_current_admin_user)])
+async def get_metrics():
+    return metrics.snapshot()
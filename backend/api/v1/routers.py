@@ -1,7 +1,8 @@
 from fastapi import APIRouter
-from .endpoints import user, home, cv
+from .endpoints import user, home, cv, export
 
 api_router = APIRouter()
 api_router.include_router(home.router)
 api_router.include_router(user.router)
-api_router.include_router(cv.router, prefix="/resumes")
\ No newline at end of file
+api_router.include_router(cv.router, prefix="/resumes")
+api_router.include_router(export.router, prefix="/exports")
@@ -0,0 +1,182 @@
+"""
+Shared helpers for the offline benchmark scripts.
+
+The scripts run directly from a checkout (``python benchmarks/<name>.py``),
+where the package folder is named ``backend`` rather than ``app``, so the
+folder is aliased as ``app`` the same way ``alembic/env.py`` does it.
+"""
+
+import importlib
+import io
+import os
+import sys
+import tempfile
+import time
+from typing import Awaitable, Callable, Dict, List, Optional
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(backend_dir))
+if os.path.basename(backend_dir) != "app":
+    app_module = importlib.import_module(os.path.basename(backend_dir))
+    sys.modules["app"] = app_module
+
+from app.schemas.export import (  # noqa: E402
+    CertificateSnapshot,
+    CustomSectionSnapshot,
+    EducationSnapshot,
+    ExperienceSnapshot,
+    LanguageSnapshot,
+    ResumeSnapshot,
+    SkillSnapshot,
+)
+
+from PIL import Image  # noqa: E402
+
+from app.services import photo_variants  # noqa: E402
+from app.services.export_storage import LocalExportStorage  # noqa: E402
+
+# Profile name -> section sizes of the generated resume.
+PROFILES = {
+    "minimal": dict(experiences=0, educations=0, skills=0, languages=0, certificates=0,
+                    custom_sections=0, summary_sentences=0, photo=False),
+    "typical": dict(experiences=4, educations=1, skills=12, languages=2, certificates=2,
+                    custom_sections=1, summary_sentences=4, photo=False),
+    "large": dict(experiences=15, educations=3, skills=30, languages=4, certificates=10,
+                  custom_sections=4, summary_sentences=12, photo=True),
+    "heavy": dict(experiences=50, educations=5, skills=60, languages=6, certificates=30,
+                  custom_sections=12, summary_sentences=40, photo=True),
+}
+
+_SENTENCE = "Designed, built and operated services used by millions of people. "
+
+
+def synthetic_resume(profile: str = "typical", template_name: Optional[str] = None) -> ResumeSnapshot:
+    """Deterministic resume snapshot of the given size profile; needs no database."""
+    size = PROFILES[profile]
+    return ResumeSnapshot(
+        id=1,
+        template_name=template_name,
+        color_hex="#1f4e79",
+        first_name="Jane",
+        last_name="Doe",
+        professional_title="Senior Backend Engineer",
+        email="jane@example.com",
+        phone="+1 555 0100",
+        location="Berlin, Germany",
+        summary=_SENTENCE * size["summary_sentences"] or None,
+        photo_url="https://example.com/photos/jane.jpg" if size["photo"] else None,
+        # Renderers read the stored variant, not the URL.
+        photo_hash=install_photo() if size["photo"] else None,
+        experiences=tuple(
+            ExperienceSnapshot(
+                job_title=f"Engineer {i}",
+                company=f"Company {i}",
+                employment_type="full-time",
+                location="Remote",
+                start_date="2015-01",
+                end_date="2016-06",
+                description=_SENTENCE * 6,
+                sort_order=i,
+            )
+            for i in range(size["experiences"])
+        ),
+        educations=tuple(
+            EducationSnapshot(
+                institution=f"University {i}",
+                degree="MSc",
+                field_of_study="Computer Science",
+                start_date="2010-09",
+                end_date="2012-06",
+                description=_SENTENCE * 2,
+                sort_order=i,
+            )
+            for i in range(size["educations"])
+        ),
+        skills=tuple(
+            SkillSnapshot(name=f"Skill {i}", category="soft" if i % 4 == 0 else "technical", sort_order=i)
+            for i in range(size["skills"])
+        ),
+        languages=tuple(
+            LanguageSnapshot(name=f"Language {i}", proficiency="fluent", sort_order=i)
+            for i in range(size["languages"])
+        ),
+        certificates=tuple(
+            CertificateSnapshot(
+                name=f"Certificate {i}",
+                organization="Example Org",
+                issue_date="2020-01",
+                expiration_date="2025-01",
+                description=_SENTENCE,
+                sort_order=i,
+            )
+            for i in range(size["certificates"])
+        ),
+        custom_sections=tuple(
+            CustomSectionSnapshot(
+                title=f"Project {i}",
+                description=_SENTENCE * 3,
+                start_date="2021-01",
+                end_date="2021-12",
+                sort_order=i,
+            )
+            for i in range(size["custom_sections"])
+        ),
+    )
+
+
+def _summary(samples: List[float]) -> Dict[str, float]:
+    samples.sort()
+    return {
+        "mean_ms": sum(samples) / len(samples),
+        "p50_ms": samples[len(samples) // 2],
+        "p99_ms": samples[min(len(samples) - 1, int(len(samples) * 0.99))],
+    }
+
+
+def measure(fn: Callable[[], object], runs: int) -> Dict[str, float]:
+    """Call ``fn`` ``runs`` times and return mean/p50/p99 wall time in ms."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return _summary(samples)
+
+
+def measure_interleaved(fns: Dict[str, Callable[[], object]], runs: int) -> Dict[str, Dict[str, float]]:
+    """``measure`` for several variants, alternating between them so drift affects all alike."""
+    samples: Dict[str, List[float]] = {label: [] for label in fns}
+    for _ in range(runs):
+        for label, fn in fns.items():
+            start = time.perf_counter()
+            fn()
+            samples[label].append((time.perf_counter() - start) * 1000)
+    return {label: _summary(values) for label, values in samples.items()}
+
+
+async def measure_async(fn: Callable[[], Awaitable[object]], runs: int) -> Dict[str, float]:
+    """``measure`` for a coroutine function."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        await fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return _summary(samples)
+
+
+_photo_hash: Optional[str] = None
+
+
+def install_photo() -> str:
+    """Store a photo variant in a scratch storage, point the photo cache at it and return its hash."""
+    global _photo_hash
+    if _photo_hash is not None:
+        return _photo_hash
+    storage = LocalExportStorage(tempfile.mkdtemp(prefix="benchmark-photos-"))
+    buf = io.BytesIO()
+    Image.new("RGB", photo_variants.PHOTO_VARIANTS["print"], (120, 140, 160)).save(buf, format="JPEG")
+    digest = photo_variants.photo_digest(buf.getvalue())
+    storage.save(photo_variants.photo_key(digest, "print"), buf.getvalue(), photo_variants.PHOTO_CONTENT_TYPE)
+    photo_variants._cache = photo_variants.PhotoCache(storage)
+    _photo_hash = digest
+    return digest
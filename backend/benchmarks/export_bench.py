@@ -0,0 +1,115 @@
+"""
+Export benchmark: wall time, peak RSS and output size of generate_pdf and
+generate_docx for synthetic resumes of increasing size.
+
+Every (profile, template, format) case runs in its own spawned process, so
+peak RSS is attributable to that case alone. Results are written as JSON,
+tagged with the current git commit, so runs can be diffed across commits.
+
+Usage:
+    python benchmarks/export_bench.py [--runs N] [--profiles minimal,heavy]
+        [--templates default] [--formats pdf,docx] [--output results.json]
+        [--compare previous.json]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import resource
+import subprocess
+import sys
+from datetime import datetime, timezone
+
+from common import PROFILES, backend_dir, measure, synthetic_resume
+
+
+def _run_case(profile: str, template: str, fmt: str, runs: int) -> dict:
+    from app.services.export_service import ExportService
+
+    resume = synthetic_resume(profile, None if template == "default" else template)
+    # First render warms templates and fonts; it is reported separately.
+    cold = measure(lambda: ExportService.render(resume, fmt), 1)["mean_ms"]
+    output = ExportService.render(resume, fmt)
+    stats = measure(lambda: ExportService.render(resume, fmt), runs)
+    # ru_maxrss is KiB on Linux and bytes on macOS.
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    rss_mb = rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+    return {
+        "profile": profile,
+        "template": template,
+        "format": fmt,
+        "runs": runs,
+        "cold_ms": round(cold, 3),
+        **{k: round(v, 3) for k, v in stats.items()},
+        "peak_rss_mb": round(rss_mb, 1),
+        "output_bytes": len(output),
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=backend_dir, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def _compare(results: list, previous_path: str) -> None:
+    with open(previous_path) as f:
+        previous = json.load(f)
+    baseline = {(r["profile"], r["template"], r["format"]): r for r in previous["results"]}
+    print(f"\nvs {previous['commit']}:")
+    for r in results:
+        base = baseline.get((r["profile"], r["template"], r["format"]))
+        if base:
+            delta = (r["mean_ms"] - base["mean_ms"]) / base["mean_ms"] * 100
+            print(f"  {r['profile']:<8} {r['template']:<10} {r['format']:<5} mean {delta:+6.1f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--profiles", default=",".join(PROFILES))
+    parser.add_argument("--templates", default="default")
+    parser.add_argument("--formats", default="pdf,docx")
+    parser.add_argument("--output", default="export_bench.json")
+    parser.add_argument("--compare", help="previous results file to diff against")
+    args = parser.parse_args()
+
+    cases = [
+        (profile, template, fmt)
+        for profile in args.profiles.split(",")
+        for template in args.templates.split(",")
+        for fmt in args.formats.split(",")
+    ]
+    results = []
+    ctx = multiprocessing.get_context("spawn")
+    for profile, template, fmt in cases:
+        with ctx.Pool(1, maxtasksperchild=1) as pool:
+            result = pool.apply(_run_case, (profile, template, fmt, args.runs))
+        results.append(result)
+        print(
+            f"{profile:<8} {template:<10} {fmt:<5} "
+            f"mean {result['mean_ms']:9.1f} ms  p99 {result['p99_ms']:9.1f} ms  "
+            f"rss {result['peak_rss_mb']:7.1f} MB  size {result['output_bytes'] / 1024:8.1f} KiB"
+        )
+
+    report = {
+        "commit": _git_commit(),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nwrote {args.output}")
+    if args.compare:
+        _compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,149 @@
+"""
+Calibrate LayoutEstimator against real generate_pdf output.
+
+Renders a spread of synthetic resumes (every profile, plus seeded random
+mixes of section sizes, with and without a photo, in each PDF font),
+reads the page count and the position of every section heading from the
+PDF, and compares them with the estimate. Section positions are compared
+in flow coordinates, i.e. (page - 1) * page height + offset from the top
+of the content area.
+
+Usage: python benchmarks/layout_calibration.py [--cases N] [--seed S]
+    [--templates default,cba2] [--min-accuracy 0.95] [--verbose]
+
+Exits non-zero when the page count is right for fewer than
+``--min-accuracy`` of the cases.
+"""
+
+import argparse
+import io
+import random
+
+from common import PROFILES, install_photo, measure, synthetic_resume
+
+from pypdf import PdfReader
+from reportlab.pdfbase.pdfmetrics import getFont
+
+from app.services.export_service import ExportService
+from app.services.layout_estimator import PDF_FONT_FACES, LayoutEstimator, _count_lines
+from app.services.template_registry import TemplateRegistry
+
+SECTION_TITLES = {
+    "summary": "Summary",
+    "experiences": "Experience",
+    "educations": "Education",
+    "skills": "Skills",
+    "languages": "Languages",
+    "certificates": "Certificates",
+}
+
+
+def _cases(count: int, seed: int, templates, photo_hash: str):
+    heavy = synthetic_resume("heavy")
+    for template in templates:
+        for profile in PROFILES:
+            yield f"{profile}/{template}", synthetic_resume(profile, template)
+    rng = random.Random(seed)
+    for i in range(count):
+        sizes = {
+            field: rng.randint(0, limit)
+            for field, limit in (
+                ("experiences", 8), ("educations", 3), ("skills", 40), ("languages", 5),
+                ("certificates", 6), ("custom_sections", 4),
+            )
+        }
+        update = {field: getattr(heavy, field)[:n] for field, n in sizes.items()}
+        update["summary"] = heavy.summary[: rng.randint(0, 900)] or None
+        update["experiences"] = tuple(
+            e.model_copy(update={"description": (e.description or "")[: rng.randint(0, 800)] or None})
+            for e in update["experiences"]
+        )
+        update["template_name"] = rng.choice(templates)
+        update["photo_hash"] = photo_hash if rng.random() < 0.3 else None
+        yield f"random-{i}", heavy.model_copy(update=update)
+
+
+def _pdf_layout(pdf: bytes, page_height: float, top: float, bold_font: str):
+    """Page count and flow offset of the first line of text matching each heading."""
+    ascent = getFont(bold_font).face.ascent / 1000
+    reader = PdfReader(io.BytesIO(pdf))
+    headings = {}
+    for index, page in enumerate(reader.pages):
+        def visit(text, cm, tm, font_dict, font_size):
+            text = text.strip()
+            if text and text not in headings:
+                baseline = cm[5] + tm[5]
+                headings[text] = index * page_height + top - (baseline + ascent * font_size)
+        page.extract_text(visitor_text=visit)
+    return len(reader.pages), headings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--cases", type=int, default=40)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--templates", default="default,cba2")
+    parser.add_argument("--min-accuracy", type=float, default=0.95)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    # As in production: no auto-reload, so template versions are memoized.
+    registry = TemplateRegistry()
+    registry.warm_up()
+    estimator = LayoutEstimator(registry)
+    templates = [None if t == "default" else t for t in args.templates.split(",")]
+    photo_hash = install_photo()
+
+    matched, errors, timings, cold_timings, total = 0, [], [], [], 0
+    for label, resume in _cases(args.cases, args.seed, templates, photo_hash):
+        estimate = estimator.estimate(resume)
+        timings.append(measure(lambda: estimator.estimate(resume), 50)["p50_ms"])
+        cold_timings.append(
+            measure(lambda: (_count_lines.cache_clear(), estimator.estimate(resume)), 20)["p50_ms"]
+        )
+        spec = registry.spec(resume.template_name)
+        # Flow coordinates: the content box of page 1 starts at its top margin.
+        page_height = estimate.page_height_pt
+        top = 841.89 - (841.89 - page_height) / 2
+        pages, headings = _pdf_layout(
+            ExportService.generate_pdf(resume), page_height, top,
+            PDF_FONT_FACES.get(spec.pdf_font, PDF_FONT_FACES["Helvetica"])[1],
+        )
+        total += 1
+        matched += pages == estimate.page_count
+        case_errors = []
+        for section in estimate.sections:
+            title = SECTION_TITLES.get(section.name)
+            if section.name == "custom_sections" and resume.custom_sections:
+                title = resume.custom_sections[0].title
+            actual = headings.get((title or "").upper())
+            if actual is None:
+                continue
+            predicted = (section.start_page - 1) * page_height + section.top_pt
+            case_errors.append(predicted - actual)
+        errors += case_errors
+        if args.verbose or pages != estimate.page_count:
+            worst = max(case_errors, key=abs, default=0.0)
+            print(
+                f"{label:<22} pages {pages} est {estimate.page_count}  "
+                f"fill {estimate.last_page_fill:.2f}  worst section offset {worst:+.1f} pt"
+            )
+
+    errors = sorted(abs(e) for e in errors)
+    timings.sort()
+    cold_timings.sort()
+    accuracy = matched / total
+    print(f"cases                {total}")
+    print(f"page count accuracy  {accuracy:.1%}")
+    if errors:
+        print(
+            f"section offset error mean {sum(errors) / len(errors):.1f} pt  "
+            f"p95 {errors[int(len(errors) * 0.95)]:.1f} pt  max {errors[-1]:.1f} pt"
+        )
+    for label, samples in (("estimate time", timings), ("  line cache cold", cold_timings)):
+        print(f"{label:<20} p50 {samples[len(samples) // 2]:.3f} ms  max {samples[-1]:.3f} ms")
+    raise SystemExit(0 if accuracy >= args.min_accuracy else 1)
+
+
+if __name__ == "__main__":
+    main()
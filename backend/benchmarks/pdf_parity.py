@@ -0,0 +1,83 @@
+"""
+Parity and speed of the stylesheet-caching PDF engine.
+
+Renders each case three ways: through plain pisa.CreatePDF, through the
+engine with an empty stylesheet cache (miss), and through the engine
+again (hit). reportlab's invariant mode is switched on so that the
+creation date and document ID do not differ between renders, and the
+three outputs must be byte-identical.
+
+Cases: every profile in the default template, the typical resume in
+every catalogue template, and the typical resume in a few palette
+colours, each with and without a photo.
+
+Usage: python benchmarks/pdf_parity.py [--runs N] [--colors 3]
+"""
+
+import argparse
+import io
+
+from common import PROFILES, install_photo, measure_interleaved, synthetic_resume
+
+from reportlab import rl_config
+
+from app.services.export_service import ExportService
+from app.services.pdf_engine import create_pdf, stylesheet_cache
+from app.services.template_registry import get_template_registry
+
+
+def _render(html: str, cache_styles: bool) -> bytes:
+    buf = io.BytesIO()
+    if create_pdf(io.StringIO(html), buf, cache_styles=cache_styles).err:
+        raise RuntimeError("PDF generation failed")
+    return buf.getvalue()
+
+
+def _cases(colors: int, photo_hash: str):
+    registry = get_template_registry()
+    for profile in PROFILES:
+        yield f"{profile}", synthetic_resume(profile)
+    for name in registry.specs:
+        yield f"typical/{name}", synthetic_resume("typical", name)
+    for color in registry.palette[:colors]:
+        yield f"typical/{color}", synthetic_resume("typical").model_copy(update={"color_hex": color})
+    for profile in ("typical", "heavy"):
+        yield f"{profile}/photo", synthetic_resume(profile).model_copy(update={"photo_hash": photo_hash})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--colors", type=int, default=3)
+    args = parser.parse_args()
+
+    rl_config.invariant = 1
+    photo_hash = install_photo()
+    mismatches = 0
+    for label, resume in _cases(args.colors, photo_hash):
+        html = ExportService.render_html(resume)
+        stylesheet_cache.clear()
+        uncached = _render(html, cache_styles=False)
+        miss = _render(html, cache_styles=True)
+        hit = _render(html, cache_styles=True)
+        if not uncached == miss == hit:
+            mismatches += 1
+            print(f"{label:<32} MISMATCH  uncached {len(uncached)}  miss {len(miss)}  hit {len(hit)} bytes")
+
+    resume = synthetic_resume("typical")
+    html = ExportService.render_html(resume)
+    timings = measure_interleaved(
+        {"uncached": lambda: _render(html, False), "cached": lambda: _render(html, True)}, args.runs
+    )
+    for label, stats in timings.items():
+        print(
+            f"typical {label:<9} mean {stats['mean_ms']:7.2f} ms  "
+            f"p50 {stats['p50_ms']:7.2f} ms  p99 {stats['p99_ms']:7.2f} ms"
+        )
+    print(f"stylesheet cache: {len(stylesheet_cache)} entries, {stylesheet_cache.hits} hits, {stylesheet_cache.misses} misses")
+    print("parity ok" if not mismatches else f"{mismatches} cases differ")
+    raise SystemExit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Live-preview rendering vs. the PDF export it replaces for the frontend.
+
+Measures ExportService.render_preview (HTML only, warm registry and
+fragment cache, as in the API process) against generate_pdf for each
+profile, and checks the preview against its p99 target. "preview-miss"
+clears the fragment cache before every render, as after an edit that
+touches every section.
+
+Usage: python benchmarks/preview_render.py [--runs N] [--profiles typical,heavy]
+    [--target-ms 10]
+"""
+
+import argparse
+
+from common import PROFILES, measure, synthetic_resume
+
+from app.services.export_service import ExportService
+from app.services.template_registry import FragmentCache, get_template_registry
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--pdf-runs", type=int, default=20)
+    parser.add_argument("--profiles", default=",".join(PROFILES))
+    parser.add_argument("--target-ms", type=float, default=10.0)
+    args = parser.parse_args()
+
+    registry = get_template_registry()
+    ok = True
+    for profile in args.profiles.split(","):
+        resume = synthetic_resume(profile)
+        ExportService.render_preview(resume)
+        ExportService.generate_pdf(resume)
+        preview = measure(lambda: ExportService.render_preview(resume), args.runs)
+
+        def miss():
+            registry.fragment_cache = FragmentCache(registry.fragment_cache.max_entries)
+            ExportService.render_preview(resume)
+
+        preview_miss = measure(miss, args.runs)
+        pdf = measure(lambda: ExportService.generate_pdf(resume), args.pdf_runs)
+        for label, stats in (
+            ("preview", preview), ("preview-miss", preview_miss), ("generate_pdf", pdf)
+        ):
+            print(
+                f"{profile:<8} {label:<13} mean {stats['mean_ms']:8.3f} ms  "
+                f"p50 {stats['p50_ms']:8.3f} ms  p99 {stats['p99_ms']:8.3f} ms"
+            )
+        print(f"{profile:<8} speedup       {pdf['mean_ms'] / preview['mean_ms']:.0f}x")
+        if profile == "typical" and preview_miss["p99_ms"] > args.target_ms:
+            print(f"typical preview p99 exceeds {args.target_ms} ms target")
+            ok = False
+    raise SystemExit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Resume read paths: the ORM graph against the single-query JSON document.
+
+  orm        CvRepository.get_resume (the resume plus six selectin queries),
+             ResumeResponse.model_validate and model_dump_json, which is
+             what GET /resumes/{id} used to do;
+  json       CvRepository.get_resume_document, the bytes PostgreSQL builds with
+             correlated json_agg subqueries, sent as they are;
+  json+model the same, validated with ResumeResponse.model_validate_json.
+
+Needs PostgreSQL. The tables are created in a scratch schema, seeded with
+one resume per synthetic profile and dropped afterwards. Each run uses a
+fresh session, as a request would. Both paths must produce the same
+ResumeResponse.
+
+Usage: python benchmarks/resume_read.py [--dsn postgresql+asyncpg://...] [--runs N]
+"""
+
+import argparse
+import asyncio
+
+from common import PROFILES, measure_async, synthetic_resume
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.core.config import configs
+from app.models.base import Base
+from app.models.cv import Resume
+from app.models.user import User
+from app.repositories.cv_repository import SECTION_MODELS, CvRepository
+from app.schemas.cv import ResumeResponse
+
+SCHEMA = "resume_read_bench"
+TABLES = [User.__table__, Resume.__table__] + [model.__table__ for model in SECTION_MODELS.values()]
+
+
+def _columns(model, values: dict) -> dict:
+    names = set(model.__table__.columns.keys()) - {"id", "resume_id"}
+    return {key: value for key, value in values.items() if key in names}
+
+
+async def _seed(session: AsyncSession) -> dict:
+    user = User(email="bench@example.com", first_name="Bench", last_name="User")
+    session.add(user)
+    await session.flush()
+    resume_ids = {}
+    for profile in PROFILES:
+        snapshot = synthetic_resume(profile)
+        resume = Resume(user_id=user.id, **_columns(Resume, snapshot.model_dump(exclude={"title"})), title=profile)
+        session.add(resume)
+        await session.flush()
+        for name, model in SECTION_MODELS.items():
+            session.add_all(
+                model(resume_id=resume.id, **_columns(model, item.model_dump()))
+                for item in getattr(snapshot, name)
+            )
+        resume_ids[profile] = resume.id
+    await session.commit()
+    return {"user_id": user.id, "resume_ids": resume_ids}
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--dsn", default=configs.DATABASE_URI)
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    engine = create_async_engine(args.dsn).execution_options(schema_translate_map={None: SCHEMA})
+    async with engine.begin() as conn:
+        await conn.execute(text(f"CREATE SCHEMA {SCHEMA}"))
+        await conn.run_sync(lambda sync_conn: Base.metadata.create_all(sync_conn, tables=TABLES))
+
+    mismatches = 0
+    try:
+        async with AsyncSession(engine) as session:
+            seeded = await _seed(session)
+        user_id = seeded["user_id"]
+
+        for profile, resume_id in seeded["resume_ids"].items():
+            async def orm():
+                async with AsyncSession(engine) as session:
+                    resume = await CvRepository(session).get_resume(resume_id, user_id)
+                    return ResumeResponse.model_validate(resume).model_dump_json().encode()
+
+            async def raw():
+                async with AsyncSession(engine) as session:
+                    _, document = await CvRepository(session).get_resume_document(resume_id, user_id)
+                    return document
+
+            async def json_model():
+                return ResumeResponse.model_validate_json(await raw())
+
+            expected = ResumeResponse.model_validate_json(await orm())
+            document = await raw()
+            if ResumeResponse.model_validate_json(document) != expected:
+                mismatches += 1
+                print(f"{profile:<9} MISMATCH")
+            for label, fn in (("orm", orm), ("json", raw), ("json+model", json_model)):
+                stats = await measure_async(fn, args.runs)
+                print(
+                    f"{profile:<9} {label:<11} mean {stats['mean_ms']:6.2f} ms  "
+                    f"p50 {stats['p50_ms']:6.2f} ms  p99 {stats['p99_ms']:6.2f} ms"
+                )
+            print(f"{profile:<9} document {len(document)} bytes")
+    finally:
+        async with engine.begin() as conn:
+            await conn.execute(text(f"DROP SCHEMA {SCHEMA} CASCADE"))
+        await engine.dispose()
+
+    print("parity ok" if not mismatches else f"{mismatches} profiles differ")
+    raise SystemExit(1 if mismatches else 0)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,43 @@
+"""
+Per-render template overhead: fresh Environment per call vs. TemplateRegistry.
+
+Usage: python benchmarks/template_render.py [--runs N]
+"""
+
+import argparse
+
+from common import measure, synthetic_resume
+
+from app.services.template_registry import TemplateRegistry
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=500)
+    args = parser.parse_args()
+
+    resume = synthetic_resume("typical")
+
+    def uncached():
+        # What ExportService.generate_pdf did before the registry existed:
+        # a fresh environment that loads and compiles templates per call.
+        TemplateRegistry().render(resume)
+
+    registry = TemplateRegistry()
+    registry.load_all()
+
+    def cached():
+        registry.render(resume)
+
+    before = measure(uncached, args.runs)
+    after = measure(cached, args.runs)
+    for label, stats in (("fresh environment", before), ("template registry", after)):
+        print(
+            f"{label:<18} mean {stats['mean_ms']:7.3f} ms  "
+            f"p50 {stats['p50_ms']:7.3f} ms  p99 {stats['p99_ms']:7.3f} ms"
+        )
+    print(f"speedup            {before['mean_ms'] / after['mean_ms']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 import os
+import tempfile
 from typing import List, ClassVar
 
 from pathlib import Path
@@ -41,6 +42,55 @@ class Configs(BaseSettings):
     CELERY_BROKER_URL: str = os.environ.get("CELERY_BROKER_URL", "redis://127.0.0.1:6379/0")
     CELERY_RESULT_BACKEND: str = os.environ.get("CELERY_RESULT_BACKEND", "redis://127.0.0.1:6379/0")
 
+    # export workers
+    EXPORT_POOL_WORKERS: int = int(os.getenv("EXPORT_POOL_WORKERS", "2"))
+    EXPORT_QUEUE_SIZE: int = int(os.getenv("EXPORT_QUEUE_SIZE", "16"))
+    EXPORT_JOB_TIMEOUT: float = float(os.getenv("EXPORT_JOB_TIMEOUT", "30"))
+    EXPORT_MAX_JOBS_PER_WORKER: int = int(os.getenv("EXPORT_MAX_JOBS_PER_WORKER", "100"))
+
+    # export admission, shared by all API workers through Redis
+    EXPORT_ADMISSION_CONCURRENCY: int = int(os.getenv("EXPORT_ADMISSION_CONCURRENCY", "8"))
+    EXPORT_ADMISSION_PER_USER: int = int(os.getenv("EXPORT_ADMISSION_PER_USER", "2"))
+    EXPORT_ADMISSION_QUEUE_SIZE: int = int(os.getenv("EXPORT_ADMISSION_QUEUE_SIZE", "32"))
+    EXPORT_ADMISSION_MAX_WAIT: float = float(os.getenv("EXPORT_ADMISSION_MAX_WAIT", "10"))
+
+    # resume photos; variants are kept in the export storage backend
+    PHOTO_MAX_BYTES: int = int(os.getenv("PHOTO_MAX_BYTES", str(10 * 1024 * 1024)))
+    PHOTO_CACHE_MAX_BYTES: int = int(os.getenv("PHOTO_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+
+    # templates; compiled bytecode is persisted here when set
+    TEMPLATE_BYTECODE_CACHE_DIR: str = os.getenv("TEMPLATE_BYTECODE_CACHE_DIR", "")
+
+    # export artifact cache
+    EXPORT_CACHE_MAX_BYTES: int = int(os.getenv("EXPORT_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+    EXPORT_CACHE_MAX_ENTRY_BYTES: int = int(os.getenv("EXPORT_CACHE_MAX_ENTRY_BYTES", str(8 * 1024 * 1024)))
+    EXPORT_CACHE_TTL: int = int(os.getenv("EXPORT_CACHE_TTL", str(24 * 60 * 60)))
+
+    # resume documents (GET /resumes/{id}) cached per version in Redis
+    RESUME_CACHE_TTL: int = int(os.getenv("RESUME_CACHE_TTL", str(60 * 60)))
+
+    # exports larger than this are streamed from a spool file and not cached
+    EXPORT_SPOOL_THRESHOLD: int = int(os.getenv("EXPORT_SPOOL_THRESHOLD", str(1024 * 1024)))
+    EXPORT_SPOOL_DIR: str = os.getenv("EXPORT_SPOOL_DIR", os.path.join(tempfile.gettempdir(), "cv-export-spool"))
+    # spool files older than this were abandoned and are swept; keep it well above EXPORT_JOB_TIMEOUT
+    EXPORT_SPOOL_MAX_AGE: float = float(os.getenv("EXPORT_SPOOL_MAX_AGE", "600"))
+
+    # background export jobs; EXPORT_STORAGE_BACKEND is "local" or "s3"
+    EXPORT_STORAGE_BACKEND: str = os.getenv("EXPORT_STORAGE_BACKEND", "local")
+    EXPORT_STORAGE_DIR: str = os.getenv("EXPORT_STORAGE_DIR", os.path.join(tempfile.gettempdir(), "cv-exports"))
+    EXPORT_STORAGE_BUCKET: str = os.getenv("EXPORT_STORAGE_BUCKET", os.getenv("AWS_STORAGE_BUCKET_NAME", ""))
+    EXPORT_URL_EXPIRES: int = int(os.getenv("EXPORT_URL_EXPIRES", "3600"))
+    EXPORT_JOB_TTL: int = int(os.getenv("EXPORT_JOB_TTL", str(24 * 60 * 60)))
+
+    # speculative render into the export cache after resume edits
+    EXPORT_PRERENDER_ENABLED: bool = os.getenv("EXPORT_PRERENDER_ENABLED", "true").lower() == "true"
+    # comma-separated, e.g. "pdf,docx"
+    EXPORT_PRERENDER_FORMATS: str = os.getenv(
+        "EXPORT_PRERENDER_FORMATS", os.getenv("EXPORT_PRERENDER_FORMAT", "pdf")
+    )
+    EXPORT_PRERENDER_DELAY: float = float(os.getenv("EXPORT_PRERENDER_DELAY", "3"))
+    EXPORT_PRERENDER_PER_USER: int = int(os.getenv("EXPORT_PRERENDER_PER_USER", "1"))
+
     # date
     DATETIME_FORMAT: str = "%Y-%m-%dT%H:%M:%S"
     DATE_FORMAT: str = "%Y-%m-%d"
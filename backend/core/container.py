@@ -1,12 +1,28 @@
+import functools
+
+from celery import Celery
 from dependency_injector import containers, providers
-from redis.asyncio import Redis
 
 from app.core.config import configs
 from app.core.database import Database
+from app.core.redis_client import create_redis_client
 from app.core.uof import UnitOfWork
 from app.services.cache_service import CacheService
 from app.services.user_service import UserService
+from app.services.bulk_export import BulkExporter
+from app.services.export_admission import ExportAdmission
+from app.services.export_artifact import sweep_spool_dir
 from app.services.cv_service import CvService
+from app.services.export_cache import ExportArtifactCache
+from app.services.export_executor import ExportExecutor
+from app.services.export_job_service import ExportJobService
+from app.services.export_renderer import ExportRenderer
+from app.services.export_service import ExportService
+from app.services.export_storage import create_export_storage
+from app.services.layout_estimator import LayoutEstimator
+from app.services.photo_service import PhotoService
+from app.services.prerender import SpeculativeRenderer
+from app.services.resume_cache import ResumeDocumentCache
 
 
 class Container(containers.DeclarativeContainer):
@@ -15,6 +31,7 @@ class Container(containers.DeclarativeContainer):
             "app.api.v1.endpoints.home",
             "app.api.v1.endpoints.user",
             "app.api.v1.endpoints.cv",
+            "app.api.v1.endpoints.export",
             "app.core.dependencies",
         ]
     )
@@ -22,20 +39,101 @@ class Container(containers.DeclarativeContainer):
     db = providers.Singleton(Database)
     session_factory = providers.Resource(db.provided.session)
 
-    redis_client = providers.Singleton(
-        Redis,
-        host=configs.REDIS_HOST,
-        port=configs.REDIS_PORT,
-        decode_responses=True,
-    )
+    redis_client = providers.Singleton(create_redis_client, decode_responses=True)
     cache_service = providers.Singleton(
         CacheService,
         redis_client=redis_client,
     )
 
+    # Export artifacts are binary, so they get a client that does not
+    # decode responses.
+    redis_binary_client = providers.Singleton(create_redis_client, decode_responses=False)
+    export_artifact_cache = providers.Singleton(
+        ExportArtifactCache,
+        cache_service=providers.Singleton(
+            CacheService,
+            redis_client=redis_binary_client,
+            prefix="export",
+        ),
+        max_bytes=configs.EXPORT_CACHE_MAX_BYTES,
+        max_entry_bytes=configs.EXPORT_CACHE_MAX_ENTRY_BYTES,
+        ttl=configs.EXPORT_CACHE_TTL,
+    )
+
+    resume_document_cache = providers.Singleton(
+        ResumeDocumentCache,
+        cache_service=providers.Singleton(
+            CacheService,
+            redis_client=redis_binary_client,
+            prefix="resume",
+        ),
+        ttl=configs.RESUME_CACHE_TTL,
+    )
+
+    export_executor = providers.Singleton(
+        ExportExecutor,
+        max_workers=configs.EXPORT_POOL_WORKERS,
+        queue_size=configs.EXPORT_QUEUE_SIZE,
+        job_timeout=configs.EXPORT_JOB_TIMEOUT,
+        max_jobs_per_worker=configs.EXPORT_MAX_JOBS_PER_WORKER,
+        initializer=ExportService.warm_up,
+        on_retire=functools.partial(
+            sweep_spool_dir, configs.EXPORT_SPOOL_DIR, configs.EXPORT_SPOOL_MAX_AGE
+        ),
+    )
+
+    export_admission = providers.Singleton(
+        ExportAdmission,
+        redis_client=redis_client,
+        concurrency=configs.EXPORT_ADMISSION_CONCURRENCY,
+        per_user=configs.EXPORT_ADMISSION_PER_USER,
+        queue_size=configs.EXPORT_ADMISSION_QUEUE_SIZE,
+        max_wait=configs.EXPORT_ADMISSION_MAX_WAIT,
+        lease=configs.EXPORT_JOB_TIMEOUT * 2,
+    )
+
+    export_renderer = providers.Singleton(
+        ExportRenderer,
+        executor=export_executor,
+        export_cache=export_artifact_cache,
+        spool_threshold=configs.EXPORT_SPOOL_THRESHOLD,
+        spool_dir=configs.EXPORT_SPOOL_DIR,
+    )
+    bulk_exporter = providers.Singleton(
+        BulkExporter,
+        renderer=export_renderer,
+        concurrency=configs.EXPORT_POOL_WORKERS,
+    )
+    layout_estimator = providers.Singleton(LayoutEstimator)
+
+    # Producer-side client for the Celery app in app/tasks.py; it only
+    # needs the broker and result backend, not the worker task modules.
+    celery_app = providers.Singleton(
+        Celery,
+        "app.tasks",
+        broker=configs.CELERY_BROKER_URL,
+        backend=configs.CELERY_RESULT_BACKEND,
+    )
+    export_storage = providers.Singleton(create_export_storage)
+
     unit_of_work = providers.Factory(
         UnitOfWork,
         session_factory=session_factory,
+        commit_hooks=providers.List(
+            export_artifact_cache.provided.invalidate_resumes,
+            resume_document_cache.provided.invalidate_resumes,
+        ),
+    )
+
+    speculative_renderer = providers.Singleton(
+        SpeculativeRenderer,
+        uow_factory=unit_of_work.provider,
+        executor=export_executor,
+        export_cache=export_artifact_cache,
+        formats=configs.EXPORT_PRERENDER_FORMATS.split(","),
+        delay=configs.EXPORT_PRERENDER_DELAY,
+        per_user=configs.EXPORT_PRERENDER_PER_USER,
+        enabled=configs.EXPORT_PRERENDER_ENABLED,
     )
 
     user_service = providers.Factory(
@@ -46,4 +144,20 @@ class Container(containers.DeclarativeContainer):
     cv_service = providers.Factory(
         CvService,
         uow_factory=unit_of_work.provider,
+        prerenderer=speculative_renderer,
+        resume_cache=resume_document_cache,
+    )
+
+    photo_service = providers.Factory(
+        PhotoService,
+        uow_factory=unit_of_work.provider,
+        storage=export_storage,
+        prerenderer=speculative_renderer,
+    )
+
+    export_job_service = providers.Factory(
+        ExportJobService,
+        celery_app=celery_app,
+        cache_service=cache_service,
+        storage=export_storage,
     )
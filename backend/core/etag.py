@@ -0,0 +1,50 @@
+"""
+Conditional GET helpers.
+
+Resource representations are tagged with a strong ``ETag`` built from
+their version stamp, and a request whose ``If-None-Match`` matches gets a
+bodiless 304 instead. Responses are only cacheable by the browser that
+requested them and must be revalidated before reuse.
+"""
+
+import hashlib
+from datetime import datetime
+from typing import Optional, Union
+
+from fastapi import Request, Response, status
+
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+def make_etag(resource_id: int, version: Optional[Union[datetime, int]], *variant: str) -> str:
+    """Strong ETag for one representation of a resource at a version: a timestamp or a counter."""
+    if isinstance(version, datetime):
+        stamp = version.isoformat()
+    else:
+        stamp = "-" if version is None else str(version)
+    digest = hashlib.sha1(":".join((str(resource_id), stamp, *variant)).encode()).hexdigest()
+    return f'"{digest[:32]}"'
+
+
+def is_not_modified(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    # If-None-Match uses the weak comparison function.
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+def cache_headers(etag: str) -> dict:
+    return {"ETag": etag, "Cache-Control": PRIVATE_CACHE_CONTROL}
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=cache_headers(etag))
@@ -0,0 +1,121 @@
+"""
+In-process metrics registry.
+
+Provides minimal counters, gauges and histograms with label support.
+Values are kept per worker process and exposed as JSON through the
+``/metrics`` endpoint, which is enough to size pools and spot
+regressions without pulling in an external metrics client.
+"""
+
+import bisect
+import threading
+from typing import Dict, List, Optional, Tuple
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+
+def _label_key(labels: Dict[str, object]) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+class Counter:
+    def __init__(self, name: str, description: str = ""):
+        self.name = name
+        self.description = description
+        self._values: Dict[LabelKey, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_key(labels), 0)
+
+    def collect(self) -> List[dict]:
+        return [{"labels": dict(k), "value": v} for k, v in self._values.items()]
+
+
+class Gauge(Counter):
+    def set(self, value: float, **labels) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+
+class Histogram:
+    def __init__(self, name: str, description: str = "", buckets: Optional[Tuple[float, ...]] = None):
+        self.name = name
+        self.description = description
+        self.buckets = tuple(buckets or DEFAULT_BUCKETS)
+        self._series: Dict[LabelKey, dict] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = {"count": 0, "sum": 0.0, "buckets": [0] * (len(self.buckets) + 1)}
+                self._series[key] = series
+            series["count"] += 1
+            series["sum"] += value
+            series["buckets"][bisect.bisect_left(self.buckets, value)] += 1
+
+    def collect(self) -> List[dict]:
+        result = []
+        for key, series in self._series.items():
+            cumulative, buckets = 0, {}
+            for bound, count in zip(self.buckets + (float("inf"),), series["buckets"]):
+                cumulative += count
+                buckets["+Inf" if bound == float("inf") else str(bound)] = cumulative
+            result.append({
+                "labels": dict(key),
+                "count": series["count"],
+                "sum": series["sum"],
+                "buckets": buckets,
+            })
+        return result
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, *args):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = cls(name, *args)
+                self._metrics[name] = metric
+            return metric
+
+    def counter(self, name: str, description: str = "") -> Counter:
+        return self._get_or_create(Counter, name, description)
+
+    def gauge(self, name: str, description: str = "") -> Gauge:
+        return self._get_or_create(Gauge, name, description)
+
+    def histogram(
+        self, name: str, description: str = "", buckets: Optional[Tuple[float, ...]] = None
+    ) -> Histogram:
+        return self._get_or_create(Histogram, name, description, buckets)
+
+    def snapshot(self) -> dict:
+        return {
+            name: {
+                "type": type(metric).__name__.lower(),
+                "description": metric.description,
+                "values": metric.collect(),
+            }
+            for name, metric in self._metrics.items()
+        }
+
+
+metrics = MetricsRegistry()
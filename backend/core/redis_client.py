@@ -1,3 +1,12 @@
 from redis.asyncio import Redis
 
+from app.core.config import configs
 
+
+def create_redis_client(decode_responses: bool = True) -> Redis:
+    """Client for the shared Redis used for caching and cross-worker coordination."""
+    return Redis(
+        host=configs.REDIS_HOST,
+        port=configs.REDIS_PORT,
+        decode_responses=decode_responses,
+    )
@@ -1,12 +1,25 @@
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+
+from loguru import logger
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.repositories.user_repository import UserRepository
 from app.repositories.cv_repository import CvRepository
 
 
+# Called after commit with resume id -> version after the commit, None for
+# deleted resumes; iterating the mapping gives the changed ids.
+ResumeCommitHook = Callable[[Dict[int, Optional[int]]], Awaitable[None]]
+
+
 class UnitOfWork:
-    def __init__(self, session_factory):
+    def __init__(
+        self,
+        session_factory,
+        commit_hooks: Optional[Iterable[ResumeCommitHook]] = None,
+    ):
         self.session_factory = session_factory
+        self.commit_hooks = list(commit_hooks or [])
         self.session: AsyncSession = None
         self._users = None
         self._cv = None
@@ -20,8 +33,24 @@ class UnitOfWork:
         if exc_type:
             await self.session.rollback()
         else:
+            if self._cv is not None and self._cv.changed_resume_ids:
+                await self._cv.bump_versions()
             await self.session.commit()
         await self._session_cm.__aexit__(exc_type, exc_val, exc_tb)
+        if not exc_type:
+            await self._run_commit_hooks()
+
+    async def _run_commit_hooks(self):
+        if self._cv is None or not self._cv.changed_resume_ids:
+            return
+        changed = {
+            resume_id: self._cv.versions.get(resume_id) for resume_id in self._cv.changed_resume_ids
+        }
+        for hook in self.commit_hooks:
+            try:
+                await hook(changed)
+            except Exception as e:
+                logger.error(f"Resume commit hook failed: {e}")
 
     @property
     def users(self) -> UserRepository:
@@ -6,6 +6,8 @@ from app.api.v1.routers import api_router
 from app.core.container import Container
 from app.core.config import configs
 from app.core.logging import setup_logging
+from app.services.export_artifact import sweep_spool_dir
+from app.services.export_service import ExportService
 import time
 import asyncio
 from fastapi.middleware.cors import CORSMiddleware
@@ -68,3 +70,20 @@ app.include_router(api_router, prefix="/api/v1")
 add_pagination(app)
 
 container = Container()
+
+
+@app.on_event("startup")
+async def compile_templates():
+    ExportService.warm_up()
+
+
+@app.on_event("startup")
+async def sweep_export_spool():
+    # Spool files left behind by a previous run or by abandoned responses.
+    await asyncio.to_thread(sweep_spool_dir, configs.EXPORT_SPOOL_DIR, configs.EXPORT_SPOOL_MAX_AGE)
+
+
+@app.on_event("shutdown")
+async def shutdown_export_executor():
+    container.speculative_renderer().shutdown()
+    container.export_executor().shutdown()
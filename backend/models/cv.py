@@ -73,10 +73,16 @@ class Resume(Base):
     location: Mapped[Optional[str]] = mapped_column(String(150), nullable=True)
     summary: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     photo_url: Mapped[Optional[str]] = mapped_column(String(500), nullable=True)
+    # sha256 of the uploaded original; keys the pre-sized variants used by exports
+    photo_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
 
     # Progress / scores
     completion: Mapped[int] = mapped_column(Integer, default=0)
 
+    # Incremented in the same transaction as every write to the resume or
+    # its sections (see UnitOfWork); keys the resume document cache.
+    version: Mapped[int] = mapped_column(Integer, default=1, server_default="1")
+
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
     )
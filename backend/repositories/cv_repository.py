@@ -1,7 +1,14 @@
-from typing import List, Optional
+from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, Iterable, List, Optional, Set, Tuple, Type, get_args
 
-from sqlalchemy import delete, select
+from pydantic import BaseModel
+from sqlalchemy import Text, cast, delete, exists, func, literal_column, select, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
 from app.models.cv import (
     Certificate,
@@ -12,10 +19,97 @@ from app.models.cv import (
     Resume,
     Skill,
 )
+from app.schemas.cv import ResumeResponse
 from .base_repository import BaseRepository
+from .section_sync import SectionSync, sync_section
+
+# Resume relationship -> section model.
+SECTION_MODELS = {
+    "educations": Education,
+    "experiences": Experience,
+    "skills": Skill,
+    "languages": Language,
+    "certificates": Certificate,
+    "custom_sections": CustomSection,
+}
+
+
+
+def _json_pairs(model: Type, schema: Type[BaseModel]) -> list:
+    """``'name', column`` arguments for the model's columns named by the schema's fields."""
+    return [
+        (literal_column(f"'{name}'"), getattr(model, name))
+        for name in schema.model_fields
+        if name not in SECTION_MODELS
+    ]
+
+
+@lru_cache(maxsize=1)
+def _resume_document_query():
+    """
+    The whole ResumeResponse as a single JSON value: the resume's columns
+    plus one correlated ``json_agg`` per section, in display order.
+    """
+    pairs = _json_pairs(Resume, ResumeResponse)
+    for name, model in SECTION_MODELS.items():
+        (schema,) = get_args(ResumeResponse.model_fields[name].annotation)
+        row = func.json_build_object(*chain.from_iterable(_json_pairs(model, schema)))
+        rows = func.json_agg(aggregate_order_by(row, model.sort_order, model.id))
+        section = select(func.coalesce(rows, literal_column("'[]'::json"))).where(
+            model.resume_id == Resume.id
+        )
+        pairs.append((literal_column(f"'{name}'"), section.scalar_subquery()))
+    return select(Resume.version, cast(func.json_build_object(*chain.from_iterable(pairs)), Text))
 
 
 class CvRepository(BaseRepository):
+    def __init__(self, session):
+        super().__init__(session)
+        # Resumes written through this repository; the unit of work hands
+        # them to its commit hooks (cache invalidation etc.) after commit.
+        self.changed_resume_ids: Set[int] = set()
+        # Version of each changed resume after bump_versions; deleted
+        # resumes have none.
+        self.versions: Dict[int, int] = {}
+        # (resume_id, user_id) pairs known to exist in this unit of work.
+        self._owned: Set[Tuple[int, int]] = set()
+
+    def _mark_changed(self, resume_id: int) -> None:
+        self.changed_resume_ids.add(resume_id)
+
+    async def bump_versions(self) -> None:
+        """
+        Increment the version of every resume changed through this
+        repository, with one UPDATE just before the unit of work commits.
+        The new versions are recorded in ``versions``; deleted resumes get
+        none.
+        """
+        ids = sorted(self.changed_resume_ids - set(self.versions))
+        if ids:
+            result = await self.session.execute(
+                update(Resume)
+                .where(Resume.id.in_(ids))
+                .values(version=Resume.version + 1)
+                .returning(Resume.id, Resume.version, Resume.updated_at)
+                .execution_options(synchronize_session=False)
+            )
+            # The UPDATE also fires updated_at's onupdate. Keep loaded
+            # resumes in step, e.g. for the body and ETag of a PATCH response.
+            for resume_id, version, updated_at in result.tuples().all():
+                self.versions[resume_id] = version
+                resume = self.session.identity_map.get(self.session.identity_key(Resume, resume_id))
+                if resume is not None:
+                    set_committed_value(resume, "version", version)
+                    set_committed_value(resume, "updated_at", updated_at)
+
+    async def _touch(self, resume_id: int) -> None:
+        """Bump ``updated_at`` for writes that only touch section tables."""
+        await self.session.execute(
+            update(Resume)
+            .where(Resume.id == resume_id)
+            .values(updated_at=datetime.now(timezone.utc))
+        )
+        self._mark_changed(resume_id)
 
     # ------------------------------------------------------------------
     # Resume CRUD
@@ -25,12 +119,65 @@ class CvRepository(BaseRepository):
         resume = Resume(user_id=user_id, title=title)
         self.session.add(resume)
         await self.session.flush()
+        self._owned.add((resume.id, user_id))
         return resume
 
-    async def get_resume(self, resume_id: int, user_id: int) -> Optional[Resume]:
+    async def owns_resume(self, resume_id: int, user_id: int) -> bool:
+        """
+        Whether the user owns the resume: one ``EXISTS`` probe of the
+        primary key, without loading the row or its sections. Positive
+        answers are remembered for the rest of the unit of work.
+        """
+        if (resume_id, user_id) in self._owned:
+            return True
+        stmt = select(exists().where(Resume.id == resume_id, Resume.user_id == user_id))
+        owned = bool(await self.session.scalar(stmt))
+        if owned:
+            self._owned.add((resume_id, user_id))
+        return owned
+
+    async def get_resume(
+        self, resume_id: int, user_id: int, sections: Iterable[str] = SECTION_MODELS
+    ) -> Optional[Resume]:
+        """An owned resume with the given sections loaded (all by default)."""
         stmt = (
             select(Resume)
             .where(Resume.id == resume_id, Resume.user_id == user_id)
+            .options(*(selectinload(getattr(Resume, name)) for name in sections))
+        )
+        result = await self.session.execute(stmt)
+        resume = result.scalar_one_or_none()
+        if resume is not None:
+            self._owned.add((resume_id, user_id))
+        return resume
+
+    async def get_resume_document(self, resume_id: int, user_id: int) -> Optional[Tuple[int, bytes]]:
+        """
+        ``(version, ResumeResponse JSON)`` of an owned resume, rendered by
+        PostgreSQL in one round trip, or None. The bytes can be sent as
+        they are or validated with ``ResumeResponse.model_validate_json``.
+        """
+        stmt = _resume_document_query().where(Resume.id == resume_id, Resume.user_id == user_id)
+        row = (await self.session.execute(stmt)).one_or_none()
+        if row is None:
+            return None
+        self._owned.add((resume_id, user_id))
+        version, document = row
+        return version, document.encode()
+
+    async def get_resume_stamp(self, resume_id: int, user_id: int) -> Optional[Row]:
+        """``(id, updated_at, template_name, version)`` of an owned resume, without its sections."""
+        stmt = select(Resume.id, Resume.updated_at, Resume.template_name, Resume.version).where(
+            Resume.id == resume_id, Resume.user_id == user_id
+        )
+        result = await self.session.execute(stmt)
+        return result.one_or_none()
+
+    async def get_resumes(self, resume_ids: List[int], user_id: int) -> List[Resume]:
+        """Batch-load several resumes with all sections in one round of queries."""
+        stmt = (
+            select(Resume)
+            .where(Resume.id.in_(resume_ids), Resume.user_id == user_id)
             .options(
                 selectinload(Resume.educations),
                 selectinload(Resume.experiences),
@@ -41,7 +188,7 @@ class CvRepository(BaseRepository):
             )
         )
         result = await self.session.execute(stmt)
-        return result.scalar_one_or_none()
+        return list(result.scalars().all())
 
     async def get_user_resumes(self, user_id: int) -> List[Resume]:
         stmt = (
@@ -57,87 +204,119 @@ class CvRepository(BaseRepository):
             Resume.id == resume_id, Resume.user_id == user_id
         )
         result = await self.session.execute(stmt)
+        self._owned.discard((resume_id, user_id))
+        if result.rowcount > 0:
+            self._mark_changed(resume_id)
         return result.rowcount > 0
 
     # ------------------------------------------------------------------
     # Personal info
     # ------------------------------------------------------------------
 
-    async def update_personal_info(self, resume: Resume, data: dict) -> Resume:
+    @staticmethod
+    def _apply_personal_info(resume: Resume, data: dict) -> None:
+        if "photo_url" in data and data["photo_url"] != resume.photo_url:
+            # The stored variants belong to the previous photo.
+            resume.photo_hash = None
         for key, value in data.items():
             if hasattr(resume, key):
                 setattr(resume, key, value)
+
+    async def update_personal_info(self, resume: Resume, data: dict) -> Resume:
+        self._apply_personal_info(resume, data)
         await self.session.flush()
+        self._mark_changed(resume.id)
+        return resume
+
+    async def set_photo(self, resume: Resume, photo_hash: str, photo_url: str) -> Resume:
+        resume.photo_hash = photo_hash
+        resume.photo_url = photo_url
+        await self.session.flush()
+        self._mark_changed(resume.id)
         return resume
 
     # ------------------------------------------------------------------
     # Template
     # ------------------------------------------------------------------
 
-    async def update_template(
-        self, resume: Resume, template_name: Optional[str], color_hex: Optional[str]
-    ) -> Resume:
+    @staticmethod
+    def _apply_template(resume: Resume, template_name: Optional[str], color_hex: Optional[str]) -> None:
         if template_name is not None:
             resume.template_name = template_name
         if color_hex is not None:
             resume.color_hex = color_hex
+
+    async def update_template(
+        self, resume: Resume, template_name: Optional[str], color_hex: Optional[str]
+    ) -> Resume:
+        self._apply_template(resume, template_name, color_hex)
         await self.session.flush()
+        self._mark_changed(resume.id)
         return resume
 
     # ------------------------------------------------------------------
-    # Section replace helpers (delete-all + bulk-insert)
+    # Section replace helpers (diff-based, see section_sync)
     # ------------------------------------------------------------------
 
-    async def replace_education(self, resume_id: int, items: List[dict]) -> List[Education]:
-        await self.session.execute(
-            delete(Education).where(Education.resume_id == resume_id)
-        )
-        rows = [Education(resume_id=resume_id, **item) for item in items]
-        self.session.add_all(rows)
-        await self.session.flush()
-        return rows
+    async def _replace_section(self, model, resume_id: int, items: List[dict]) -> SectionSync:
+        sync = await sync_section(self.session, model, resume_id, items)
+        if sync.changed:
+            await self._touch(resume_id)
+        return sync
 
-    async def replace_experience(self, resume_id: int, items: List[dict]) -> List[Experience]:
-        await self.session.execute(
-            delete(Experience).where(Experience.resume_id == resume_id)
-        )
-        rows = [Experience(resume_id=resume_id, **item) for item in items]
-        self.session.add_all(rows)
-        await self.session.flush()
-        return rows
+    async def replace_education(self, resume_id: int, items: List[dict]) -> SectionSync:
+        return await self._replace_section(Education, resume_id, items)
 
-    async def replace_skills(self, resume_id: int, items: List[dict]) -> List[Skill]:
-        await self.session.execute(
-            delete(Skill).where(Skill.resume_id == resume_id)
-        )
-        rows = [Skill(resume_id=resume_id, **item) for item in items]
-        self.session.add_all(rows)
-        await self.session.flush()
-        return rows
+    async def replace_experience(self, resume_id: int, items: List[dict]) -> SectionSync:
+        return await self._replace_section(Experience, resume_id, items)
 
-    async def replace_languages(self, resume_id: int, items: List[dict]) -> List[Language]:
-        await self.session.execute(
-            delete(Language).where(Language.resume_id == resume_id)
-        )
-        rows = [Language(resume_id=resume_id, **item) for item in items]
-        self.session.add_all(rows)
-        await self.session.flush()
-        return rows
+    async def replace_skills(self, resume_id: int, items: List[dict]) -> SectionSync:
+        return await self._replace_section(Skill, resume_id, items)
 
-    async def replace_certificates(self, resume_id: int, items: List[dict]) -> List[Certificate]:
-        await self.session.execute(
-            delete(Certificate).where(Certificate.resume_id == resume_id)
-        )
-        rows = [Certificate(resume_id=resume_id, **item) for item in items]
-        self.session.add_all(rows)
-        await self.session.flush()
-        return rows
+    async def replace_languages(self, resume_id: int, items: List[dict]) -> SectionSync:
+        return await self._replace_section(Language, resume_id, items)
 
-    async def replace_custom_sections(self, resume_id: int, items: List[dict]) -> List[CustomSection]:
-        await self.session.execute(
-            delete(CustomSection).where(CustomSection.resume_id == resume_id)
-        )
-        rows = [CustomSection(resume_id=resume_id, **item) for item in items]
-        self.session.add_all(rows)
+    async def replace_certificates(self, resume_id: int, items: List[dict]) -> SectionSync:
+        return await self._replace_section(Certificate, resume_id, items)
+
+    async def replace_custom_sections(self, resume_id: int, items: List[dict]) -> SectionSync:
+        return await self._replace_section(CustomSection, resume_id, items)
+
+    # ------------------------------------------------------------------
+    # Whole-document save
+    # ------------------------------------------------------------------
+
+    async def apply_patch(
+        self,
+        resume: Resume,
+        personal_info: Optional[dict] = None,
+        template: Optional[dict] = None,
+        sections: Optional[Dict[str, List[dict]]] = None,
+    ) -> Dict[str, SectionSync]:
+        """
+        Apply any subset of a resume's parts with a single flush. Sections
+        are diffed as in the section PUTs (the DELETEs run first), the
+        INSERTs and UPDATEs of every section and the resume row itself are
+        then written together. ``resume`` should be loaded without the
+        patched sections; their synced rows are installed as the loaded
+        collections, in display order.
+        """
+        syncs = {}
+        # Otherwise each section's SELECT would flush the previous section's rows.
+        with self.session.no_autoflush:
+            for name, items in (sections or {}).items():
+                syncs[name] = await sync_section(
+                    self.session, SECTION_MODELS[name], resume.id, items, flush=False
+                )
+        if personal_info:
+            self._apply_personal_info(resume, personal_info)
+        if template:
+            self._apply_template(resume, template.get("template_name"), template.get("color_hex"))
+        if any(sync.changed for sync in syncs.values()) or personal_info or template:
+            resume.updated_at = datetime.now(timezone.utc)
+            self._mark_changed(resume.id)
         await self.session.flush()
-        return rows
+        for name, sync in syncs.items():
+            rows = sorted(sync.rows, key=lambda row: (row.sort_order, row.id))
+            set_committed_value(resume, name, rows)
+        return syncs
@@ -0,0 +1,106 @@
+"""
+Diff-based sync of a resume section (education, skills, ...).
+
+The section PUT endpoints replace a whole section with the list the client
+sends. Deleting every row and inserting them all again churned ids,
+bloated the indexes and wrote WAL for the whole section on every autosave,
+even when one typo was fixed. ``sync_section`` instead matches the
+incoming items to the existing rows:
+
+1. by ``id``, for items that carry the id of one of the section's rows;
+2. by position, for items without an id, against the rows not matched by
+   id, in display order (``sort_order``, then ``id``).
+
+Matched rows are updated only when a field actually differs. Unmatched
+items are inserted and unmatched rows deleted: one ``DELETE ... WHERE id
+IN (...)``, one batched INSERT and the UPDATEs of a single flush. The
+result is the same section a delete-all + insert would have produced,
+so the endpoints keep their semantics.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Type
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+@dataclass
+class SectionSync:
+    """Outcome of a sync: the section's rows in item order, and what was written."""
+
+    rows: List[Any] = field(default_factory=list)
+    inserted: int = 0
+    updated: int = 0
+    deleted: int = 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.inserted or self.updated or self.deleted)
+
+    def summary(self) -> Dict[str, int]:
+        return {"inserted": self.inserted, "updated": self.updated, "deleted": self.deleted}
+
+
+def _match(existing: List[Any], items: List[Dict[str, Any]]) -> List[Optional[Any]]:
+    by_id = {row.id: row for row in existing}
+    matches: List[Optional[Any]] = []
+    claimed = set()
+    for item in items:
+        row = by_id.get(item.get("id"))
+        if row is not None and row.id not in claimed:
+            claimed.add(row.id)
+            matches.append(row)
+        else:
+            matches.append(None)
+    free = iter([row for row in existing if row.id not in claimed])
+    for index, item in enumerate(items):
+        # An id that matched nothing names a row that no longer exists, so
+        # that item is new rather than a candidate for the next free row.
+        if matches[index] is None and item.get("id") is None:
+            matches[index] = next(free, None)
+    return matches
+
+
+async def sync_section(
+    session: AsyncSession,
+    model: Type,
+    resume_id: int,
+    items: List[Dict[str, Any]],
+    flush: bool = True,
+) -> SectionSync:
+    """
+    Sync one section. The DELETE runs at once; with ``flush=False`` the
+    INSERT and UPDATEs are left to the caller's next flush, so several
+    sections can be written in one.
+    """
+    result = await session.execute(
+        select(model).where(model.resume_id == resume_id).order_by(model.sort_order, model.id)
+    )
+    existing = list(result.scalars().all())
+    matches = _match(existing, items)
+    sync = SectionSync()
+
+    kept = {row.id for row in matches if row is not None}
+    stale = [row.id for row in existing if row.id not in kept]
+    if stale:
+        await session.execute(delete(model).where(model.id.in_(stale)))
+        sync.deleted = len(stale)
+
+    new_rows = []
+    for item, row in zip(items, matches):
+        values = {key: value for key, value in item.items() if key != "id"}
+        if row is None:
+            row = model(resume_id=resume_id, **values)
+            new_rows.append(row)
+        else:
+            changes = {key: value for key, value in values.items() if getattr(row, key) != value}
+            for key, value in changes.items():
+                setattr(row, key, value)
+            sync.updated += bool(changes)
+        sync.rows.append(row)
+    session.add_all(new_rows)
+    sync.inserted = len(new_rows)
+    if flush and (new_rows or sync.updated):
+        await session.flush()
+    return sync
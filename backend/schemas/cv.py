@@ -1,6 +1,7 @@
 from datetime import datetime
 from typing import List, Optional
-from pydantic import BaseModel
+from uuid import UUID
+from pydantic import BaseModel, Field
 
 
 # ---------------------------------------------------------------------------
@@ -22,7 +23,11 @@ class PersonalInfoUpdate(BaseModel):
     photo_url: Optional[str] = None
 
 
+# Section items. ``id`` is the existing row an item updates; items without
+# one are matched to rows by position (see repositories/section_sync.py).
+
 class EducationItem(BaseModel):
+    id: Optional[int] = None
     institution: str
     degree: Optional[str] = None
     field_of_study: Optional[str] = None
@@ -34,6 +39,7 @@ class EducationItem(BaseModel):
 
 
 class ExperienceItem(BaseModel):
+    id: Optional[int] = None
     job_title: str
     company: Optional[str] = None
     employment_type: Optional[str] = None
@@ -46,18 +52,21 @@ class ExperienceItem(BaseModel):
 
 
 class SkillItem(BaseModel):
+    id: Optional[int] = None
     name: str
     category: str = "technical"
     sort_order: int = 0
 
 
 class LanguageItem(BaseModel):
+    id: Optional[int] = None
     name: str
     proficiency: str = "intermediate"
     sort_order: int = 0
 
 
 class CertificateItem(BaseModel):
+    id: Optional[int] = None
     name: str
     organization: Optional[str] = None
     issue_date: Optional[str] = None
@@ -69,6 +78,7 @@ class CertificateItem(BaseModel):
 
 
 class CustomSectionItem(BaseModel):
+    id: Optional[int] = None
     title: str
     description: Optional[str] = None
     start_date: Optional[str] = None
@@ -78,7 +88,20 @@ class CustomSectionItem(BaseModel):
 
 class TemplateUpdate(BaseModel):
     template_name: Optional[str] = None
-    color_hex: Optional[str] = None
+    color_hex: Optional[str] = Field(None, pattern=r"^#[0-9a-fA-F]{6}$")
+
+
+class ResumePatch(BaseModel):
+    """Any subset of a resume, saved in one transaction; sections are replaced."""
+
+    personal_info: Optional[PersonalInfoUpdate] = None
+    template: Optional[TemplateUpdate] = None
+    educations: Optional[List[EducationItem]] = None
+    experiences: Optional[List[ExperienceItem]] = None
+    skills: Optional[List[SkillItem]] = None
+    languages: Optional[List[LanguageItem]] = None
+    certificates: Optional[List[CertificateItem]] = None
+    custom_sections: Optional[List[CustomSectionItem]] = None
 
 
 # ---------------------------------------------------------------------------
@@ -159,7 +182,7 @@ class CustomSectionOut(BaseModel):
 
 class ResumeResponse(BaseModel):
     id: int
-    uid: str
+    uid: UUID
     title: str
     template_name: Optional[str] = None
     color_hex: Optional[str] = None
@@ -186,7 +209,7 @@ class ResumeResponse(BaseModel):
 
 class ResumeListItem(BaseModel):
     id: int
-    uid: str
+    uid: UUID
     title: str
     completion: int
     template_name: Optional[str] = None
@@ -0,0 +1,174 @@
+from datetime import datetime
+from typing import List, Literal, Optional, Tuple
+from pydantic import BaseModel, Field
+
+
+# ---------------------------------------------------------------------------
+# Export snapshots
+#
+# Plain, frozen copies of a resume and its sections. They are detached from
+# the ORM session, so they can be pickled into export worker processes.
+# ---------------------------------------------------------------------------
+
+class SnapshotModel(BaseModel):
+    model_config = {"from_attributes": True, "frozen": True}
+
+
+class EducationSnapshot(SnapshotModel):
+    institution: str
+    degree: Optional[str] = None
+    field_of_study: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    currently_studying: bool = False
+    description: Optional[str] = None
+    sort_order: int = 0
+
+
+class ExperienceSnapshot(SnapshotModel):
+    job_title: str
+    company: Optional[str] = None
+    employment_type: Optional[str] = None
+    location: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    currently_working: bool = False
+    description: Optional[str] = None
+    sort_order: int = 0
+
+
+class SkillSnapshot(SnapshotModel):
+    name: str
+    category: str = "technical"
+    sort_order: int = 0
+
+
+class LanguageSnapshot(SnapshotModel):
+    name: str
+    proficiency: str = "intermediate"
+    sort_order: int = 0
+
+
+class CertificateSnapshot(SnapshotModel):
+    name: str
+    organization: Optional[str] = None
+    issue_date: Optional[str] = None
+    expiration_date: Optional[str] = None
+    no_expiry: bool = False
+    credential_link: Optional[str] = None
+    description: Optional[str] = None
+    sort_order: int = 0
+
+
+class CustomSectionSnapshot(SnapshotModel):
+    title: str
+    description: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    sort_order: int = 0
+
+
+class ResumeSnapshot(SnapshotModel):
+    id: int
+    title: str = "Untitled Resume"
+    template_name: Optional[str] = None
+    color_hex: Optional[str] = None
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    professional_title: Optional[str] = None
+    email: Optional[str] = None
+    phone: Optional[str] = None
+    location: Optional[str] = None
+    summary: Optional[str] = None
+    photo_url: Optional[str] = None
+    photo_hash: Optional[str] = None
+    updated_at: Optional[datetime] = None
+    educations: Tuple[EducationSnapshot, ...] = ()
+    experiences: Tuple[ExperienceSnapshot, ...] = ()
+    skills: Tuple[SkillSnapshot, ...] = ()
+    languages: Tuple[LanguageSnapshot, ...] = ()
+    certificates: Tuple[CertificateSnapshot, ...] = ()
+    custom_sections: Tuple[CustomSectionSnapshot, ...] = ()
+
+
+# ---------------------------------------------------------------------------
+# Intermediate document model
+#
+# What every export backend renders: the snapshot with dates, skill groups
+# and contact details already formatted. Built once per export by
+# app.services.resume_document.build_document.
+# ---------------------------------------------------------------------------
+
+class DocumentEntry(SnapshotModel):
+    title: str
+    subtitle: Optional[str] = None
+    dates: Optional[str] = None
+    description: Optional[str] = None
+
+
+class SkillGroup(SnapshotModel):
+    label: str
+    skills: str
+
+
+class ResumeDocument(SnapshotModel):
+    id: int
+    template_name: Optional[str] = None
+    color_hex: Optional[str] = None
+    photo_hash: Optional[str] = None
+    name: Optional[str] = None
+    headline: Optional[str] = None
+    contact: Tuple[str, ...] = ()
+    summary: Optional[str] = None
+    experiences: Tuple[DocumentEntry, ...] = ()
+    educations: Tuple[DocumentEntry, ...] = ()
+    skill_groups: Tuple[SkillGroup, ...] = ()
+    languages: Tuple[DocumentEntry, ...] = ()
+    certificates: Tuple[DocumentEntry, ...] = ()
+    custom_sections: Tuple[DocumentEntry, ...] = ()
+
+
+# ---------------------------------------------------------------------------
+# Background export jobs
+# ---------------------------------------------------------------------------
+
+ExportFormat = Literal["pdf", "docx", "txt", "markdown", "json-resume"]
+
+
+class ExportJobCreate(BaseModel):
+    format: ExportFormat = "pdf"
+
+
+class ExportJobResponse(BaseModel):
+    job_id: str
+    status: Literal["pending", "running", "done", "failed"]
+    format: str
+    url: Optional[str] = None
+
+
+# ---------------------------------------------------------------------------
+# Bulk export
+# ---------------------------------------------------------------------------
+
+class BulkExportRequest(BaseModel):
+    resume_ids: List[int] = Field(..., min_length=1, max_length=100)
+    formats: List[ExportFormat] = Field(default=["pdf"], min_length=1)
+
+
+# ---------------------------------------------------------------------------
+# Layout estimates
+# ---------------------------------------------------------------------------
+
+class SectionLayout(BaseModel):
+    name: str
+    height_pt: float
+    start_page: int
+    top_pt: float
+
+
+class LayoutEstimate(BaseModel):
+    page_count: int
+    page_height_pt: float
+    content_height_pt: float
+    last_page_fill: float
+    sections: List[SectionLayout]
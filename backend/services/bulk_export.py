@@ -0,0 +1,101 @@
+"""
+Streamed ZIP archives of many exports.
+
+Members are rendered concurrently through the export renderer (artifact
+cache, then the export process pool) and written to the archive in
+completion order. The ZIP is produced on an unseekable sink, so every
+member is flushed to the client as soon as it is written and the full
+archive is never held in memory. When several formats are requested, the
+intermediate document of each resume is built once and shared by all of
+its format jobs.
+"""
+
+import asyncio
+import io
+import time
+import zipfile
+from typing import AsyncIterator, List, Optional, Sequence, Tuple
+
+from app.schemas.export import ResumeDocument, ResumeSnapshot
+from app.services.export_artifact import ExportArtifact
+from app.services.export_renderer import ExportRenderer
+from app.services.export_service import export_filename
+from app.services.resume_document import build_document
+from app.services.text_export import SNAPSHOT_FORMATS
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, unseekable file object that collects written chunks."""
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class BulkExporter:
+    def __init__(self, renderer: ExportRenderer, concurrency: int = 2):
+        self.renderer = renderer
+        self.concurrency = concurrency
+
+    async def _render(
+        self,
+        semaphore: asyncio.Semaphore,
+        resume: ResumeSnapshot,
+        fmt: str,
+        document: Optional[ResumeDocument] = None,
+    ) -> Tuple[str, ExportArtifact]:
+        async with semaphore:
+            artifact = await self.renderer.render(resume, fmt, document=document)
+        return export_filename(f"resume_{resume.id}", fmt), artifact
+
+    async def stream_zip(
+        self, resumes: Sequence[ResumeSnapshot], formats: Sequence[str]
+    ) -> AsyncIterator[bytes]:
+        # Bounded below the executor's queue so a single archive cannot
+        # trip its back-pressure on its own.
+        semaphore = asyncio.Semaphore(self.concurrency)
+        formats = list(dict.fromkeys(formats))
+        shared = len([fmt for fmt in formats if fmt not in SNAPSHOT_FORMATS]) > 1
+        tasks = []
+        for resume in resumes:
+            document = build_document(resume) if shared else None
+            tasks += [
+                asyncio.ensure_future(self._render(semaphore, resume, fmt, document))
+                for fmt in formats
+            ]
+        sink = _ChunkSink()
+        try:
+            with zipfile.ZipFile(sink, mode="w", compression=zipfile.ZIP_STORED) as archive:
+                for next_member in asyncio.as_completed(tasks):
+                    name, artifact = await next_member
+                    info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+                    info.file_size = artifact.size
+                    # Spooled members are copied chunk by chunk, so even a
+                    # large member is never held in memory as a whole.
+                    with archive.open(info, mode="w") as member:
+                        async for chunk in artifact.chunks():
+                            member.write(chunk)
+                            yield sink.drain()
+                    yield sink.drain()
+            yield sink.drain()
+        finally:
+            for task in tasks:
+                task.cancel()
+                if task.done() and not task.cancelled() and task.exception() is None:
+                    task.result()[1].discard()
@@ -2,7 +2,22 @@
 
 import json
 from redis.asyncio import Redis
-from typing import Any, Optional
+from typing import Any, Iterable, Optional, Set
+
+# KEYS[1] = key, ARGV[1] = value, ARGV[2] = expiry in seconds (0 for none).
+_SET_MAX_SCRIPT = """
+local current = tonumber(redis.call('GET', KEYS[1]))
+if current and current >= tonumber(ARGV[1]) then
+    return 0
+end
+if tonumber(ARGV[2]) > 0 then
+    redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+else
+    redis.call('SET', KEYS[1], ARGV[1])
+end
+return 1
+"""
+
 
 class CacheService:
     def __init__(self, redis_client: Redis, prefix: str = "cache"):
@@ -25,5 +40,42 @@ class CacheService:
         json_value = json.dumps(value)
         await self.redis.set(self._format_key(key), json_value, ex=expire)
 
-    async def delete(self, key: str):
-        await self.redis.delete(self._format_key(key))
+    async def set_if_absent(self, key: str, value: Any, expire: Optional[int]) -> bool:
+        json_value = json.dumps(value)
+        return bool(await self.redis.set(self._format_key(key), json_value, ex=expire, nx=True))
+
+    async def delete(self, key: str) -> int:
+        return await self.redis.delete(self._format_key(key))
+
+    async def exists(self, key: str) -> bool:
+        return bool(await self.redis.exists(self._format_key(key)))
+
+    # Raw values are stored as-is; use with a client created with
+    # ``decode_responses=False`` when the payload is binary.
+    async def get_raw(self, key: str) -> Optional[Any]:
+        return await self.redis.get(self._format_key(key))
+
+    async def set_raw(self, key: str, value: Any, expire: Optional[int]):
+        await self.redis.set(self._format_key(key), value, ex=expire)
+
+    async def set_max(self, key: str, value: int, expire: Optional[int]) -> bool:
+        """Store ``value`` unless the key already holds a number at least as large."""
+        return bool(await self.redis.eval(
+            _SET_MAX_SCRIPT, 1, self._format_key(key), value, expire or 0
+        ))
+
+    async def delete_many(self, keys: Iterable[str]):
+        formatted = [self._format_key(key) for key in keys]
+        if formatted:
+            await self.redis.delete(*formatted)
+
+    async def add_member(self, key: str, member: Any, expire: Optional[int]):
+        formatted = self._format_key(key)
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.sadd(formatted, member)
+            if expire:
+                pipe.expire(formatted, expire)
+            await pipe.execute()
+
+    async def members(self, key: str) -> Set[Any]:
+        return await self.redis.smembers(self._format_key(key))
@@ -1,7 +1,8 @@
-from typing import Awaitable, Callable, List
+from typing import Awaitable, Callable, List, Optional, Tuple
 
 from fastapi import HTTPException, status
 
+from app.core.metrics import metrics
 from app.core.uof import UnitOfWork
 from app.models.user import User
 from app.schemas.cv import (
@@ -12,15 +13,41 @@ from app.schemas.cv import (
     LanguageItem,
     PersonalInfoUpdate,
     ResumeCreateRequest,
+    ResumePatch,
     SkillItem,
     TemplateUpdate,
 )
+from app.repositories.section_sync import SectionSync
+from app.schemas.export import ResumeSnapshot
+from app.services.prerender import SpeculativeRenderer
+from app.services.resume_cache import ResumeDocumentCache
 from .base_service import BaseService
 
+_section_rows = metrics.counter(
+    "resume_section_rows_written_total", "Section rows written by section saves, by operation"
+)
+
+# Resume relationship -> section label used by the section PUTs and metrics.
+_SECTION_LABELS = {
+    "educations": "education",
+    "experiences": "experience",
+    "skills": "skills",
+    "languages": "languages",
+    "certificates": "certificates",
+    "custom_sections": "custom_sections",
+}
+
 
 class CvService(BaseService):
-    def __init__(self, uow_factory: Callable[[], Awaitable[UnitOfWork]]):
+    def __init__(
+        self,
+        uow_factory: Callable[[], Awaitable[UnitOfWork]],
+        prerenderer: Optional[SpeculativeRenderer] = None,
+        resume_cache: Optional[ResumeDocumentCache] = None,
+    ):
         self.uow_factory = uow_factory
+        self.prerenderer = prerenderer
+        self.resume_cache = resume_cache
 
     # ------------------------------------------------------------------
     # Helpers
@@ -35,6 +62,19 @@ class CvService(BaseService):
             )
         return resume
 
+    async def _ensure_owned(self, uow, resume_id: int, user: User) -> None:
+        """404 unless the user owns the resume; for writes that don't return it."""
+        if not await uow.cv.owns_resume(resume_id, user.id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Resume not found",
+            )
+
+    def _edited(self, resume_id: int, user: User) -> None:
+        """Called after an edit has been committed."""
+        if self.prerenderer is not None:
+            self.prerenderer.schedule(resume_id, user.id)
+
     # ------------------------------------------------------------------
     # Resume CRUD
     # ------------------------------------------------------------------
@@ -47,6 +87,40 @@ class CvService(BaseService):
         async with self.uow_factory() as uow:
             return await self._get_owned_resume(uow, resume_id, user)
 
+    async def get_cached_resume_document(self, resume_id: int, user: User) -> Optional[Tuple[int, bytes]]:
+        """``(version, ResumeResponse JSON)`` if the cache holds the current version for ``user``."""
+        if self.resume_cache is None:
+            return None
+        return await self.resume_cache.get(resume_id, user.id)
+
+    async def get_resume_document(self, resume_id: int, user: User) -> Tuple[int, bytes]:
+        """
+        ``(version, ResumeResponse JSON)`` of an owned resume, built by the
+        database in one query and cached. Try ``get_cached_resume_document``
+        first.
+        """
+        async with self.uow_factory() as uow:
+            loaded = await uow.cv.get_resume_document(resume_id, user.id)
+        if loaded is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Resume not found",
+            )
+        if self.resume_cache is not None:
+            await self.resume_cache.put(resume_id, user.id, *loaded)
+        return loaded
+
+    async def get_resume_stamp(self, resume_id: int, user: User):
+        """Version stamp of an owned resume, for conditional requests."""
+        async with self.uow_factory() as uow:
+            stamp = await uow.cv.get_resume_stamp(resume_id, user.id)
+        if stamp is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Resume not found",
+            )
+        return stamp
+
     async def list_resumes(self, user: User):
         async with self.uow_factory() as uow:
             return await uow.cv.get_user_resumes(user.id)
@@ -59,6 +133,8 @@ class CvService(BaseService):
                     status_code=status.HTTP_404_NOT_FOUND,
                     detail="Resume not found",
                 )
+        if self.prerenderer is not None:
+            self.prerenderer.cancel(resume_id)
 
     # ------------------------------------------------------------------
     # Personal info
@@ -69,9 +145,11 @@ class CvService(BaseService):
     ):
         async with self.uow_factory() as uow:
             resume = await self._get_owned_resume(uow, resume_id, user)
-            return await uow.cv.update_personal_info(
+            result = await uow.cv.update_personal_info(
                 resume, data.model_dump(exclude_unset=True)
             )
+        self._edited(resume_id, user)
+        return result
 
     # ------------------------------------------------------------------
     # Template
@@ -80,73 +158,149 @@ class CvService(BaseService):
     async def update_template(self, resume_id: int, user: User, data: TemplateUpdate):
         async with self.uow_factory() as uow:
             resume = await self._get_owned_resume(uow, resume_id, user)
-            return await uow.cv.update_template(
+            result = await uow.cv.update_template(
                 resume, data.template_name, data.color_hex
             )
+        self._edited(resume_id, user)
+        return result
 
     # ------------------------------------------------------------------
     # Section replacements
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def _count_rows(section: str, sync: SectionSync) -> None:
+        for op, count in sync.summary().items():
+            if count:
+                _section_rows.inc(count, section=section, op=op)
+
+    def _synced(self, section: str, resume_id: int, user: User, sync: SectionSync) -> None:
+        self._count_rows(section, sync)
+        # An autosave that changed nothing leaves the resume, and every
+        # export of it, as it was.
+        if sync.changed:
+            self._edited(resume_id, user)
+
     async def replace_education(
         self, resume_id: int, user: User, items: List[EducationItem]
     ):
         async with self.uow_factory() as uow:
-            await self._get_owned_resume(uow, resume_id, user)
-            return await uow.cv.replace_education(
+            await self._ensure_owned(uow, resume_id, user)
+            sync = await uow.cv.replace_education(
                 resume_id, [i.model_dump() for i in items]
             )
+        self._synced("education", resume_id, user, sync)
+        return sync
 
     async def replace_experience(
         self, resume_id: int, user: User, items: List[ExperienceItem]
     ):
         async with self.uow_factory() as uow:
-            await self._get_owned_resume(uow, resume_id, user)
-            return await uow.cv.replace_experience(
+            await self._ensure_owned(uow, resume_id, user)
+            sync = await uow.cv.replace_experience(
                 resume_id, [i.model_dump() for i in items]
             )
+        self._synced("experience", resume_id, user, sync)
+        return sync
 
     async def replace_skills(
         self, resume_id: int, user: User, items: List[SkillItem]
     ):
         async with self.uow_factory() as uow:
-            await self._get_owned_resume(uow, resume_id, user)
-            return await uow.cv.replace_skills(
+            await self._ensure_owned(uow, resume_id, user)
+            sync = await uow.cv.replace_skills(
                 resume_id, [i.model_dump() for i in items]
             )
+        self._synced("skills", resume_id, user, sync)
+        return sync
 
     async def replace_languages(
         self, resume_id: int, user: User, items: List[LanguageItem]
     ):
         async with self.uow_factory() as uow:
-            await self._get_owned_resume(uow, resume_id, user)
-            return await uow.cv.replace_languages(
+            await self._ensure_owned(uow, resume_id, user)
+            sync = await uow.cv.replace_languages(
                 resume_id, [i.model_dump() for i in items]
             )
+        self._synced("languages", resume_id, user, sync)
+        return sync
 
     async def replace_certificates(
         self, resume_id: int, user: User, items: List[CertificateItem]
     ):
         async with self.uow_factory() as uow:
-            await self._get_owned_resume(uow, resume_id, user)
-            return await uow.cv.replace_certificates(
+            await self._ensure_owned(uow, resume_id, user)
+            sync = await uow.cv.replace_certificates(
                 resume_id, [i.model_dump() for i in items]
             )
+        self._synced("certificates", resume_id, user, sync)
+        return sync
 
     async def replace_custom_sections(
         self, resume_id: int, user: User, items: List[CustomSectionItem]
     ):
         async with self.uow_factory() as uow:
-            await self._get_owned_resume(uow, resume_id, user)
-            return await uow.cv.replace_custom_sections(
+            await self._ensure_owned(uow, resume_id, user)
+            sync = await uow.cv.replace_custom_sections(
                 resume_id, [i.model_dump() for i in items]
             )
+        self._synced("custom_sections", resume_id, user, sync)
+        return sync
+
+    # ------------------------------------------------------------------
+    # Whole-resume save
+    # ------------------------------------------------------------------
+
+    async def save_resume(self, resume_id: int, user: User, data: ResumePatch):
+        """
+        Save any subset of a resume in one transaction and return it with
+        every section loaded. Sections that are not part of the patch are
+        loaded with the resume; the patched ones come from the sync.
+        """
+        sections = {
+            name: [i.model_dump() for i in items]
+            for name in _SECTION_LABELS
+            if (items := getattr(data, name)) is not None
+        }
+        personal_info = data.personal_info.model_dump(exclude_unset=True) if data.personal_info else None
+        template = data.template.model_dump(exclude_none=True) if data.template else None
+        async with self.uow_factory() as uow:
+            resume = await uow.cv.get_resume(
+                resume_id, user.id, sections=[name for name in _SECTION_LABELS if name not in sections]
+            )
+            if not resume:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Resume not found",
+                )
+            syncs = await uow.cv.apply_patch(resume, personal_info, template, sections)
+        for name, sync in syncs.items():
+            self._count_rows(_SECTION_LABELS[name], sync)
+        if personal_info or template or any(sync.changed for sync in syncs.values()):
+            self._edited(resume_id, user)
+        return resume
 
     # ------------------------------------------------------------------
     # Export
     # ------------------------------------------------------------------
 
-    async def get_resume_for_export(self, resume_id: int, user: User):
-        """Return the resume ORM object for export (PDF/DOCX generation)."""
+    async def get_resume_for_export(self, resume_id: int, user: User) -> ResumeSnapshot:
+        """Return a detached, picklable snapshot of the resume for export workers."""
         async with self.uow_factory() as uow:
-            return await self._get_owned_resume(uow, resume_id, user)
+            resume = await self._get_owned_resume(uow, resume_id, user)
+            return ResumeSnapshot.model_validate(resume)
+
+    async def get_resumes_for_export(
+        self, resume_ids: List[int], user: User
+    ) -> List[ResumeSnapshot]:
+        """Snapshots of several owned resumes, in the requested order."""
+        async with self.uow_factory() as uow:
+            resumes = await uow.cv.get_resumes(resume_ids, user.id)
+            by_id = {r.id: ResumeSnapshot.model_validate(r) for r in resumes}
+        missing = [i for i in resume_ids if i not in by_id]
+        if missing:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Resumes not found: {missing}",
+            )
+        return [by_id[i] for i in resume_ids]
@@ -0,0 +1,147 @@
+"""
+Base document for DOCX exports.
+
+``Document()`` unpacks python-docx's bundled template from disk on every
+call, and the exporter used to format text run by run. Instead, a base
+document carrying the named styles the exporter uses is built once per
+process, serialised, and every export opens a copy of those in-memory
+bytes. The template's font and accent colour are written into the styles
+of the base, once per combination, so exports only reference styles by
+name.
+"""
+
+import io
+from functools import lru_cache
+from typing import Iterable, Optional
+
+from docx import Document
+from docx.document import Document as DocxDocument
+from docx.enum.style import WD_STYLE_TYPE
+from docx.shared import Pt, RGBColor
+from docx.text.paragraph import Paragraph
+from docx.text.run import Run
+
+DEFAULT_ACCENT = "#111118"
+
+# Styles referenced by generate_docx.
+TITLE_STYLE = "Title"
+HEADING_STYLE = "Heading 1"
+SUBTITLE_STYLE = "Resume Subtitle"
+DATES_STYLE = "Resume Dates"
+NOTE_STYLE = "Resume Note"
+STRONG_STYLE = "Resume Strong"
+
+_KEEP_STYLES = {
+    "Normal",
+    "Default Paragraph Font",
+    "Normal Table",
+    "No List",
+    TITLE_STYLE,
+    HEADING_STYLE,
+}
+
+
+def _style_id(name: str) -> str:
+    # Ids python-docx assigns to both built-in and added styles.
+    return name.replace(" ", "")
+
+
+def _rgb(hex_str: str) -> RGBColor:
+    h = hex_str.lstrip("#")
+    return RGBColor(int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16))
+
+
+def _normalise(hex_str: str) -> str:
+    h = (hex_str or DEFAULT_ACCENT).lstrip("#").upper()
+    if len(h) != 6:
+        h = DEFAULT_ACCENT.lstrip("#")
+    return f"#{h}"
+
+
+def _build_base(font: Optional[str]) -> DocxDocument:
+    doc = Document()
+    styles = doc.styles
+
+    # The bundled template defines ~160 styles; only the ones used here are
+    # kept so every export does not carry (and re-serialise) the rest.
+    keep = set(_KEEP_STYLES)
+    for name in list(keep):
+        base = getattr(styles[name], "base_style", None)
+        while base is not None:
+            keep.add(base.name)
+            base = getattr(base, "base_style", None)
+    for style in list(styles):
+        if style.name not in keep:
+            style.element.getparent().remove(style.element)
+    styles.element._remove_latentStyles()
+
+    subtitle = styles.add_style(SUBTITLE_STYLE, WD_STYLE_TYPE.PARAGRAPH)
+    subtitle.base_style = styles["Normal"]
+    subtitle.font.size = Pt(14)
+    subtitle.font.color.rgb = RGBColor(0x66, 0x66, 0x66)
+
+    dates = styles.add_style(DATES_STYLE, WD_STYLE_TYPE.PARAGRAPH)
+    dates.base_style = styles["Normal"]
+    dates.font.size = Pt(9)
+    dates.font.color.rgb = RGBColor(0x88, 0x88, 0x88)
+    dates.paragraph_format.space_before = Pt(0)
+
+    note = styles.add_style(NOTE_STYLE, WD_STYLE_TYPE.PARAGRAPH)
+    note.base_style = styles["Normal"]
+    note.font.size = Pt(9)
+
+    strong = styles.add_style(STRONG_STYLE, WD_STYLE_TYPE.CHARACTER)
+    strong.font.bold = True
+
+    if font:
+        # Headings use the theme's heading font unless overridden.
+        for name in ("Normal", TITLE_STYLE, HEADING_STYLE):
+            styles[name].font.name = font
+    return doc
+
+
+@lru_cache(maxsize=None)
+def _base_bytes(font: Optional[str]) -> bytes:
+    buf = io.BytesIO()
+    _build_base(font).save(buf)
+    return buf.getvalue()
+
+
+@lru_cache(maxsize=256)
+def _accented_base_bytes(accent: str, font: Optional[str]) -> bytes:
+    doc = Document(io.BytesIO(_base_bytes(font)))
+    color = _rgb(accent)
+    for name in (TITLE_STYLE, HEADING_STYLE):
+        doc.styles[name].font.color.rgb = color
+    buf = io.BytesIO()
+    doc.save(buf)
+    return buf.getvalue()
+
+
+def add_paragraph(doc: DocxDocument, text: str = "", style: Optional[str] = None) -> Paragraph:
+    """``doc.add_paragraph`` that applies ``style`` by its known id.
+
+    python-docx resolves style names with an XPath scan of styles.xml on
+    every call; the base document's ids are fixed, so the lookup is skipped.
+    """
+    paragraph = doc.add_paragraph(text)
+    if style is not None:
+        paragraph._p.style = _style_id(style)
+    return paragraph
+
+
+def add_run(paragraph: Paragraph, text: str, style: Optional[str] = None) -> Run:
+    run = paragraph.add_run(text)
+    if style is not None:
+        run._r.style = _style_id(style)
+    return run
+
+
+def new_document(accent_hex: Optional[str] = None, font: Optional[str] = None) -> DocxDocument:
+    """Fresh document opened from the cached base for ``accent_hex`` and ``font``."""
+    return Document(io.BytesIO(_accented_base_bytes(_normalise(accent_hex), font)))
+
+
+def warm_up(fonts: Iterable[Optional[str]] = (None,)) -> None:
+    for font in fonts:
+        new_document(DEFAULT_ACCENT, font)
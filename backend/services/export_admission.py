@@ -0,0 +1,199 @@
+"""
+Admission control for synchronous exports, shared by all API workers.
+
+Every export request must hold a slot while it renders:
+
+- at most ``concurrency`` slots are held at once across all workers;
+- one user may hold or wait for at most ``per_user`` slots (429 beyond);
+- requests that find no free slot wait in a FIFO queue of at most
+  ``queue_size`` entries for up to ``max_wait`` seconds (503 when the
+  queue is full or the wait runs out).
+
+State lives in three Redis sorted sets, which are updated atomically by a
+Lua script:
+- active slots, scored by lease expiry;
+- the wait queue, scored by enqueue time;
+- each user's slots and queue entries.
+
+A worker that dies while holding a slot loses it once its lease expires.
+If Redis is unavailable, requests are admitted rather than failed, and
+the export pool's own bound still applies.
+"""
+
+import asyncio
+import time
+import uuid
+from typing import Optional
+
+from loguru import logger
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.core.exceptions import ServiceUnavailableError, TooManyRequestsError
+from app.core.metrics import metrics
+
+_admitted = metrics.counter("export_admission_admitted_total", "Export requests given a slot")
+_rejected = metrics.counter("export_admission_rejected_total", "Export requests refused, by reason")
+_wait = metrics.histogram("export_admission_wait_seconds", "Time export requests spent queued for a slot")
+_active = metrics.gauge("export_admission_active", "Export slots held across all workers, as last observed")
+
+ACTIVE_KEY = "export-admission:active"
+WAITING_KEY = "export-admission:waiting"
+USER_KEY = "export-admission:user:{user_id}"
+
+# Returns {status, active slots}; status is ok, queued, user or full.
+_ACQUIRE_SCRIPT = """
+local active, waiting, user = KEYS[1], KEYS[2], KEYS[3]
+local token = ARGV[1]
+local now = tonumber(ARGV[2])
+local lease_until = tonumber(ARGV[3])
+local wait_until = tonumber(ARGV[4])
+local stale_before = tonumber(ARGV[5])
+local concurrency = tonumber(ARGV[6])
+local per_user = tonumber(ARGV[7])
+local queue_size = tonumber(ARGV[8])
+local key_ttl = tonumber(ARGV[9])
+
+redis.call('ZREMRANGEBYSCORE', active, '-inf', now)
+redis.call('ZREMRANGEBYSCORE', user, '-inf', now)
+redis.call('ZREMRANGEBYSCORE', waiting, '-inf', stale_before)
+
+local queued = redis.call('ZSCORE', waiting, token)
+if not queued and redis.call('ZCARD', user) >= per_user then
+    return {'user', redis.call('ZCARD', active)}
+end
+
+local held = redis.call('ZCARD', active)
+local ahead
+if queued then
+    ahead = redis.call('ZRANK', waiting, token)
+else
+    ahead = redis.call('ZCARD', waiting)
+end
+if ahead < concurrency - held then
+    redis.call('ZREM', waiting, token)
+    redis.call('ZADD', active, lease_until, token)
+    redis.call('ZADD', user, lease_until, token)
+    redis.call('EXPIRE', active, key_ttl)
+    redis.call('EXPIRE', user, key_ttl)
+    return {'ok', held + 1}
+end
+
+if not queued then
+    if redis.call('ZCARD', waiting) >= queue_size then
+        return {'full', held}
+    end
+    redis.call('ZADD', waiting, now, token)
+    redis.call('EXPIRE', waiting, key_ttl)
+end
+redis.call('ZADD', user, wait_until, token)
+redis.call('EXPIRE', user, key_ttl)
+return {'queued', held}
+"""
+
+
+class ExportAdmission:
+    def __init__(
+        self,
+        redis_client: Redis,
+        concurrency: int = 8,
+        per_user: int = 2,
+        queue_size: int = 32,
+        max_wait: float = 10.0,
+        lease: float = 60.0,
+    ):
+        self.redis = redis_client
+        self.concurrency = concurrency
+        self.per_user = per_user
+        self.queue_size = queue_size
+        self.max_wait = max_wait
+        self.lease = lease
+        self._acquire_script = redis_client.register_script(_ACQUIRE_SCRIPT)
+
+    async def _try_acquire(self, token: str, user_id: int) -> str:
+        now = time.time()
+        status, held = await self._acquire_script(
+            keys=[ACTIVE_KEY, WAITING_KEY, USER_KEY.format(user_id=user_id)],
+            args=[
+                token,
+                now,
+                now + self.lease,
+                now + self.max_wait + 1,
+                now - self.max_wait - 1,
+                self.concurrency,
+                self.per_user,
+                self.queue_size,
+                int(self.lease + self.max_wait) + 1,
+            ],
+        )
+        _active.set(int(held))
+        return status.decode() if isinstance(status, bytes) else status
+
+    async def _release(self, token: str, user_id: int) -> None:
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                pipe.zrem(ACTIVE_KEY, token)
+                pipe.zrem(WAITING_KEY, token)
+                pipe.zrem(USER_KEY.format(user_id=user_id), token)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Export admission release failed: {e}")
+
+    def _reject(self, reason: str, retry_after: float, too_many: bool = False):
+        _rejected.inc(reason=reason)
+        headers = {"Retry-After": str(max(1, int(retry_after)))}
+        if too_many:
+            return TooManyRequestsError(
+                detail="Too many exports in progress for this user", headers=headers
+            )
+        return ServiceUnavailableError(
+            detail="Export capacity exhausted, please retry shortly", headers=headers
+        )
+
+    async def acquire(self, user_id: int) -> Optional[str]:
+        """Wait for a slot; returns its token, or ``None`` when Redis is unavailable."""
+        token = uuid.uuid4().hex
+        started = time.monotonic()
+        delay = 0.05
+        try:
+            while True:
+                try:
+                    status = await self._try_acquire(token, user_id)
+                except RedisError as e:
+                    logger.warning(f"Export admission unavailable, admitting: {e}")
+                    return None
+                if status == "ok":
+                    _admitted.inc()
+                    _wait.observe(time.monotonic() - started)
+                    return token
+                if status == "user":
+                    raise self._reject("user_limit", 1, too_many=True)
+                if status == "full":
+                    raise self._reject("queue_full", self.max_wait)
+                if time.monotonic() - started >= self.max_wait:
+                    await self._release(token, user_id)
+                    raise self._reject("wait_timeout", self.max_wait)
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 0.25)
+        except asyncio.CancelledError:
+            # The client went away while queued.
+            await self._release(token, user_id)
+            raise
+
+    async def renew(self, token: Optional[str], user_id: int) -> None:
+        """Extend a held slot's lease, for exports that stream longer than one lease."""
+        if token is None:
+            return
+        lease_until = time.time() + self.lease
+        try:
+            async with self.redis.pipeline(transaction=True) as pipe:
+                # XX: a slot whose lease already ran out is not brought back.
+                pipe.zadd(ACTIVE_KEY, {token: lease_until}, xx=True)
+                pipe.zadd(USER_KEY.format(user_id=user_id), {token: lease_until}, xx=True)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Export admission renewal failed: {e}")
+
+    async def release(self, token: Optional[str], user_id: int) -> None:
+        if token is not None:
+            await self._release(token, user_id)
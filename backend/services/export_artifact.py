@@ -0,0 +1,98 @@
+"""
+Rendered export documents handed from export workers to responses.
+
+Small documents travel inline as bytes. Documents above the spool
+threshold are written to a file by the worker process, and only the path
+crosses the process boundary. The API process therefore never holds a
+large document in memory, and it reads the file back in chunks while
+sending it. Either way the size is known up front, so responses carry an
+exact ``Content-Length``.
+
+A spool file is removed once its response has been sent or abandoned.
+Files nobody picks up (the job outlived its timeout, the response never
+started) are removed by ``sweep_spool_dir`` once they are old enough.
+"""
+
+import asyncio
+import os
+import tempfile
+import time
+from typing import AsyncIterator, Optional
+
+from loguru import logger
+
+CHUNK_SIZE = 64 * 1024
+SPOOL_SUFFIX = ".export"
+
+
+class ExportArtifact:
+    __slots__ = ("data", "path", "size")
+
+    def __init__(self, data: Optional[bytes] = None, path: Optional[str] = None, size: int = 0):
+        self.data = data
+        self.path = path
+        self.size = len(data) if data is not None else size
+
+    @classmethod
+    def from_bytes(cls, data: bytes, spool_threshold: int, spool_dir: str) -> "ExportArtifact":
+        if len(data) <= spool_threshold:
+            return cls(data=data)
+        os.makedirs(spool_dir, exist_ok=True)
+        fd, path = tempfile.mkstemp(dir=spool_dir, suffix=SPOOL_SUFFIX)
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        return cls(path=path, size=len(data))
+
+    @property
+    def spooled(self) -> bool:
+        return self.path is not None
+
+    async def chunks(self, chunk_size: int = CHUNK_SIZE) -> AsyncIterator[bytes]:
+        """Yield the document in chunks; a spool file is removed once consumed or abandoned."""
+        if self.data is not None:
+            view = memoryview(self.data)
+            for start in range(0, self.size, chunk_size):
+                yield bytes(view[start:start + chunk_size])
+            return
+        try:
+            f = await asyncio.to_thread(open, self.path, "rb")
+            try:
+                while True:
+                    chunk = await asyncio.to_thread(f.read, chunk_size)
+                    if not chunk:
+                        break
+                    yield chunk
+            finally:
+                f.close()
+        finally:
+            self.discard()
+
+    def discard(self) -> None:
+        if self.path is not None:
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+            self.path = None
+
+
+def sweep_spool_dir(spool_dir: str, max_age: float) -> int:
+    """Remove spool files older than ``max_age`` seconds; returns how many were removed."""
+    cutoff = time.time() - max_age
+    removed = 0
+    try:
+        entries = list(os.scandir(spool_dir))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        if not entry.name.endswith(SPOOL_SUFFIX):
+            continue
+        try:
+            if entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except FileNotFoundError:
+            pass
+    if removed:
+        logger.info(f"Removed {removed} abandoned export spool files from {spool_dir}")
+    return removed
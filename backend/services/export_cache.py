@@ -0,0 +1,197 @@
+"""
+Content-addressed cache for rendered export artifacts.
+
+Artifacts are keyed by a hash of everything that influences the output:
+the resume snapshot, template name, accent colour, export format and the
+layout version of that format. An unchanged resume therefore always maps
+to the same key and repeat downloads skip rendering entirely.
+
+Two tiers are used:
+- an in-process LRU bounded by total bytes, for the hottest artifacts;
+- Redis (through ``CacheService``), shared by all API workers.
+"""
+
+import hashlib
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set
+
+from loguru import logger
+from redis.exceptions import RedisError
+
+from app.core.metrics import metrics
+from app.schemas.export import ResumeSnapshot
+from app.services.cache_service import CacheService
+from app.services.export_service import ExportService
+from app.services.text_export import SNAPSHOT_FORMATS
+
+_hits = metrics.counter("export_cache_hits_total", "Export artifacts served from cache")
+_misses = metrics.counter("export_cache_misses_total", "Export artifacts that had to be rendered")
+_lru_bytes = metrics.gauge("export_cache_lru_bytes", "Bytes held by the in-process export cache")
+_prerender_used = metrics.counter(
+    "export_prerender_used_total", "Speculatively rendered artifacts that were later served"
+)
+
+
+class ExportArtifactCache:
+    def __init__(
+        self,
+        cache_service: CacheService,
+        max_bytes: int = 64 * 1024 * 1024,
+        max_entry_bytes: int = 8 * 1024 * 1024,
+        ttl: int = 24 * 60 * 60,
+    ):
+        self.cache_service = cache_service
+        self.max_bytes = max_bytes
+        self.max_entry_bytes = max_entry_bytes
+        self.ttl = ttl
+        self._lru: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lru_size = 0
+        # Which resume each in-process entry belongs to, so invalidation
+        # works on this tier even when Redis is unreachable. Only keys held
+        # by the LRU are indexed; eviction removes them.
+        self._keys_by_resume: Dict[int, Set[str]] = {}
+        self._resume_by_key: Dict[str, int] = {}
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def make_key(snapshot: ResumeSnapshot, fmt: str) -> str:
+        digest = hashlib.sha256()
+        # updated_at changes on every save even when nothing visible did,
+        # so it is left out to keep the key purely content-addressed. The
+        # formats built from the snapshot itself print it, so they keep it.
+        exclude = set() if fmt in SNAPSHOT_FORMATS else {"updated_at"}
+        digest.update(snapshot.model_dump_json(exclude=exclude).encode())
+        for part in (
+            snapshot.template_name or "",
+            snapshot.color_hex or "",
+            fmt,
+            ExportService.layout_version(fmt, snapshot.template_name),
+        ):
+            digest.update(b"\x00" + part.encode())
+        return f"{fmt}:{digest.hexdigest()}"
+
+    @staticmethod
+    def _resume_index_key(resume_id: int) -> str:
+        return f"resume:{resume_id}"
+
+    @staticmethod
+    def _speculative_key(key: str) -> str:
+        return f"speculative:{key}"
+
+    # ------------------------------------------------------------------
+    # In-process tier
+    # ------------------------------------------------------------------
+
+    def _lru_get(self, key: str) -> Optional[bytes]:
+        data = self._lru.get(key)
+        if data is not None:
+            self._lru.move_to_end(key)
+        return data
+
+    def _lru_put(self, key: str, data: bytes, resume_id: int) -> None:
+        if len(data) > self.max_entry_bytes:
+            return
+        previous = self._lru.pop(key, None)
+        if previous is not None:
+            self._lru_size -= len(previous)
+        self._lru[key] = data
+        self._lru_size += len(data)
+        self._resume_by_key[key] = resume_id
+        self._keys_by_resume.setdefault(resume_id, set()).add(key)
+        while self._lru_size > self.max_bytes and self._lru:
+            evicted_key, evicted = self._lru.popitem(last=False)
+            self._lru_size -= len(evicted)
+            self._unindex(evicted_key)
+        _lru_bytes.set(self._lru_size)
+
+    def _lru_discard(self, keys: Iterable[str]) -> None:
+        for key in list(keys):
+            data = self._lru.pop(key, None)
+            if data is not None:
+                self._lru_size -= len(data)
+                self._unindex(key)
+        _lru_bytes.set(self._lru_size)
+
+    def _unindex(self, key: str) -> None:
+        resume_id = self._resume_by_key.pop(key, None)
+        keys = self._keys_by_resume.get(resume_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_resume[resume_id]
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    async def get(self, snapshot: ResumeSnapshot, fmt: str) -> Optional[bytes]:
+        key = self.make_key(snapshot, fmt)
+        data = self._lru_get(key)
+        if data is not None:
+            _hits.inc(format=fmt, tier="memory")
+        else:
+            try:
+                data = await self.cache_service.get_raw(key)
+            except RedisError as e:
+                logger.warning(f"Export cache read failed: {e}")
+                data = None
+            if data is None:
+                _misses.inc(format=fmt)
+                return None
+            _hits.inc(format=fmt, tier="redis")
+            self._lru_put(key, data, snapshot.id)
+        await self._claim_speculative(key, fmt)
+        return data
+
+    async def contains(self, snapshot: ResumeSnapshot, fmt: str) -> bool:
+        """Whether an artifact is cached, without touching hit/miss metrics."""
+        key = self.make_key(snapshot, fmt)
+        if key in self._lru:
+            return True
+        try:
+            return await self.cache_service.exists(key)
+        except RedisError as e:
+            logger.warning(f"Export cache read failed: {e}")
+            return False
+
+    async def put(
+        self, snapshot: ResumeSnapshot, fmt: str, data: bytes, speculative: bool = False
+    ) -> None:
+        key = self.make_key(snapshot, fmt)
+        self._lru_put(key, data, snapshot.id)
+        if len(data) > self.max_entry_bytes:
+            return
+        try:
+            await self.cache_service.set_raw(key, data, expire=self.ttl)
+            await self.cache_service.add_member(
+                self._resume_index_key(snapshot.id), key, expire=self.ttl
+            )
+            if speculative:
+                await self.cache_service.set_raw(self._speculative_key(key), b"1", expire=self.ttl)
+        except RedisError as e:
+            logger.warning(f"Export cache write failed: {e}")
+
+    async def _claim_speculative(self, key: str, fmt: str) -> None:
+        # The marker lives in Redis so a hit on any API worker counts, and
+        # deleting it makes sure each speculative render is counted once.
+        try:
+            if await self.cache_service.delete(self._speculative_key(key)):
+                _prerender_used.inc(format=fmt)
+        except RedisError as e:
+            logger.warning(f"Export cache read failed: {e}")
+
+    async def invalidate_resumes(self, resume_ids: Iterable[int]) -> None:
+        """Drop every cached artifact of the given resumes from both tiers."""
+        for resume_id in resume_ids:
+            self._lru_discard(self._keys_by_resume.get(resume_id, ()))
+            index_key = self._resume_index_key(resume_id)
+            try:
+                keys = await self.cache_service.members(index_key)
+                keys = [k.decode() if isinstance(k, bytes) else k for k in keys]
+                self._lru_discard(keys)
+                await self.cache_service.delete_many([*keys, index_key])
+            except RedisError as e:
+                logger.warning(f"Export cache invalidation failed: {e}")
@@ -0,0 +1,183 @@
+"""
+Process pool for CPU-bound export rendering.
+
+xhtml2pdf and python-docx hold the GIL for hundreds of milliseconds per
+document, so rendering on the event loop stalls every other request on
+the worker. ``ExportExecutor`` moves that work into a bounded pool of
+child processes and gives callers an awaitable API.
+"""
+
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional, Set, Tuple
+
+from loguru import logger
+
+from app.core.exceptions import GatewayTimeoutError, ServiceUnavailableError
+from app.core.metrics import metrics
+from app.core.timing import StageTimer
+
+_queue_depth = metrics.gauge("export_queue_depth", "Export jobs waiting or running")
+_queue_wait = metrics.histogram("export_queue_wait_seconds", "Time from submit to worker pickup")
+_job_latency = metrics.histogram("export_job_seconds", "Time from submit to result")
+_rejected = metrics.counter("export_jobs_rejected_total", "Jobs refused because the queue was full")
+_timeouts = metrics.counter("export_jobs_timeout_total", "Jobs that exceeded the per-job timeout")
+_recycled = metrics.counter("export_pool_recycled_total", "Worker pools retired and replaced")
+_broken = metrics.counter("export_pool_broken_total", "Worker pools lost to a crashed worker process")
+
+
+def _run_job(fn: Callable, args: tuple) -> Tuple[float, Any]:
+    """Executed inside the worker process; reports when the job was picked up."""
+    return time.time(), fn(*args)
+
+
+class ExportExecutor:
+    """
+    Bounded process pool for export jobs.
+
+    - At most ``max_workers + queue_size`` jobs are accepted at once; the
+      next caller gets a 503 with ``Retry-After`` instead of queueing forever.
+    - Each job is bounded by ``job_timeout`` seconds (504 on expiry).
+    - After roughly ``max_jobs_per_worker`` jobs per process the pool is
+      retired and a fresh one is started, which caps memory growth from
+      xhtml2pdf/reportlab caches. Retired pools finish their in-flight jobs
+      before their processes exit.
+    - A worker that dies (OOM kill, a crash in a native library) breaks
+      its whole pool; the jobs on it get a 503 and the next job starts a
+      fresh pool.
+    - ``on_retire`` is called whenever a pool is retired, e.g. to clean up
+      after jobs that were abandoned with it.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        queue_size: int = 16,
+        job_timeout: float = 30.0,
+        max_jobs_per_worker: int = 100,
+        initializer: Optional[Callable[[], None]] = None,
+        on_retire: Optional[Callable[[], None]] = None,
+    ):
+        self.max_workers = max_workers
+        self.capacity = max_workers + queue_size
+        self.job_timeout = job_timeout
+        self.max_jobs_per_pool = max_workers * max_jobs_per_worker
+        self.initializer = initializer
+        self.on_retire = on_retire
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._pool_jobs = 0
+        self._inflight: Set[Future] = set()
+
+    @property
+    def pending(self) -> int:
+        """Jobs queued or running in the pool, whether or not their caller still waits."""
+        return len(self._inflight)
+
+    def _track(self, future: Future) -> None:
+        # A job stays counted until the pool is done with it: cancelling
+        # the awaiting caller does not free a worker that already runs it.
+        loop = asyncio.get_running_loop()
+
+        def done(f: Future) -> None:
+            try:
+                loop.call_soon_threadsafe(self._untrack, f)
+            except RuntimeError:
+                pass  # loop already closed
+
+        self._inflight.add(future)
+        _queue_depth.set(len(self._inflight))
+        future.add_done_callback(done)
+
+    def _untrack(self, future: Future) -> None:
+        self._inflight.discard(future)
+        _queue_depth.set(len(self._inflight))
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # "spawn" avoids forking a process that already runs an event loop
+        # and holds open DB/Redis sockets.
+        return ProcessPoolExecutor(
+            max_workers=self.max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=self.initializer,
+        )
+
+    def _retire_pool(self, pool: Optional[ProcessPoolExecutor] = None) -> None:
+        """Retire ``pool``, if it is still the current one (default: the current pool)."""
+        if pool is not None and pool is not self._pool:
+            return
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            _recycled.inc()
+        self._pool = None
+        self._pool_jobs = 0
+        if self.on_retire is not None:
+            try:
+                self.on_retire()
+            except Exception as e:
+                logger.warning(f"Export pool retire hook failed: {e}")
+
+    def _acquire_pool(self) -> ProcessPoolExecutor:
+        if self._pool is not None and self._pool_jobs >= self.max_jobs_per_pool:
+            logger.debug(f"Recycling export pool after {self._pool_jobs} jobs")
+            self._retire_pool()
+        if self._pool is None:
+            self._pool = self._new_pool()
+        self._pool_jobs += 1
+        return self._pool
+
+    async def run(self, fn: Callable, *args: Any, timer: Optional[StageTimer] = None) -> Any:
+        """
+        Run ``fn(*args)`` in a worker process. ``fn`` and ``args`` must be
+        picklable. Time spent waiting for a worker is added to ``timer``
+        as the ``queue`` stage.
+        """
+        if len(self._inflight) >= self.capacity:
+            _rejected.inc()
+            raise ServiceUnavailableError(
+                detail="Export queue is full, please retry shortly",
+                headers={"Retry-After": str(max(1, int(self.job_timeout // 10)))},
+            )
+
+        submitted = time.time()
+        pool = future = None
+        try:
+            pool = self._acquire_pool()
+            future = pool.submit(_run_job, fn, args)
+            self._track(future)
+            started, result = await asyncio.wait_for(
+                asyncio.wrap_future(future), timeout=self.job_timeout
+            )
+        except asyncio.TimeoutError:
+            _timeouts.inc()
+            if future is not None and not future.cancel():
+                # The job is already running and cannot be interrupted, so
+                # stop routing new work to the pool that is stuck with it;
+                # it no longer occupies a worker of the pool that replaces it.
+                self._untrack(future)
+                self._retire_pool(pool)
+            raise GatewayTimeoutError(detail="Export timed out")
+        except BrokenProcessPool:
+            # A worker process died; the pool refuses every later submit.
+            if pool is self._pool:
+                _broken.inc()
+                logger.warning("Export worker process died; replacing the pool")
+            self._retire_pool(pool)
+            raise ServiceUnavailableError(
+                detail="Export worker crashed, please retry",
+                headers={"Retry-After": "1"},
+            )
+
+        wait = max(0.0, started - submitted)
+        _queue_wait.observe(wait)
+        if timer is not None:
+            timer.add("queue", wait)
+        _job_latency.observe(time.time() - submitted)
+        return result
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
@@ -0,0 +1,124 @@
+import asyncio
+import uuid
+from typing import Optional, Tuple
+
+from celery import Celery
+from fastapi import HTTPException, status
+
+from app.core.config import configs
+from app.models.user import User
+from app.schemas.export import ExportJobResponse, ResumeSnapshot
+from app.services.cache_service import CacheService
+from app.services.export_cache import ExportArtifactCache
+from app.services.export_service import export_filename
+from app.services.export_storage import ExportStorage
+from .base_service import BaseService
+
+RENDER_EXPORT_TASK = "app.tasks.render_export"
+
+_CELERY_STATES = {
+    "PENDING": "pending",
+    "RECEIVED": "pending",
+    "RETRY": "pending",
+    "STARTED": "running",
+    "SUCCESS": "done",
+    "FAILURE": "failed",
+    "REVOKED": "failed",
+}
+
+
+class ExportJobService(BaseService):
+    """
+    Background export jobs rendered by the Celery worker.
+
+    Job metadata lives in Redis under ``export-job:{job_id}``. Finished
+    artifacts are stored under content-addressed keys, so a job whose
+    artifact already exists is reported as done without being queued, and
+    a second request for an export that is still rendering gets the id of
+    the job already in flight.
+    """
+
+    def __init__(
+        self,
+        celery_app: Celery,
+        cache_service: CacheService,
+        storage: ExportStorage,
+    ):
+        self.celery_app = celery_app
+        self.cache_service = cache_service
+        self.storage = storage
+
+    @staticmethod
+    def storage_key(snapshot: ResumeSnapshot, fmt: str) -> str:
+        digest = ExportArtifactCache.make_key(snapshot, fmt).split(":", 1)[1]
+        return export_filename(f"exports/{digest[:2]}/{digest}", fmt)
+
+    async def enqueue(self, snapshot: ResumeSnapshot, fmt: str, user: User) -> ExportJobResponse:
+        key = self.storage_key(snapshot, fmt)
+        inflight_key = f"export-job:inflight:{user.id}:{key}"
+
+        existing = await self.cache_service.get_json(inflight_key)
+        if existing:
+            current = await self.get_status(existing, user)
+            if current.status != "failed":
+                return current
+            await self.cache_service.delete(inflight_key)
+
+        # Job metadata is written before the job is claimed, so whoever
+        # reads the claim can always resolve it.
+        job_id = uuid.uuid4().hex
+        await self.cache_service.set(
+            f"export-job:{job_id}",
+            {"user_id": user.id, "resume_id": snapshot.id, "format": fmt, "key": key},
+            expire=configs.EXPORT_JOB_TTL,
+        )
+        if not await self.cache_service.set_if_absent(inflight_key, job_id, expire=configs.EXPORT_JOB_TTL):
+            # A concurrent identical request claimed it first.
+            return await self.get_status(await self.cache_service.get_json(inflight_key), user)
+
+        if not await asyncio.to_thread(self.storage.exists, key):
+            await asyncio.to_thread(
+                self.celery_app.send_task,
+                RENDER_EXPORT_TASK,
+                args=[snapshot.model_dump(mode="json"), fmt, key],
+                task_id=job_id,
+            )
+        return await self.get_status(job_id, user)
+
+    async def _get_job(self, job_id: str, user: User) -> dict:
+        job = await self.cache_service.get_json(f"export-job:{job_id}")
+        if not job or job["user_id"] != user.id:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Export job not found",
+            )
+        return job
+
+    async def get_status(self, job_id: str, user: User) -> ExportJobResponse:
+        job = await self._get_job(job_id, user)
+        if await asyncio.to_thread(self.storage.exists, job["key"]):
+            return ExportJobResponse(
+                job_id=job_id,
+                status="done",
+                format=job["format"],
+                url=self._download_url(job_id, job["key"]),
+            )
+        state = await asyncio.to_thread(lambda: self.celery_app.AsyncResult(job_id).state)
+        job_status = _CELERY_STATES.get(state, "pending")
+        # The task reports success only after the artifact is stored, so a
+        # "done" state without the file means storage lost it.
+        if job_status == "done":
+            job_status = "failed"
+        return ExportJobResponse(job_id=job_id, status=job_status, format=job["format"])
+
+    async def get_local_artifact(self, job_id: str, user: User) -> Optional[Tuple[str, str]]:
+        """``(path, format)`` of a finished artifact, for backends without presigned URLs."""
+        job = await self._get_job(job_id, user)
+        path = self.storage.path(job["key"])
+        if path is None or not await asyncio.to_thread(self.storage.exists, job["key"]):
+            return None
+        return path, job["format"]
+
+    def _download_url(self, job_id: str, key: str) -> str:
+        url = self.storage.presigned_url(key, configs.EXPORT_URL_EXPIRES)
+        return url or f"{configs.API_V1_STR}/exports/{job_id}/download"
@@ -0,0 +1,103 @@
+import tempfile
+import time
+from typing import AsyncIterator, Optional
+
+from app.core.metrics import metrics
+from app.core.timing import StageTimer
+from app.schemas.export import ResumeDocument, ResumeSnapshot
+from app.services.export_artifact import ExportArtifact
+from app.services.export_cache import ExportArtifactCache
+from app.services.export_executor import ExportExecutor
+from app.services.export_service import ExportService
+from app.services.text_export import SNAPSHOT_FORMATS, TEXT_FORMATS
+
+_stage_seconds = metrics.histogram(
+    "export_stage_seconds", "Duration of each export stage by format and template"
+)
+_output_bytes = metrics.histogram(
+    "export_output_bytes",
+    "Size of rendered export artifacts",
+    buckets=(8e3, 16e3, 32e3, 64e3, 128e3, 256e3, 512e3, 1e6, 2e6, 4e6, 8e6),
+)
+
+
+def template_label(resume: ResumeSnapshot) -> str:
+    return resume.template_name or "default"
+
+
+def observe_stages(timer: StageTimer, fmt: str, template: str) -> None:
+    for stage, seconds in timer.stages.items():
+        _stage_seconds.observe(seconds, stage=stage, format=fmt, template=template)
+
+
+async def timed_body(artifact: ExportArtifact, fmt: str, template: str) -> AsyncIterator[bytes]:
+    """Response body that records how long the client took to receive it."""
+    start = time.perf_counter()
+    async for chunk in artifact.chunks():
+        yield chunk
+    _stage_seconds.observe(time.perf_counter() - start, stage="write", format=fmt, template=template)
+
+
+class ExportRenderer:
+    """
+    Produce an export artifact, from the artifact cache when possible and
+    otherwise through the export process pool, recording every stage.
+
+    Documents larger than ``spool_threshold`` come back from the worker as
+    a spool file and are streamed from disk; they bypass the cache.
+
+    Text formats are rendered in this process: they take microseconds, less
+    than the round trip to the pool would.
+
+    The artifact cache is keyed by the snapshot. A prebuilt ``document`` for
+    that snapshot, when given, is what the worker renders from, except for
+    formats built from the snapshot itself.
+    """
+
+    def __init__(
+        self,
+        executor: ExportExecutor,
+        export_cache: ExportArtifactCache,
+        spool_threshold: int = 1024 * 1024,
+        spool_dir: str = tempfile.gettempdir(),
+    ):
+        self.executor = executor
+        self.export_cache = export_cache
+        self.spool_threshold = spool_threshold
+        self.spool_dir = spool_dir
+
+    async def render(
+        self,
+        resume: ResumeSnapshot,
+        fmt: str,
+        timer: Optional[StageTimer] = None,
+        document: Optional[ResumeDocument] = None,
+    ) -> ExportArtifact:
+        timer = timer or StageTimer()
+        template = template_label(resume)
+        with timer.stage("cache"):
+            data = await self.export_cache.get(resume, fmt)
+        if data is not None:
+            artifact = ExportArtifact(data=data)
+        else:
+            source = resume if document is None or fmt in SNAPSHOT_FORMATS else document
+            if fmt in TEXT_FORMATS:
+                artifact, stages = ExportService.render_artifact(
+                    source, fmt, self.spool_threshold, self.spool_dir
+                )
+            else:
+                artifact, stages = await self.executor.run(
+                    ExportService.render_artifact,
+                    source,
+                    fmt,
+                    self.spool_threshold,
+                    self.spool_dir,
+                    timer=timer,
+                )
+            timer.merge(stages)
+            if not artifact.spooled:
+                with timer.stage("cache_store"):
+                    await self.export_cache.put(resume, fmt, artifact.data)
+            _output_bytes.observe(artifact.size, format=fmt, template=template)
+        observe_stages(timer, fmt, template)
+        return artifact
@@ -1,181 +1,226 @@
 from __future__ import annotations
 
 import io
-import os
+from typing import Dict, Optional, Tuple, Union
 
-from jinja2 import Environment, FileSystemLoader
+from docx.shared import Cm
 from xhtml2pdf import pisa
-from docx import Document
-from docx.shared import Pt, RGBColor
-from docx.enum.text import WD_ALIGN_PARAGRAPH
 
-from app.models.cv import Resume
+from app.core.timing import StageTimer
+from app.schemas.export import DocumentEntry, ResumeDocument, ResumeSnapshot
+from app.services import docx_base
+from app.services.export_artifact import ExportArtifact
+from app.services.pdf_engine import create_pdf
+from app.services.photo_variants import get_photo_cache, photo_url
+from app.services.resume_document import as_document
+from app.services.template_registry import PDF_FONT_STACKS, get_template_registry
+from app.services.text_export import TEXT_FORMATS, TEXT_LAYOUT_VERSION, serialize
 
-_TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
+MEDIA_TYPES = {
+    "pdf": "application/pdf",
+    "docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "txt": "text/plain; charset=utf-8",
+    "markdown": "text/markdown; charset=utf-8",
+    "json-resume": "application/json",
+}
+# Where the file extension differs from the format name.
+FILE_EXTENSIONS = {"markdown": "md", "json-resume": "json"}
+PREVIEW_MEDIA_TYPE = "text/html; charset=utf-8"
+
+# Bump whenever generate_docx changes its output; the PDF layout is
+# versioned by the contents of the template files instead.
+DOCX_LAYOUT_VERSION = "5"
+
+# Export entry points take a snapshot, or a document already built from
+# one so several formats can share it.
+ExportSource = Union[ResumeSnapshot, ResumeDocument]
+
+# Smallest document that exercises xhtml2pdf's CSS parser and font setup.
+_WARM_UP_HTML = "<html><head><style>body {{ font-family: {font}; }}</style></head><body><p>.</p></body></html>"
+
+
+def export_filename(stem: str, fmt: str) -> str:
+    return f"{stem}.{FILE_EXTENSIONS.get(fmt, fmt)}"
 
 
 class ExportService:
     @staticmethod
-    def generate_pdf(resume: Resume) -> bytes:
-        env = Environment(loader=FileSystemLoader(_TEMPLATE_DIR))
-        template = env.get_template("resume.html")
-        html = template.render(resume=resume, color_hex=resume.color_hex or "#111118")
+    def warm_up() -> None:
+        """
+        Prepare every catalogue template ahead of the first job: compile
+        templates and stylesheets, build the DOCX bases and lay out a
+        minimal PDF in each font (export worker initializer and startup).
+        """
+        registry = get_template_registry()
+        specs = list(registry.specs.values())
+        docx_base.warm_up({None, *(spec.docx_font for spec in specs)})
+        for font in {"Helvetica", *(spec.pdf_font for spec in specs)}:
+            stack = PDF_FONT_STACKS.get(font, PDF_FONT_STACKS["Helvetica"])
+            pisa.CreatePDF(io.StringIO(_WARM_UP_HTML.format(font=stack)), dest=io.BytesIO())
+
+    @staticmethod
+    def layout_version(fmt: str, template_name: Optional[str] = None) -> str:
+        """Identify the layout an export format renders with, for cache keys."""
+        if fmt in TEXT_FORMATS:
+            return TEXT_LAYOUT_VERSION
+        if fmt == "docx":
+            font = get_template_registry().spec(template_name).docx_font
+            return f"{DOCX_LAYOUT_VERSION}:{font or ''}"
+        return get_template_registry().version(template_name)
+
+    @staticmethod
+    def render(resume: ExportSource, fmt: str, timer: Optional[StageTimer] = None) -> bytes:
+        timer = timer or StageTimer()
+        if fmt in TEXT_FORMATS:
+            with timer.stage("serialize"):
+                return serialize(resume, fmt)
+        with timer.stage("model"):
+            document = as_document(resume)
+        if fmt == "pdf":
+            return ExportService.generate_pdf(document, timer)
+        if fmt == "docx":
+            with timer.stage("docx"):
+                return ExportService.generate_docx(document)
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    @staticmethod
+    def render_timed(resume: ExportSource, fmt: str) -> Tuple[bytes, Dict[str, float]]:
+        """Render and return per-stage durations; used across the process boundary."""
+        timer = StageTimer()
+        data = ExportService.render(resume, fmt, timer)
+        return data, timer.stages
+
+    @staticmethod
+    def render_artifact(
+        resume: ExportSource, fmt: str, spool_threshold: int, spool_dir: str
+    ) -> Tuple[ExportArtifact, Dict[str, float]]:
+        """Like ``render_timed``, but large documents are spooled to a file instead of returned."""
+        timer = StageTimer()
+        data = ExportService.render(resume, fmt, timer)
+        with timer.stage("spool"):
+            artifact = ExportArtifact.from_bytes(data, spool_threshold, spool_dir)
+        return artifact, timer.stages
+
+    @staticmethod
+    def render_html(resume: ExportSource) -> str:
+        """HTML document laid out by the PDF export, with the photo inlined."""
+        document = as_document(resume)
+        photo_src = get_photo_cache().data_uri(document.photo_hash)
+        return get_template_registry().render(document, photo_src=photo_src)
+
+    @staticmethod
+    def render_preview(resume: ExportSource) -> str:
+        """
+        The PDF's HTML for in-browser preview. Cheap enough to render in
+        the API process: templates are precompiled and unchanged sections
+        come from the fragment cache. The photo is linked rather than
+        inlined, so the browser fetches and caches it separately.
+        """
+        document = as_document(resume)
+        photo_src = photo_url(document.photo_hash, "print") if document.photo_hash else None
+        return get_template_registry().render(document, photo_src=photo_src)
+
+    @staticmethod
+    def generate_pdf(resume: ExportSource, timer: Optional[StageTimer] = None) -> bytes:
+        timer = timer or StageTimer()
+        with timer.stage("html"):
+            html = ExportService.render_html(resume)
 
         buf = io.BytesIO()
-        pisa_status = pisa.CreatePDF(io.StringIO(html), dest=buf)
+        with timer.stage("pdf_layout"):
+            pisa_status = create_pdf(io.StringIO(html), buf)
         if pisa_status.err:
             raise RuntimeError("PDF generation failed")
         return buf.getvalue()
 
     @staticmethod
-    def generate_docx(resume: Resume) -> bytes:
-        doc = Document()
-
-        # -- Helper to parse hex color --------------------------------
-        def _color(hex_str: str | None) -> RGBColor:
-            h = (hex_str or "#111118").lstrip("#")
-            return RGBColor(int(h[0:2], 16), int(h[2:4], 16), int(h[4:6], 16))
-
-        accent = _color(resume.color_hex)
-
-        # -- Name heading ---------------------------------------------
-        name = f"{resume.first_name or ''} {resume.last_name or ''}".strip()
-        if name:
-            h = doc.add_heading(name, level=0)
-            for run in h.runs:
-                run.font.color.rgb = accent
-
-        # -- Professional title ----------------------------------------
-        if resume.professional_title:
-            p = doc.add_paragraph()
-            run = p.add_run(resume.professional_title)
-            run.font.size = Pt(14)
-            run.font.color.rgb = RGBColor(0x66, 0x66, 0x66)
-
-        # -- Contact info ----------------------------------------------
-        contact_parts = [
-            v for v in [resume.email, resume.phone, resume.location] if v
-        ]
-        if contact_parts:
-            doc.add_paragraph(" | ".join(contact_parts))
+    def generate_docx(resume: ExportSource) -> bytes:
+        document = as_document(resume)
+        # Opened from the cached base document; all formatting, including
+        # the accent colour of the headings, comes from its named styles.
+        spec = get_template_registry().spec(document.template_name)
+        doc = docx_base.new_document(document.color_hex, spec.docx_font)
+
+        def _paragraph(text: str = "", style: Optional[str] = None):
+            return docx_base.add_paragraph(doc, text, style)
+
+        def _heading(text: str) -> None:
+            _paragraph(text, docx_base.HEADING_STYLE)
+
+        def _strong(paragraph, text: str) -> None:
+            docx_base.add_run(paragraph, text, docx_base.STRONG_STYLE)
+
+        def _entry(
+            entry: DocumentEntry, subtitle_inline: bool = False, dates_style: str = docx_base.DATES_STYLE
+        ) -> None:
+            p = _paragraph()
+            _strong(p, entry.title)
+            if entry.subtitle and subtitle_inline:
+                p.add_run(f" — {entry.subtitle}")
+            elif entry.subtitle:
+                _paragraph(entry.subtitle)
+            if entry.dates:
+                _paragraph(entry.dates, dates_style)
+            if entry.description:
+                _paragraph(entry.description)
+
+        # -- Photo -----------------------------------------------------
+        photo = get_photo_cache().get(document.photo_hash)
+        if photo:
+            doc.add_picture(io.BytesIO(photo), width=Cm(3))
+
+        # -- Name, title and contact info ------------------------------
+        if document.name:
+            _paragraph(document.name, docx_base.TITLE_STYLE)
+        if document.headline:
+            _paragraph(document.headline, docx_base.SUBTITLE_STYLE)
+        if document.contact:
+            _paragraph(" | ".join(document.contact))
 
         # -- Summary ---------------------------------------------------
-        if resume.summary:
-            h = doc.add_heading("Summary", level=1)
-            for run in h.runs:
-                run.font.color.rgb = accent
-            doc.add_paragraph(resume.summary)
+        if document.summary:
+            _heading("Summary")
+            _paragraph(document.summary)
 
         # -- Experience ------------------------------------------------
-        if resume.experiences:
-            h = doc.add_heading("Experience", level=1)
-            for run in h.runs:
-                run.font.color.rgb = accent
-            for exp in resume.experiences:
-                p = doc.add_paragraph()
-                title_run = p.add_run(exp.job_title)
-                title_run.bold = True
-                if exp.company:
-                    p.add_run(f" — {exp.company}")
-                date_parts = []
-                if exp.start_date:
-                    date_parts.append(exp.start_date)
-                if exp.currently_working:
-                    date_parts.append("Present")
-                elif exp.end_date:
-                    date_parts.append(exp.end_date)
-                if date_parts:
-                    dp = doc.add_paragraph(" – ".join(date_parts))
-                    dp.paragraph_format.space_before = Pt(0)
-                    for run in dp.runs:
-                        run.font.size = Pt(9)
-                        run.font.color.rgb = RGBColor(0x88, 0x88, 0x88)
-                if exp.description:
-                    doc.add_paragraph(exp.description)
+        if document.experiences:
+            _heading("Experience")
+            for entry in document.experiences:
+                _entry(entry, subtitle_inline=True)
 
         # -- Education -------------------------------------------------
-        if resume.educations:
-            h = doc.add_heading("Education", level=1)
-            for run in h.runs:
-                run.font.color.rgb = accent
-            for edu in resume.educations:
-                p = doc.add_paragraph()
-                inst_run = p.add_run(edu.institution)
-                inst_run.bold = True
-                if edu.degree or edu.field_of_study:
-                    parts = [v for v in [edu.degree, edu.field_of_study] if v]
-                    doc.add_paragraph(" in ".join(parts))
-                date_parts = []
-                if edu.start_date:
-                    date_parts.append(edu.start_date)
-                if edu.currently_studying:
-                    date_parts.append("Present")
-                elif edu.end_date:
-                    date_parts.append(edu.end_date)
-                if date_parts:
-                    dp = doc.add_paragraph(" – ".join(date_parts))
-                    for run in dp.runs:
-                        run.font.size = Pt(9)
-                        run.font.color.rgb = RGBColor(0x88, 0x88, 0x88)
-                if edu.description:
-                    doc.add_paragraph(edu.description)
+        if document.educations:
+            _heading("Education")
+            for entry in document.educations:
+                _entry(entry)
 
         # -- Skills ----------------------------------------------------
-        if resume.skills:
-            h = doc.add_heading("Skills", level=1)
-            for run in h.runs:
-                run.font.color.rgb = accent
-            technical = [s for s in resume.skills if s.category == "technical"]
-            soft = [s for s in resume.skills if s.category == "soft"]
-            if technical:
-                p = doc.add_paragraph()
-                p.add_run("Technical: ").bold = True
-                p.add_run(", ".join(s.name for s in technical))
-            if soft:
-                p = doc.add_paragraph()
-                p.add_run("Soft Skills: ").bold = True
-                p.add_run(", ".join(s.name for s in soft))
+        if document.skill_groups:
+            _heading("Skills")
+            for group in document.skill_groups:
+                p = _paragraph()
+                _strong(p, f"{group.label}: ")
+                p.add_run(group.skills)
 
         # -- Languages -------------------------------------------------
-        if resume.languages:
-            h = doc.add_heading("Languages", level=1)
-            for run in h.runs:
-                run.font.color.rgb = accent
-            for lang in resume.languages:
-                doc.add_paragraph(f"{lang.name} — {lang.proficiency}")
+        if document.languages:
+            _heading("Languages")
+            for entry in document.languages:
+                _paragraph(f"{entry.title} — {entry.subtitle}")
 
         # -- Certificates ----------------------------------------------
-        if resume.certificates:
-            h = doc.add_heading("Certificates", level=1)
-            for run in h.runs:
-                run.font.color.rgb = accent
-            for cert in resume.certificates:
-                p = doc.add_paragraph()
-                p.add_run(cert.name).bold = True
-                if cert.organization:
-                    doc.add_paragraph(cert.organization)
-                date_info = []
-                if cert.issue_date:
-                    date_info.append(f"Issued: {cert.issue_date}")
-                if cert.expiration_date:
-                    date_info.append(f"Expires: {cert.expiration_date}")
-                if cert.no_expiry:
-                    date_info.append("No expiration")
-                if date_info:
-                    dp = doc.add_paragraph(" | ".join(date_info))
-                    for run in dp.runs:
-                        run.font.size = Pt(9)
-                if cert.description:
-                    doc.add_paragraph(cert.description)
+        if document.certificates:
+            _heading("Certificates")
+            for entry in document.certificates:
+                _entry(entry, dates_style=docx_base.NOTE_STYLE)
 
         # -- Custom Sections -------------------------------------------
-        if resume.custom_sections:
-            for section in resume.custom_sections:
-                h = doc.add_heading(section.title, level=1)
-                for run in h.runs:
-                    run.font.color.rgb = accent
-                if section.description:
-                    doc.add_paragraph(section.description)
+        for entry in document.custom_sections:
+            _heading(entry.title)
+            if entry.dates:
+                _paragraph(entry.dates, docx_base.DATES_STYLE)
+            if entry.description:
+                _paragraph(entry.description)
 
         buf = io.BytesIO()
         doc.save(buf)
@@ -0,0 +1,90 @@
+"""
+Storage backends for finished export artifacts.
+
+Artifacts produced by background export jobs are stored under
+content-addressed keys, so an identical export is never stored twice.
+``S3ExportStorage`` hands out presigned URLs; ``LocalExportStorage`` keeps
+files on disk and relies on the API to stream them back.
+"""
+
+import os
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from app.core.config import configs
+
+
+class ExportStorage(ABC):
+    @abstractmethod
+    def save(self, key: str, data: bytes, content_type: str) -> None:
+        ...
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        ...
+
+    @abstractmethod
+    def load(self, key: str) -> bytes:
+        ...
+
+    def presigned_url(self, key: str, expires_in: int) -> Optional[str]:
+        """Direct download URL, or ``None`` if the API has to serve the file."""
+        return None
+
+    def path(self, key: str) -> Optional[str]:
+        """Local filesystem path of the artifact, if the backend has one."""
+        return None
+
+
+class LocalExportStorage(ExportStorage):
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+
+    def path(self, key: str) -> str:
+        path = os.path.normpath(os.path.join(self.root_dir, key))
+        if not path.startswith(os.path.normpath(self.root_dir) + os.sep):
+            raise ValueError(f"Invalid export key: {key}")
+        return path
+
+    def save(self, key: str, data: bytes, content_type: str) -> None:
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # Write then rename, so readers never observe a partial file.
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def exists(self, key: str) -> bool:
+        return os.path.exists(self.path(key))
+
+    def load(self, key: str) -> bytes:
+        with open(self.path(key), "rb") as f:
+            return f.read()
+
+
+class S3ExportStorage(ExportStorage):
+    def __init__(self, bucket: str):
+        # Imported lazily: boto3 clients are only needed for this backend.
+        from app.services.s3_service import S3Service
+
+        self.bucket = bucket
+        self.s3_service = S3Service()
+
+    def save(self, key: str, data: bytes, content_type: str) -> None:
+        self.s3_service.put_bytes(self.bucket, key, data, content_type, private=True)
+
+    def exists(self, key: str) -> bool:
+        return self.s3_service.object_exists(self.bucket, key)
+
+    def load(self, key: str) -> bytes:
+        return self.s3_service.get_bytes(self.bucket, key)
+
+    def presigned_url(self, key: str, expires_in: int) -> str:
+        return self.s3_service.get_presigned_url(self.bucket, key, expires_in=expires_in)
+
+
+def create_export_storage() -> ExportStorage:
+    if configs.EXPORT_STORAGE_BACKEND == "s3":
+        return S3ExportStorage(configs.EXPORT_STORAGE_BUCKET)
+    return LocalExportStorage(configs.EXPORT_STORAGE_DIR)
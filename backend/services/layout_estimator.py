@@ -0,0 +1,407 @@
+"""
+Page-count and layout estimates without rendering a PDF.
+
+``LayoutEstimator`` answers "does this fit on one page?" in well under a
+millisecond by replaying, in simplified form, what xhtml2pdf and
+reportlab do with ``resume.html``:
+
+- Every leaf block of the template becomes a paragraph. Its leading is
+  its own font size times the body line-height, and its margins come from
+  its own rule or, failing that, from its enclosing ``div``.
+- Text is word-wrapped greedily using the standard PDF font metrics, as
+  reportlab does.
+- Blocks are stacked into frames the size of the ``@page`` content box.
+  Adjacent margins collapse, the top margin is dropped at the top of a
+  page, and paragraphs split between lines but never leave a single first
+  line at the bottom of a page.
+
+Box geometry is read from the template's rendered stylesheet, so spacing
+changes in the CSS are picked up automatically. Structural changes to the
+fragments must be mirrored in ``_blocks``. ``benchmarks/layout_calibration.py``
+compares estimates against real ``generate_pdf`` output.
+"""
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+from reportlab.lib import pagesizes
+from reportlab.lib.units import cm, inch, mm
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from app.schemas.export import LayoutEstimate, ResumeDocument, SectionLayout
+from app.services.export_service import ExportSource
+from app.services.resume_document import as_document
+from app.services.template_registry import (
+    DEFAULT_COLOR,
+    FRAGMENTS,
+    TemplateRegistry,
+    TemplateSpec,
+    get_template_registry,
+)
+
+# Regular and bold face of each catalogue PDF font.
+PDF_FONT_FACES = {
+    "Helvetica": ("Helvetica", "Helvetica-Bold"),
+    "Times": ("Times-Roman", "Times-Bold"),
+}
+
+# Size of the photo and its table cell in the header fragment, in points.
+PHOTO_HEIGHT = 90 * 0.75
+PHOTO_CELL_WIDTH = 100 * 0.75
+# An inline image sits on the baseline of its line, this fraction of the
+# font size above the bottom of the line box.
+IMAGE_DESCENT = 0.25
+
+_RULE = re.compile(r"([^{}]+)\{([^{}]*)\}")
+_LENGTH = re.compile(r"^(-?[\d.]+)(px|pt|cm|mm|in|em)?$")
+_UNITS = {"px": 0.75, "pt": 1.0, "cm": cm, "mm": mm, "in": inch}
+
+
+def parse_stylesheet(css: str) -> Dict[str, Dict[str, str]]:
+    """Flat ``selector -> {property: value}`` map; enough for the resume stylesheets."""
+    rules: Dict[str, Dict[str, str]] = {}
+    for selectors, body in _RULE.findall(css):
+        declarations = {}
+        for declaration in body.split(";"):
+            name, sep, value = declaration.partition(":")
+            if sep:
+                declarations[name.strip().lower()] = value.strip()
+        for selector in selectors.split(","):
+            rules.setdefault(selector.strip(), {}).update(declarations)
+    return rules
+
+
+def _length(value: Optional[str], font_size: float = 0.0) -> float:
+    if not value:
+        return 0.0
+    match = _LENGTH.match(value.strip().lower())
+    if not match:
+        return 0.0
+    number, unit = float(match.group(1)), match.group(2)
+    if unit == "em":
+        return number * font_size
+    return number * _UNITS.get(unit or "px", 0.75)
+
+
+def _edges(value: Optional[str], font_size: float) -> Tuple[float, float]:
+    """(top, bottom) of a margin or padding shorthand."""
+    if not value:
+        return 0.0, 0.0
+    parts = [_length(v, font_size) for v in value.split()]
+    if len(parts) == 1:
+        return parts[0], parts[0]
+    if len(parts) in (2, 3):
+        return parts[0], parts[2] if len(parts) == 3 else parts[0]
+    return parts[0], parts[2]
+
+
+def _margins(decl: Dict[str, str], font_size: float) -> Tuple[Optional[float], Optional[float]]:
+    """(top, bottom) margin set by a rule, ``None`` for sides it leaves alone."""
+    top = bottom = None
+    if "margin" in decl:
+        top, bottom = _edges(decl["margin"], font_size)
+    if "margin-top" in decl:
+        top = _length(decl["margin-top"], font_size)
+    if "margin-bottom" in decl:
+        bottom = _length(decl["margin-bottom"], font_size)
+    return top, bottom
+
+
+def _border_width(value: Optional[str], font_size: float) -> float:
+    if not value:
+        return 0.0
+    for token in value.split():
+        if _LENGTH.match(token):
+            return _length(token, font_size)
+    return 0.0
+
+
+@lru_cache(maxsize=65536)
+def _word_width(word: str, font: str) -> float:
+    """Width of ``word`` at 1pt."""
+    return stringWidth(word, font, 1000) / 1000
+
+
+# Boxes are built once per stylesheet and compared by identity.
+@dataclass(frozen=True, eq=False)
+class _Box:
+    font: str
+    size: float
+    leading: float
+    space_before: float
+    space_after: float
+    extra: float
+    uppercase: bool = False
+    letter_spacing: float = 0.0
+
+
+@dataclass(frozen=True)
+class _Geometry:
+    width: float
+    height: float
+    body_size: float
+    boxes: Dict[str, _Box]
+    runs: Dict[str, _Box]
+
+
+# Leaf block selector -> enclosing div whose margins it inherits.
+_BLOCKS = {
+    "h1": ".header-row",
+    ".subtitle": ".header-row",
+    ".contact-info": ".header-row",
+    "h2": None,
+    ".summary": None,
+    ".entry-header": ".entry",
+    ".entry-sub": ".entry",
+    ".entry-date": ".entry",
+    ".entry-desc": ".entry",
+    ".skills-group": None,
+    ".lang-item": None,
+    ".cert-item .entry-title": ".cert-item",
+    ".cert-item .entry-sub": ".cert-item",
+    ".cert-item .entry-date": ".cert-item",
+    ".cert-item .entry-desc": ".cert-item",
+    ".custom-item .entry-date": ".custom-item",
+    ".custom-item .entry-desc": ".custom-item",
+}
+# Inline runs inside blocks.
+_RUNS = (".entry-title", ".entry-sub", ".skills-label", ".skill-tag", "strong")
+
+
+def _geometry(rules: Dict[str, Dict[str, str]], spec: TemplateSpec) -> _Geometry:
+    regular, bold = PDF_FONT_FACES.get(spec.pdf_font, PDF_FONT_FACES["Helvetica"])
+    body = rules.get("body", {})
+    body_size = _length(body.get("font-size"), 0) or 12 * 0.75
+    line_height = float(body.get("line-height") or 1.2)
+
+    def own(selector: str) -> Dict[str, str]:
+        # Compound keys like ".cert-item .entry-date" style their last part.
+        return rules.get(selector.split()[-1], {})
+
+    def box(selector: str, container: Optional[str], parent_size: float) -> _Box:
+        decl, outer = own(selector), rules.get(container or "", {})
+        size = (
+            _length(decl.get("font-size"), parent_size)
+            or _length(outer.get("font-size"), parent_size)
+            or parent_size
+        )
+        own_top, own_bottom = _margins(decl, size)
+        outer_top, outer_bottom = _margins(outer, size)
+        # Each side comes from the block's own rule, else from its container.
+        margin_top = own_top if own_top is not None else outer_top or 0.0
+        margin_bottom = own_bottom if own_bottom is not None else outer_bottom or 0.0
+        padding_top, padding_bottom = _edges(decl.get("padding"), size)
+        padding_bottom = _length(decl.get("padding-bottom"), size) if "padding-bottom" in decl else padding_bottom
+        extra = (
+            padding_top + padding_bottom
+            + _border_width(decl.get("border-bottom") or decl.get("border"), size)
+            + _border_width(decl.get("border-top") or decl.get("border"), size)
+        )
+        weight = decl.get("font-weight", "")
+        default_bold = selector in ("h1", "h2", "h3", "strong")
+        return _Box(
+            font=bold if weight == "bold" or (default_bold and weight != "normal") else regular,
+            size=size,
+            leading=size * line_height,
+            space_before=margin_top,
+            space_after=margin_bottom,
+            extra=extra,
+            uppercase=decl.get("text-transform") == "uppercase",
+            letter_spacing=_length(decl.get("letter-spacing"), size),
+        )
+
+    page = rules.get("@page", {})
+    width, height = getattr(pagesizes, (page.get("size") or "A4").split()[0].upper(), pagesizes.A4)
+    margin_top, margin_bottom = _edges(page.get("margin"), body_size)
+    margin_left = margin_top if len((page.get("margin") or "").split()) < 2 else _length(
+        (page.get("margin") or "").split()[1], body_size
+    )
+    return _Geometry(
+        width=width - 2 * margin_left,
+        height=height - margin_top - margin_bottom,
+        body_size=body_size,
+        boxes={selector: box(selector, container, body_size) for selector, container in _BLOCKS.items()},
+        runs={selector: box(selector, None, body_size) for selector in _RUNS},
+    )
+
+
+# A block: its box and its inline runs as (text, run box or None).
+_Block = Tuple[_Box, Tuple[Tuple[str, Optional[_Box]], ...]]
+
+
+def _blocks(doc: ResumeDocument, g: _Geometry) -> Dict[str, List[_Block]]:
+    """Mirror of the fragment templates, section by section."""
+    b, r = g.boxes, g.runs
+
+    def text(selector: str, value: Optional[str]) -> List[_Block]:
+        return [(b[selector], ((value, None),))] if value else []
+
+    def heading(title: str) -> _Block:
+        return b["h2"], ((title, None),)
+
+    def details(entry, prefix: str = "") -> List[_Block]:
+        return [
+            *text(f"{prefix}.entry-sub", entry.subtitle),
+            *text(f"{prefix}.entry-date", entry.dates),
+            *text(f"{prefix}.entry-desc", entry.description),
+        ]
+
+    # Blocks without text produce no paragraph, so they are left out.
+    sections: Dict[str, List[_Block]] = {name: [] for name in FRAGMENTS}
+    sections["header"] = [
+        *text("h1", doc.name),
+        *text(".subtitle", doc.headline),
+        *text(".contact-info", "   ".join(doc.contact)),
+    ]
+    if doc.summary:
+        sections["summary"] = [heading("Summary"), *text(".summary", doc.summary)]
+    if doc.experiences:
+        blocks = [heading("Experience")]
+        for entry in doc.experiences:
+            runs = ((entry.title, r[".entry-title"]),)
+            if entry.subtitle:
+                runs += ((f"— {entry.subtitle}", r[".entry-sub"]),)
+            blocks.append((b[".entry-header"], runs))
+            blocks += text(".entry-date", entry.dates)
+            blocks += text(".entry-desc", entry.description)
+        sections["experiences"] = blocks
+    if doc.educations:
+        blocks = [heading("Education")]
+        for entry in doc.educations:
+            blocks.append((b[".entry-header"], ((entry.title, r[".entry-title"]),)))
+            blocks += details(entry)
+        sections["educations"] = blocks
+    if doc.skill_groups:
+        sections["skills"] = [heading("Skills")] + [
+            (b[".skills-group"], ((f"{group.label}:", r[".skills-label"]), (group.skills, r[".skill-tag"])))
+            for group in doc.skill_groups
+        ]
+    if doc.languages:
+        sections["languages"] = [heading("Languages")] + [
+            (b[".lang-item"], ((entry.title, r["strong"]), (f"— {entry.subtitle}", None)))
+            for entry in doc.languages
+        ]
+    if doc.certificates:
+        blocks = [heading("Certificates")]
+        for entry in doc.certificates:
+            blocks += text(".cert-item .entry-title", entry.title)
+            blocks += details(entry, ".cert-item ")
+        sections["certificates"] = blocks
+    if doc.custom_sections:
+        blocks = []
+        for entry in doc.custom_sections:
+            blocks.append(heading(entry.title))
+            blocks += details(entry, ".custom-item ")
+        sections["custom_sections"] = blocks
+    return sections
+
+
+@lru_cache(maxsize=16384)
+def _count_lines(runs: Tuple[Tuple[str, Optional[_Box]], ...], block: _Box, width: float) -> int:
+    """
+    Greedy word wrap, as reportlab's paragraph line breaking does it.
+    Memoized: between two estimates of a resume being edited, almost every
+    block is unchanged.
+    """
+    lines, line = 1, 0.0
+    for value, run in runs:
+        style = run or block
+        if block.uppercase:
+            value = value.upper()
+        space = _word_width(" ", style.font) * style.size
+        for word in value.split():
+            w = _word_width(word, style.font) * style.size + style.letter_spacing * len(word)
+            if line == 0.0:
+                line = w
+            elif line + space + w <= width:
+                line += space + w
+            else:
+                lines += 1
+                line = w
+    return lines
+
+
+class LayoutEstimator:
+    def __init__(self, registry: Optional[TemplateRegistry] = None):
+        self._registry = registry
+        self._geometries: Dict[str, _Geometry] = {}
+
+    @property
+    def registry(self) -> TemplateRegistry:
+        if self._registry is None:
+            self._registry = get_template_registry()
+        return self._registry
+
+    def _geometry(self, template_name: Optional[str]) -> _Geometry:
+        spec = self.registry.spec(template_name)
+        # With auto-reload, key by template version so edited stylesheets are re-read.
+        key = self.registry.version(template_name) if self.registry.auto_reload else spec.name
+        geometry = self._geometries.get(key)
+        if geometry is None:
+            rules = parse_stylesheet(str(self.registry.stylesheet(spec, DEFAULT_COLOR)))
+            geometry = self._geometries[key] = _geometry(rules, spec)
+        return geometry
+
+    @staticmethod
+    def _photo_header(blocks: List[_Block], g: _Geometry) -> _Block:
+        """
+        With a photo the header is a table row, laid out as one unsplittable
+        block: as tall as the text column beside the photo or the photo's
+        line, whichever is taller, with no margin after it.
+        """
+        text_width = g.width - PHOTO_CELL_WIDTH
+        column, prev_after = 0.0, None
+        for box, runs in blocks:
+            if prev_after is not None:
+                column += max(prev_after, box.space_before)
+            column += _count_lines(runs, box, text_width) * box.leading + box.extra
+            prev_after = box.space_after
+        photo = PHOTO_HEIGHT + IMAGE_DESCENT * g.body_size
+        return _Box("", 0.0, max(column, photo), 0.0, 0.0, 0.0), ()
+
+    def estimate(self, resume: ExportSource) -> LayoutEstimate:
+        doc = as_document(resume)
+        g = self._geometry(doc.template_name)
+        frame = g.height
+        page, y, prev_after, at_top = 1, 0.0, 0.0, True
+        total = 0.0
+        sections = []
+        for name, blocks in _blocks(doc, g).items():
+            if not blocks:
+                continue
+            start_page, top, height = None, 0.0, 0.0
+            if name == "header" and doc.photo_hash:
+                blocks = [self._photo_header(blocks, g)]
+            for box, runs in blocks:
+                n = _count_lines(runs, box, g.width) if runs else 1
+                gap = 0.0 if at_top else max(box.space_before - prev_after, 0.0)
+                block_height = n * box.leading + box.extra
+                height += gap + block_height + box.space_after
+                if y + gap + block_height > frame + 1e-6:
+                    fit = int((frame - y - gap - box.extra) / box.leading + 1e-8) if box.leading else 0
+                    if n > 1 and fit > 1:
+                        # Split: the first lines stay, the rest continue on the next page.
+                        n -= fit
+                        if start_page is None:
+                            start_page, top = page, y + gap
+                    page, y, gap = page + 1, 0.0, 0.0
+                    while n * box.leading > frame:
+                        page, n = page + 1, n - int(frame / box.leading)
+                    block_height = n * box.leading + box.extra
+                if start_page is None:
+                    start_page, top = page, y + gap
+                y += gap + block_height + box.space_after
+                prev_after, at_top = box.space_after, False
+            total += height
+            sections.append(SectionLayout(
+                name=name, height_pt=round(height, 1), start_page=start_page, top_pt=round(top, 1)
+            ))
+        return LayoutEstimate(
+            page_count=page,
+            page_height_pt=round(frame, 1),
+            content_height_pt=round(total, 1),
+            last_page_fill=round(min(y, frame) / frame, 3),
+            sections=sections,
+        )
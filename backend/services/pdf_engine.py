@@ -0,0 +1,156 @@
+"""
+xhtml2pdf with stylesheets parsed once per process.
+
+``pisa.CreatePDF`` builds a fresh context for every document and parses
+xhtml2pdf's default stylesheet and the document's ``<style>`` block all
+over again: about 5 ms of a typical resume render. The stylesheet of a
+resume only depends on its template and colour, so export workers see
+the same few over and over.
+
+``StyleCachingContext`` keeps the parsed stylesheets in a per-process
+LRU keyed by their source text. Parsing has side effects besides the
+rules: ``@page`` builds the page templates and frames, ``@font-face``
+registers fonts (globally with reportlab) and maps them on the context.
+That context state is recorded after the first parse and restored, as a
+deep copy, on every hit. The parser, builder and cascade hold a
+reference to their context, so those are always built fresh.
+
+This relies on pisaContext internals of xhtml2pdf 0.2.23 (the pinned
+version). They are probed once per process; when any is missing,
+``create_pdf`` falls back to plain ``pisa.CreatePDF``.
+
+benchmarks/pdf_parity.py and tests/test_pdf_export.py check that both
+paths produce the same bytes.
+"""
+
+import copy
+import threading
+import weakref
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from loguru import logger
+from xhtml2pdf import document, pisa
+from xhtml2pdf.context import pisaContext, pisaCSSBuilder, pisaCSSParser
+from xhtml2pdf.w3c import css
+
+# Context attributes written while the stylesheets are parsed.
+_PARSE_STATE = (
+    "templateList",
+    "frameList",
+    "frameStaticList",
+    "frameStatic",
+    "template",
+    "bodyPageNamed",
+    "pageSize",
+    "bodyPageSize",
+    "fontList",
+    "asianFontList",
+    "uidctr",
+)
+_PARSE_RESULT = ("css", "cssDefault", "cssPositionalTags", "cssAttributeNames", "cssCustomNames")
+
+
+class ParsedStyles:
+    """What ``pisaContext.parseCSS`` leaves behind, minus the context-bound objects."""
+
+    def __init__(self, context: pisaContext):
+        self.result = {name: getattr(context, name) for name in _PARSE_RESULT}
+        self.state = copy.deepcopy({name: getattr(context, name) for name in _PARSE_STATE})
+        self.declared = copy.deepcopy(context.cssParser.declaredBySource)
+        self.root_properties = copy.deepcopy(context.cssBuilder.rootCustomProperties)
+
+
+class StylesheetCache:
+    """Per-process LRU of parsed stylesheets, bounded by entry count."""
+
+    def __init__(self, max_entries: int = 64):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Tuple, ParsedStyles]" = OrderedDict()
+
+    def get(self, key: Tuple) -> Optional[ParsedStyles]:
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Tuple, value: ParsedStyles) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+stylesheet_cache = StylesheetCache()
+
+
+class StyleCachingContext(pisaContext):
+    def parseCSS(self):
+        key = (tuple(self.cssSources), self.cssDefaultText, self.pathDirectory)
+        parsed = stylesheet_cache.get(key)
+        if parsed is None:
+            super().parseCSS()
+            stylesheet_cache.put(key, ParsedStyles(self))
+            return
+
+        # As in pisaContext.parseCSS, with the parsing itself skipped.
+        self.cssBuilder = pisaCSSBuilder(mediumSet=["all", "print", "pdf"])
+        self.cssBuilder._c = weakref.ref(self)
+        self.cssBuilder.rootCustomProperties = copy.deepcopy(parsed.root_properties)
+        self.cssParser = pisaCSSParser(self.cssBuilder)
+        self.cssParser.rootPath = self.pathDirectory
+        self.cssParser._c = weakref.ref(self)
+        self.cssParser.declaredBySource = copy.deepcopy(parsed.declared)
+        for name, value in parsed.result.items():
+            setattr(self, name, value)
+        for name, value in copy.deepcopy(parsed.state).items():
+            setattr(self, name, value)
+        self.cssCascade = css.CSSCascadeStrategy(userAgent=self.cssDefault, user=self.css)
+        self.cssCascade.parser = self.cssParser
+
+
+def _supports_style_caching() -> bool:
+    """Whether this xhtml2pdf keeps its parse state where StyleCachingContext expects it."""
+    try:
+        context = pisaContext("")
+        context.parseCSS()
+        names = ("cssSources", "cssDefaultText", "pathDirectory") + _PARSE_STATE + _PARSE_RESULT
+        return (
+            all(hasattr(context, name) for name in names)
+            and hasattr(context.cssParser, "declaredBySource")
+            and hasattr(context.cssBuilder, "rootCustomProperties")
+        )
+    except Exception:
+        return False
+
+
+STYLE_CACHING = _supports_style_caching()
+if not STYLE_CACHING:
+    logger.warning("xhtml2pdf internals changed; PDF stylesheets are parsed on every render")
+
+# pisaDocument takes no context, so the class it instantiates is swapped
+# for the duration of a render.
+_context_lock = threading.Lock()
+
+
+def create_pdf(src, dest, cache_styles: bool = True) -> pisaContext:
+    """``pisa.CreatePDF(src, dest=dest)``, reusing parsed stylesheets unless told not to."""
+    if not cache_styles or not STYLE_CACHING:
+        return pisa.CreatePDF(src, dest=dest)
+    with _context_lock:
+        document.pisaContext = StyleCachingContext
+        try:
+            return pisa.CreatePDF(src, dest=dest)
+        finally:
+            document.pisaContext = pisaContext
@@ -0,0 +1,105 @@
+import asyncio
+from typing import Awaitable, Callable, Optional, Tuple
+
+from fastapi import HTTPException, UploadFile, status
+from PIL import UnidentifiedImageError
+
+from app.core.config import configs
+from app.core.uof import UnitOfWork
+from app.models.user import User
+from app.services.export_storage import ExportStorage
+from app.services.photo_variants import (
+    PHOTO_CONTENT_TYPE,
+    PHOTO_VARIANTS,
+    build_variants,
+    photo_digest,
+    photo_key,
+    photo_url,
+)
+from app.services.prerender import SpeculativeRenderer
+from .base_service import BaseService
+
+
+class PhotoService(BaseService):
+    """
+    Resume photo uploads.
+
+    The original is decoded once, pre-sized variants are stored under
+    content-hashed keys, and the resume records the hash. Identical
+    uploads reuse the stored variants. Variants are immutable, so they are
+    served publicly with long-lived caching; the 256-bit hash in the URL
+    is the only handle on them.
+    """
+
+    def __init__(
+        self,
+        uow_factory: Callable[[], Awaitable[UnitOfWork]],
+        storage: ExportStorage,
+        prerenderer: Optional[SpeculativeRenderer] = None,
+    ):
+        self.uow_factory = uow_factory
+        self.storage = storage
+        self.prerenderer = prerenderer
+
+    @staticmethod
+    def variant_url(digest: str, variant: str) -> str:
+        return photo_url(digest, variant)
+
+    async def _store_variants(self, data: bytes) -> str:
+        digest = photo_digest(data)
+        if await asyncio.to_thread(self.storage.exists, photo_key(digest, "print")):
+            return digest
+        try:
+            variants = await asyncio.to_thread(build_variants, data)
+        except (UnidentifiedImageError, OSError):
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Uploaded file is not a supported image",
+            )
+        # The print variant is written last; its presence marks a complete set.
+        for name in sorted(variants, key=lambda n: n == "print"):
+            await asyncio.to_thread(
+                self.storage.save, photo_key(digest, name), variants[name], PHOTO_CONTENT_TYPE
+            )
+        return digest
+
+    async def upload(self, resume_id: int, user: User, file: UploadFile):
+        data = await file.read(configs.PHOTO_MAX_BYTES + 1)
+        if len(data) > configs.PHOTO_MAX_BYTES:
+            raise HTTPException(
+                status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                detail="Photo is too large",
+            )
+        # Check ownership before the image work rather than after it.
+        async with self.uow_factory() as uow:
+            owned = await uow.cv.owns_resume(resume_id, user.id)
+        if not owned:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Resume not found",
+            )
+        digest = await self._store_variants(data)
+        async with self.uow_factory() as uow:
+            resume = await uow.cv.get_resume(resume_id, user.id)
+            if not resume:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Resume not found",
+                )
+            result = await uow.cv.set_photo(resume, digest, self.variant_url(digest, "thumb"))
+        # A new photo changes every export, as any other edit does.
+        if self.prerenderer is not None:
+            self.prerenderer.schedule(resume_id, user.id)
+        return result
+
+    def get_variant(self, digest: str, variant: str) -> Tuple[Optional[str], Optional[str]]:
+        """``(local path, redirect URL)`` of a stored variant; exactly one is set."""
+        if variant not in PHOTO_VARIANTS or len(digest) != 64 or not digest.isalnum():
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found")
+        key = photo_key(digest, variant)
+        url = self.storage.presigned_url(key, configs.EXPORT_URL_EXPIRES)
+        if url:
+            return None, url
+        if not self.storage.exists(key):
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Photo not found")
+        return self.storage.path(key), None
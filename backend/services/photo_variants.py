@@ -0,0 +1,109 @@
+"""
+Pre-sized resume photo variants.
+
+Uploaded photos are decoded once, when they are uploaded. At that point a
+fixed set of JPEG variants is produced and stored under keys derived from
+the sha256 of the original. Exports only ever read the small ``print``
+variant. Each export process keeps the variants it has used in an LRU, so
+a photo is fetched from storage at most once per process and never
+resampled at render time.
+"""
+
+import base64
+import hashlib
+import io
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from loguru import logger
+from PIL import Image, ImageOps
+
+from app.core.config import configs
+from app.core.metrics import metrics
+from app.services.export_storage import ExportStorage, create_export_storage
+
+# Variant name -> (width, height) in pixels. "print" is 3 cm at 300 dpi.
+PHOTO_VARIANTS = {
+    "print": (354, 354),
+    "thumb": (96, 96),
+}
+PHOTO_CONTENT_TYPE = "image/jpeg"
+
+_photo_hits = metrics.counter("photo_cache_hits_total", "Photo variants served from the exporter's cache")
+_photo_misses = metrics.counter("photo_cache_misses_total", "Photo variants loaded from storage")
+
+
+def photo_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def photo_key(digest: str, variant: str) -> str:
+    return f"photos/{digest[:2]}/{digest}/{variant}.jpg"
+
+
+def photo_url(digest: str, variant: str) -> str:
+    """Public URL of a stored variant, served by the resume photo route."""
+    return f"{configs.API_V1_STR}/resumes/photos/{digest}/{variant}.jpg"
+
+
+def build_variants(data: bytes) -> Dict[str, bytes]:
+    """Decode an uploaded image once and encode every variant from it."""
+    with Image.open(io.BytesIO(data)) as image:
+        image = ImageOps.exif_transpose(image).convert("RGB")
+        variants = {}
+        for name, size in PHOTO_VARIANTS.items():
+            resized = ImageOps.fit(image, size, Image.Resampling.LANCZOS)
+            buf = io.BytesIO()
+            resized.save(buf, format="JPEG", quality=88, optimize=True)
+            variants[name] = buf.getvalue()
+    return variants
+
+
+class PhotoCache:
+    """Per-process LRU of photo variants, bounded by total bytes."""
+
+    def __init__(self, storage: ExportStorage, max_bytes: int = 32 * 1024 * 1024):
+        self.storage = storage
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()
+        self._size = 0
+
+    def get(self, digest: Optional[str], variant: str = "print") -> Optional[bytes]:
+        if not digest:
+            return None
+        key = photo_key(digest, variant)
+        data = self._entries.get(key)
+        if data is not None:
+            self._entries.move_to_end(key)
+            _photo_hits.inc(variant=variant)
+            return data
+        _photo_misses.inc(variant=variant)
+        try:
+            data = self.storage.load(key)
+        except Exception as e:
+            # A missing photo must not fail the export.
+            logger.warning(f"Photo variant {key} unavailable: {e}")
+            return None
+        self._entries[key] = data
+        self._size += len(data)
+        while self._size > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self._size -= len(evicted)
+        return data
+
+    def data_uri(self, digest: Optional[str], variant: str = "print") -> Optional[str]:
+        data = self.get(digest, variant)
+        if data is None:
+            return None
+        return f"data:{PHOTO_CONTENT_TYPE};base64,{base64.b64encode(data).decode()}"
+
+
+_cache: Optional[PhotoCache] = None
+
+
+def get_photo_cache() -> PhotoCache:
+    """Return the per-process photo cache, creating it on first use."""
+    global _cache
+    if _cache is None:
+        _cache = PhotoCache(create_export_storage(), configs.PHOTO_CACHE_MAX_BYTES)
+    return _cache
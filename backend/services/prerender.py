@@ -0,0 +1,154 @@
+"""
+Speculative export rendering after resume edits.
+
+Users usually export shortly after they stop editing. After each write
+to a resume, ``SpeculativeRenderer`` waits ``delay`` seconds and then
+renders the configured export formats into the artifact cache, so the
+download that follows is a cache hit. Every new edit to the same resume
+restarts the wait and cancels a render already in progress. Several
+formats are rendered in parallel on the export pool from one shared
+intermediate document, as bulk exports do.
+
+Speculative renders are strictly best-effort. They are skipped when the
+export pool has no idle worker, when the user already has ``per_user``
+renders running, or when the artifacts are already cached. Formats that
+do not fit on the idle workers are left for the download to render.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional, Sequence
+
+from fastapi import HTTPException
+from loguru import logger
+
+from app.core.metrics import metrics
+from app.core.uof import UnitOfWork
+from app.schemas.export import ResumeDocument, ResumeSnapshot
+from app.services.export_cache import ExportArtifactCache
+from app.services.export_executor import ExportExecutor
+from app.services.export_service import ExportService
+from app.services.resume_document import build_document
+from app.services.text_export import SNAPSHOT_FORMATS, TEXT_FORMATS
+
+_scheduled = metrics.counter("export_prerender_scheduled_total", "Speculative renders scheduled after an edit")
+_superseded = metrics.counter("export_prerender_superseded_total", "Speculative renders cancelled by a newer edit")
+_skipped = metrics.counter("export_prerender_skipped_total", "Speculative renders skipped, by reason")
+_rendered = metrics.counter("export_prerender_rendered_total", "Speculative renders stored in the export cache")
+_failed = metrics.counter("export_prerender_failed_total", "Speculative renders that raised")
+
+
+class SpeculativeRenderer:
+    def __init__(
+        self,
+        uow_factory: Callable[[], Awaitable[UnitOfWork]],
+        executor: ExportExecutor,
+        export_cache: ExportArtifactCache,
+        formats: Sequence[str] = ("pdf",),
+        delay: float = 3.0,
+        per_user: int = 1,
+        enabled: bool = True,
+    ):
+        self.uow_factory = uow_factory
+        self.executor = executor
+        self.export_cache = export_cache
+        self.formats = list(dict.fromkeys(formats))
+        self.delay = delay
+        self.per_user = per_user
+        self.enabled = enabled
+        self._tasks: Dict[int, asyncio.Task] = {}
+        self._running: Dict[int, int] = {}
+
+    def schedule(self, resume_id: int, user_id: int) -> None:
+        """(Re)start the debounce timer for ``resume_id``."""
+        if not self.enabled:
+            return
+        if self.cancel(resume_id):
+            self._count(_superseded)
+        task = asyncio.ensure_future(self._run(resume_id, user_id))
+        self._tasks[resume_id] = task
+        task.add_done_callback(lambda t: self._forget(resume_id, t))
+        self._count(_scheduled)
+
+    def cancel(self, resume_id: int) -> bool:
+        task = self._tasks.pop(resume_id, None)
+        if task is None or task.done():
+            return False
+        task.cancel()
+        return True
+
+    def shutdown(self) -> None:
+        for task in self._tasks.values():
+            task.cancel()
+        self._tasks.clear()
+
+    def _count(self, counter, formats: Optional[Sequence[str]] = None, **labels) -> None:
+        for fmt in self.formats if formats is None else formats:
+            counter.inc(format=fmt, **labels)
+
+    def _forget(self, resume_id: int, task: asyncio.Task) -> None:
+        if self._tasks.get(resume_id) is task:
+            del self._tasks[resume_id]
+
+    async def _load(self, resume_id: int, user_id: int):
+        async with self.uow_factory() as uow:
+            resume = await uow.cv.get_resume(resume_id, user_id)
+            return ResumeSnapshot.model_validate(resume) if resume else None
+
+    async def _render(self, snapshot: ResumeSnapshot, fmt: str, document: Optional[ResumeDocument]) -> None:
+        source = snapshot if document is None or fmt in SNAPSHOT_FORMATS else document
+        try:
+            if fmt in TEXT_FORMATS:
+                data, _ = ExportService.render_timed(source, fmt)
+            else:
+                data, _ = await self.executor.run(ExportService.render_timed, source, fmt)
+            await self.export_cache.put(snapshot, fmt, data, speculative=True)
+            _rendered.inc(format=fmt)
+        except asyncio.CancelledError:
+            raise
+        except HTTPException as e:
+            # Pool saturated or timed out between the check and the submit.
+            _skipped.inc(format=fmt, reason=str(e.status_code))
+        except Exception as e:
+            _failed.inc(format=fmt)
+            logger.warning(f"Speculative {fmt} render of resume {snapshot.id} failed: {e}")
+
+    async def _run(self, resume_id: int, user_id: int) -> None:
+        await asyncio.sleep(self.delay)
+        if self._running.get(user_id, 0) >= self.per_user:
+            self._count(_skipped, reason="user_limit")
+            return
+        # Only use idle capacity; interactive exports must never queue
+        # behind speculative ones.
+        idle = self.executor.max_workers - self.executor.pending
+        if idle <= 0:
+            self._count(_skipped, reason="busy")
+            return
+
+        self._running[user_id] = self._running.get(user_id, 0) + 1
+        try:
+            snapshot = await self._load(resume_id, user_id)
+            if snapshot is None:
+                self._count(_skipped, reason="deleted")
+                return
+            formats = []
+            for fmt in self.formats:
+                if await self.export_cache.contains(snapshot, fmt):
+                    _skipped.inc(format=fmt, reason="cached")
+                else:
+                    formats.append(fmt)
+            # Text formats render in this process; the rest take a worker each.
+            pooled = [fmt for fmt in formats if fmt not in TEXT_FORMATS]
+            self._count(_skipped, pooled[idle:], reason="busy")
+            formats = [fmt for fmt in formats if fmt not in pooled[idle:]]
+            if not formats:
+                return
+            shared = len([fmt for fmt in formats if fmt not in SNAPSHOT_FORMATS]) > 1
+            document = build_document(snapshot) if shared else None
+            await asyncio.gather(*(self._render(snapshot, fmt, document) for fmt in formats))
+        except Exception as e:
+            self._count(_failed)
+            logger.warning(f"Speculative render of resume {resume_id} failed: {e}")
+        finally:
+            self._running[user_id] -= 1
+            if not self._running[user_id]:
+                del self._running[user_id]
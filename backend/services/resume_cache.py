@@ -0,0 +1,97 @@
+"""
+Read-through cache of resume documents (the body of GET /resumes/{id}).
+
+Entries are the JSON bytes PostgreSQL builds for the resume (see
+``CvRepository.get_resume_document``), stored per resume version:
+
+- ``resume:version:{id}`` is the current version, written by the commit
+  hook of every unit of work that changed the resume;
+- ``resume:doc:{id}:{version}`` is the owner's user id, a newline and the
+  document.
+
+A hit costs two Redis GETs and skips both the database and pydantic.
+Versions are bumped in the transaction that writes the resume, and the
+pointer only ever moves forward (``CacheService.set_max``), so a reader
+that loaded an older version while a write committed cannot bring it
+back: its entry is stored under the old version and never read again.
+"""
+
+from typing import Dict, Optional, Tuple
+
+from loguru import logger
+from redis.exceptions import RedisError
+
+from app.core.metrics import metrics
+from app.services.cache_service import CacheService
+
+_lookups = metrics.counter(
+    "resume_cache_lookups_total", "Resume document cache lookups, by result (hit, miss, stale)"
+)
+
+
+class ResumeDocumentCache:
+    def __init__(self, cache_service: CacheService, ttl: int = 60 * 60):
+        self.cache_service = cache_service
+        self.ttl = ttl
+
+    @staticmethod
+    def _version_key(resume_id: int) -> str:
+        return f"version:{resume_id}"
+
+    @staticmethod
+    def _document_key(resume_id: int, version: int) -> str:
+        return f"doc:{resume_id}:{version}"
+
+    async def get(self, resume_id: int, user_id: int) -> Optional[Tuple[int, bytes]]:
+        """``(version, document)`` if the current version is cached for this owner."""
+        try:
+            version = await self.cache_service.get_raw(self._version_key(resume_id))
+            if version is None:
+                _lookups.inc(result="miss")
+                return None
+            version = int(version)
+            entry = await self.cache_service.get_raw(self._document_key(resume_id, version))
+        except RedisError as e:
+            logger.warning(f"Resume cache read failed: {e}")
+            return None
+        if entry is None:
+            # The resume changed since its document was last cached.
+            _lookups.inc(result="stale")
+            return None
+        owner, _, document = entry.partition(b"\n")
+        if int(owner) != user_id:
+            # Not this user's resume; the database decides what to answer.
+            _lookups.inc(result="miss")
+            return None
+        _lookups.inc(result="hit")
+        return version, document
+
+    async def put(self, resume_id: int, user_id: int, version: int, document: bytes) -> None:
+        try:
+            await self.cache_service.set_raw(
+                self._document_key(resume_id, version), b"%d\n%s" % (user_id, document), expire=self.ttl
+            )
+            await self.cache_service.set_max(self._version_key(resume_id), version, expire=self.ttl)
+        except RedisError as e:
+            logger.warning(f"Resume cache write failed: {e}")
+
+    async def invalidate_resumes(self, versions: Dict[int, Optional[int]]) -> None:
+        """
+        Commit hook: move the pointers to the committed versions, drop
+        deleted resumes. A pointer that cannot be moved is deleted instead,
+        so readers fall back to the database rather than serve the
+        document of the version it still points at.
+        """
+        for resume_id, version in versions.items():
+            key = self._version_key(resume_id)
+            try:
+                if version is None:
+                    await self.cache_service.delete(key)
+                else:
+                    await self.cache_service.set_max(key, version, expire=self.ttl)
+            except RedisError as e:
+                logger.warning(f"Resume cache invalidation failed: {e}")
+                try:
+                    await self.cache_service.delete(key)
+                except RedisError as e:
+                    logger.warning(f"Resume cache pointer {key} could not be deleted: {e}")
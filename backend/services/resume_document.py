@@ -0,0 +1,119 @@
+"""
+Build the intermediate document every export backend renders.
+
+The PDF templates, the DOCX writer and the layout estimator used to each
+walk the snapshot and repeat the same presentation rules: how date ranges
+read, which skills go in which group, how contact details and certificate
+dates are joined. ``build_document`` applies those rules once. It also
+strips the control characters that are not allowed in XML, which
+python-docx rejects. HTML escaping is left to the templates, which
+autoescape, because DOCX needs the raw text.
+
+Documents are frozen and picklable, so one build can be handed to
+several export workers. Bulk exports do this when a resume is rendered in
+more than one format.
+"""
+
+import re
+from typing import Optional, Tuple, Union
+
+from app.schemas.export import DocumentEntry, ResumeDocument, ResumeSnapshot, SkillGroup
+
+# Skill category -> group label, in display order.
+SKILL_GROUPS = (("technical", "Technical"), ("soft", "Soft Skills"))
+
+_XML_INVALID = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]")
+
+
+def clean(text: Optional[str]) -> Optional[str]:
+    if not text:
+        return None
+    text = _XML_INVALID.sub("", text).strip()
+    return text or None
+
+
+def _join(*parts: Optional[str], sep: str = " | ") -> Optional[str]:
+    return sep.join(p for p in parts if p) or None
+
+
+def date_range(start: Optional[str], end: Optional[str], current: bool = False) -> Optional[str]:
+    return _join(start, "Present" if current else end, sep=" – ")
+
+
+def _skill_groups(resume: ResumeSnapshot) -> Tuple[SkillGroup, ...]:
+    groups = []
+    for category, label in SKILL_GROUPS:
+        names = [name for name in (clean(s.name) for s in resume.skills if s.category == category) if name]
+        if names:
+            groups.append(SkillGroup.model_construct(label=label, skills=", ".join(names)))
+    return tuple(groups)
+
+
+def build_document(resume: ResumeSnapshot) -> ResumeDocument:
+    # Fields are produced here rather than parsed, so validation is skipped.
+    entry, document = DocumentEntry.model_construct, ResumeDocument.model_construct
+    return document(
+        id=resume.id,
+        template_name=resume.template_name,
+        color_hex=resume.color_hex,
+        photo_hash=resume.photo_hash,
+        name=_join(clean(resume.first_name), clean(resume.last_name), sep=" "),
+        headline=clean(resume.professional_title),
+        contact=tuple(v for v in map(clean, (resume.email, resume.phone, resume.location)) if v),
+        summary=clean(resume.summary),
+        experiences=tuple(
+            entry(
+                title=clean(exp.job_title) or "",
+                subtitle=clean(exp.company),
+                dates=_join(
+                    date_range(exp.start_date, exp.end_date, exp.currently_working),
+                    clean(exp.location),
+                    clean(exp.employment_type),
+                ),
+                description=clean(exp.description),
+            )
+            for exp in resume.experiences
+        ),
+        educations=tuple(
+            entry(
+                title=clean(edu.institution) or "",
+                subtitle=_join(clean(edu.degree), clean(edu.field_of_study), sep=" in "),
+                dates=date_range(edu.start_date, edu.end_date, edu.currently_studying),
+                description=clean(edu.description),
+            )
+            for edu in resume.educations
+        ),
+        skill_groups=_skill_groups(resume),
+        languages=tuple(
+            entry(title=clean(lang.name) or "", subtitle=lang.proficiency)
+            for lang in resume.languages
+        ),
+        certificates=tuple(
+            entry(
+                title=clean(cert.name) or "",
+                subtitle=clean(cert.organization),
+                dates=_join(
+                    f"Issued: {cert.issue_date}" if cert.issue_date else None,
+                    f"Expires: {cert.expiration_date}" if cert.expiration_date else None,
+                    "No expiration" if cert.no_expiry else None,
+                ),
+                description=clean(cert.description),
+            )
+            for cert in resume.certificates
+        ),
+        custom_sections=tuple(
+            entry(
+                title=clean(section.title) or "",
+                dates=date_range(section.start_date, section.end_date),
+                description=clean(section.description),
+            )
+            for section in resume.custom_sections
+        ),
+    )
+
+
+def as_document(resume: Union[ResumeSnapshot, ResumeDocument]) -> ResumeDocument:
+    """Accept either form at the export entry points; documents pass through."""
+    if isinstance(resume, ResumeDocument):
+        return resume
+    return build_document(resume)
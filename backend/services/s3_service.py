@@ -5,6 +5,7 @@ import os
 import uuid
 import boto3
 from botocore.client import Config
+from botocore.exceptions import ClientError
 from typing import BinaryIO, Tuple, Union
 
 from fastapi import UploadFile
@@ -140,6 +141,26 @@ class S3Service:
         print(">> response:", response)
         return f"{bucket}/{data.key}"
 
+    def put_bytes(self, bucket: str, key: str, data: bytes, content_type: str, private: bool = True):
+        self.s3.put_object(
+            Bucket=bucket,
+            Key=key,
+            Body=data,
+            ContentType=content_type,
+            ACL="private" if private else "public-read",
+        )
+
+    def get_bytes(self, bucket: str, key: str) -> bytes:
+        response = self.s3.get_object(Bucket=bucket, Key=key)
+        return response["Body"].read()
+
+    def object_exists(self, bucket: str, key: str) -> bool:
+        try:
+            self.s3.head_object(Bucket=bucket, Key=key)
+        except ClientError:
+            return False
+        return True
+
     def get_presigned_url(self, bucket: str, key: str, expires_in: int = 3600):
         return self.s3.generate_presigned_url(
             "get_object",
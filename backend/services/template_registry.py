@@ -0,0 +1,253 @@
+"""
+Compiled Jinja templates for resume rendering.
+
+A single ``Environment`` is created per process and every template under
+``backend/templates`` is compiled once, instead of building a new
+environment and re-parsing ``resume.html`` for every export. Compiled
+bytecode can additionally be persisted with a ``FileSystemBytecodeCache``
+so freshly spawned export workers skip the parse step too.
+
+The resume body is split into per-section fragments under
+``templates/fragments`` and rendered from the intermediate
+``ResumeDocument``. Each rendered fragment is cached under a hash of the
+document fields it reads, and the page is assembled from cached
+fragments, so re-rendering after an edit only pays for the sections that
+actually changed.
+
+``templates/catalog.json`` lists the template names a resume can select
+(the skins offered by the frontend) with the font each one uses, plus the
+colour palette. Every catalogue entry resolves to a ``TemplateSpec``.
+Templates without a dedicated layout share ``resume.html`` and differ by
+their stylesheet, which is rendered once per template and colour.
+"""
+
+import hashlib
+import json
+import os
+import re
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template, select_autoescape
+from markupsafe import Markup
+
+from app.core.config import configs
+from app.core.metrics import metrics
+from app.schemas.export import ResumeDocument
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "templates")
+CATALOG_PATH = os.path.join(TEMPLATE_DIR, "catalog.json")
+DEFAULT_TEMPLATE = "resume.html"
+DEFAULT_STYLESHEET = "styles/resume.css"
+DEFAULT_COLOR = "#111118"
+COLOR_HEX_RE = re.compile(r"#[0-9a-fA-F]{6}")
+
+# xhtml2pdf only ships the standard PDF fonts, so catalogue fonts are
+# mapped onto those; DOCX output names the catalogue font directly.
+PDF_FONT_STACKS = {
+    "Helvetica": "Helvetica, Arial, sans-serif",
+    "Times": "Times New Roman, Times, serif",
+}
+
+# Fragment name -> document fields the fragment template reads.
+FRAGMENTS = {
+    "header": ("name", "headline", "contact", "photo_hash"),
+    "summary": ("summary",),
+    "experiences": ("experiences",),
+    "educations": ("educations",),
+    "skills": ("skill_groups",),
+    "languages": ("languages",),
+    "certificates": ("certificates",),
+    "custom_sections": ("custom_sections",),
+}
+
+_fragment_hits = metrics.counter("template_fragment_hits_total", "Resume fragments served from cache")
+_fragment_misses = metrics.counter("template_fragment_misses_total", "Resume fragments rendered")
+
+
+class FragmentCache:
+    """Per-process LRU of rendered fragments, bounded by entry count."""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Markup]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Markup]:
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: str, value: Markup) -> None:
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+
+@dataclass(frozen=True)
+class TemplateSpec:
+    name: str
+    layout: str = DEFAULT_TEMPLATE
+    stylesheet: str = DEFAULT_STYLESHEET
+    pdf_font: str = "Helvetica"
+    docx_font: Optional[str] = None
+
+
+DEFAULT_SPEC = TemplateSpec(name="default")
+
+
+def load_catalog(path: str = CATALOG_PATH) -> dict:
+    with open(path) as f:
+        return json.load(f)
+
+
+class TemplateRegistry:
+    def __init__(
+        self,
+        template_dir: str = TEMPLATE_DIR,
+        auto_reload: bool = False,
+        bytecode_cache_dir: Optional[str] = None,
+        fragment_cache_size: int = 4096,
+        catalog_path: str = CATALOG_PATH,
+    ):
+        self.template_dir = template_dir
+        self.auto_reload = auto_reload
+        bytecode_cache = None
+        if bytecode_cache_dir:
+            os.makedirs(bytecode_cache_dir, exist_ok=True)
+            bytecode_cache = FileSystemBytecodeCache(bytecode_cache_dir)
+        self.env = Environment(
+            loader=FileSystemLoader(template_dir),
+            # Resume text is user input and the preview is served as HTML.
+            # Stylesheets are not escaped; stylesheet() validates their values.
+            autoescape=select_autoescape(["html"]),
+            auto_reload=auto_reload,
+            bytecode_cache=bytecode_cache,
+            cache_size=-1,
+        )
+        self._templates: Dict[str, Template] = {}
+        self._digests: Dict[str, str] = {}
+        self.fragment_cache = FragmentCache(fragment_cache_size)
+        self.stylesheet_cache = FragmentCache(1024)
+
+        catalog = load_catalog(catalog_path)
+        self.palette: List[str] = [c["color"] for c in catalog.get("colors", [])]
+        self.specs: Dict[str, TemplateSpec] = {
+            entry["name"]: TemplateSpec(
+                name=entry["name"],
+                layout=entry.get("layout", DEFAULT_TEMPLATE),
+                stylesheet=entry.get("stylesheet", DEFAULT_STYLESHEET),
+                pdf_font=entry.get("pdf_font", "Helvetica"),
+                docx_font=entry.get("font"),
+            )
+            for entry in catalog.get("templates", [])
+        }
+
+    def spec(self, template_name: Optional[str]) -> TemplateSpec:
+        """Catalogue entry for ``template_name``; unknown names use the default."""
+        return self.specs.get(template_name or "", DEFAULT_SPEC)
+
+    def load_all(self) -> None:
+        """Compile every template up front so no request pays for it."""
+        for name in self.env.list_templates(extensions=["html", "css"]):
+            self._templates[name] = self.env.get_template(name)
+
+    def warm_up(self) -> None:
+        """Compile all templates and render every stylesheet in the palette."""
+        self.load_all()
+        for spec in (DEFAULT_SPEC, *self.specs.values()):
+            for color in (DEFAULT_COLOR, *self.palette):
+                self.stylesheet(spec, color)
+
+    def get(self, template_name: str = DEFAULT_TEMPLATE) -> Template:
+        if self.auto_reload:
+            # The environment checks the file's mtime and recompiles on change.
+            return self.env.get_template(template_name)
+        template = self._templates.get(template_name)
+        if template is None:
+            template = self._templates[template_name] = self.env.get_template(template_name)
+        return template
+
+    def _digest(self, template_name: str) -> str:
+        if self.auto_reload or template_name not in self._digests:
+            source, _, _ = self.env.loader.get_source(self.env, template_name)
+            self._digests[template_name] = hashlib.sha1(source.encode()).hexdigest()[:12]
+        return self._digests[template_name]
+
+    def version(self, template_name: Optional[str] = None) -> str:
+        """Short digest of everything a template renders with, used to version cached output."""
+        spec = self.spec(template_name)
+        digest = hashlib.sha1(repr(spec).encode())
+        digest.update(self._digest(spec.layout).encode())
+        digest.update(self._digest(spec.stylesheet).encode())
+        for name in FRAGMENTS:
+            digest.update(self._digest(f"fragments/{name}.html").encode())
+        return digest.hexdigest()[:12]
+
+    def render_fragment(self, name: str, document: ResumeDocument, **context) -> Markup:
+        """Render one fragment, cached by its fields and the extra ``context``."""
+        template_name = f"fragments/{name}.html"
+        payload = document.model_dump_json(include=set(FRAGMENTS[name]))
+        # Context values are part of the key: the same photo is a variant
+        # URL in the preview and a data URI in the PDF, and may be missing
+        # when it could not be loaded.
+        extra = repr(sorted((k, v) for k, v in context.items() if v is not None))
+        key = hashlib.sha1(
+            f"{template_name}:{self._digest(template_name)}:{extra}:{payload}".encode()
+        ).hexdigest()
+        fragment = self.fragment_cache.get(key)
+        if fragment is not None:
+            _fragment_hits.inc(fragment=name)
+            return fragment
+        _fragment_misses.inc(fragment=name)
+        fragment = Markup(self.get(template_name).render(doc=document, **context))
+        self.fragment_cache.put(key, fragment)
+        return fragment
+
+    def stylesheet(self, spec: TemplateSpec, color_hex: str) -> Markup:
+        # The colour is written into CSS that is not escaped, and into a
+        # <style> element of the preview; anything but #rrggbb is dropped.
+        if not COLOR_HEX_RE.fullmatch(color_hex or ""):
+            color_hex = DEFAULT_COLOR
+        key = f"{spec.name}:{self._digest(spec.stylesheet)}:{color_hex}"
+        css = self.stylesheet_cache.get(key)
+        if css is None:
+            css = Markup(self.get(spec.stylesheet).render(
+                color_hex=color_hex,
+                font_family=PDF_FONT_STACKS.get(spec.pdf_font, PDF_FONT_STACKS["Helvetica"]),
+            ))
+            self.stylesheet_cache.put(key, css)
+        return css
+
+    def render(self, document: ResumeDocument, photo_src: Optional[str] = None) -> str:
+        spec = self.spec(document.template_name)
+        color_hex = document.color_hex or DEFAULT_COLOR
+        fragments = {
+            name: self.render_fragment(
+                name, document, **({"photo_src": photo_src} if name == "header" else {})
+            )
+            for name in FRAGMENTS
+        }
+        return self.get(spec.layout).render(
+            doc=document,
+            color_hex=color_hex,
+            stylesheet=self.stylesheet(spec, color_hex),
+            fragments=fragments,
+        )
+
+
+_registry: Optional[TemplateRegistry] = None
+
+
+def get_template_registry() -> TemplateRegistry:
+    """Return the per-process registry, creating and warming it on first use."""
+    global _registry
+    if _registry is None:
+        _registry = TemplateRegistry(
+            auto_reload=configs.ENV == "dev",
+            bytecode_cache_dir=configs.TEMPLATE_BYTECODE_CACHE_DIR or None,
+        )
+        _registry.warm_up()
+    return _registry
@@ -0,0 +1,219 @@
+"""
+Text export formats: plain text, Markdown and JSON Resume.
+
+These are for ATS uploads and integrations rather than for reading, and
+they cost microseconds where a PDF costs tens of milliseconds, so they
+are rendered in the API process instead of the export pool (see
+ExportRenderer). Plain text and Markdown walk the intermediate document,
+like the other backends. JSON Resume (https://jsonresume.org/schema)
+needs the structured fields the document has already joined, such as
+start and end dates and e-mail, so it is built from the snapshot.
+
+Each serializer is a generator of encoded chunks, one per section. JSON
+chunks are encoded with orjson.
+"""
+
+import re
+from typing import Callable, Dict, Iterator, List, Optional
+
+import orjson
+
+from app.schemas.export import DocumentEntry, ResumeDocument, ResumeSnapshot
+from app.services.resume_document import SKILL_GROUPS, as_document, clean
+
+# Bump whenever a serializer changes its output; used in cache keys.
+TEXT_LAYOUT_VERSION = "1"
+
+# Formats rendered from the snapshot itself rather than the document.
+SNAPSHOT_FORMATS = frozenset({"json-resume"})
+
+_MARKDOWN_SPECIAL = re.compile(r"([\\`*_\[\]<>#])")
+
+
+def _lines(*lines: Optional[str]) -> bytes:
+    return "".join(f"{line}\n" for line in lines if line is not None).encode()
+
+
+# ---------------------------------------------------------------------------
+# Plain text
+# ---------------------------------------------------------------------------
+
+def _text_section(title: str, entries: List[List[Optional[str]]]) -> bytes:
+    body = [line for entry in entries for line in (*entry, "")]
+    return _lines(title.upper(), "-" * len(title), *body)
+
+
+def iter_text(resume) -> Iterator[bytes]:
+    doc = as_document(resume)
+    yield _lines(doc.name, doc.headline, " | ".join(doc.contact) or None, "")
+    if doc.summary:
+        yield _text_section("Summary", [[doc.summary]])
+    if doc.experiences:
+        yield _text_section("Experience", [
+            [f"{e.title} — {e.subtitle}" if e.subtitle else e.title, e.dates, e.description]
+            for e in doc.experiences
+        ])
+    if doc.educations:
+        yield _text_section("Education", [
+            [e.title, e.subtitle, e.dates, e.description] for e in doc.educations
+        ])
+    if doc.skill_groups:
+        yield _text_section("Skills", [[f"{g.label}: {g.skills}" for g in doc.skill_groups]])
+    if doc.languages:
+        yield _text_section("Languages", [[f"{e.title} — {e.subtitle}" for e in doc.languages]])
+    if doc.certificates:
+        yield _text_section("Certificates", [
+            [e.title, e.subtitle, e.dates, e.description] for e in doc.certificates
+        ])
+    for e in doc.custom_sections:
+        yield _text_section(e.title, [[e.dates, e.description]])
+
+
+# ---------------------------------------------------------------------------
+# Markdown
+# ---------------------------------------------------------------------------
+
+def _md(text: Optional[str]) -> Optional[str]:
+    return _MARKDOWN_SPECIAL.sub(r"\\\1", text) if text else None
+
+
+def _md_entry(entry: DocumentEntry, heading: str, level: str = "###") -> bytes:
+    return _lines(
+        f"{level} {heading}",
+        "",
+        f"*{_md(entry.dates)}*" if entry.dates else None,
+        "" if entry.dates else None,
+        _md(entry.description),
+        "" if entry.description else None,
+    )
+
+
+def iter_markdown(resume) -> Iterator[bytes]:
+    doc = as_document(resume)
+    yield _lines(
+        f"# {_md(doc.name)}" if doc.name else None,
+        "" if doc.name else None,
+        f"**{_md(doc.headline)}**" if doc.headline else None,
+        "" if doc.headline else None,
+        " · ".join(map(_md, doc.contact)) or None,
+        "" if doc.contact else None,
+    )
+    if doc.summary:
+        yield _lines("## Summary", "", _md(doc.summary), "")
+    if doc.experiences:
+        yield _lines("## Experience", "")
+        for e in doc.experiences:
+            heading = _md(e.title) + (f" — {_md(e.subtitle)}" if e.subtitle else "")
+            yield _md_entry(e, heading)
+    if doc.educations:
+        yield _lines("## Education", "")
+        for e in doc.educations:
+            heading = _md(e.title) + (f", {_md(e.subtitle)}" if e.subtitle else "")
+            yield _md_entry(e, heading)
+    if doc.skill_groups:
+        yield _lines("## Skills", "", *(f"- **{g.label}:** {_md(g.skills)}" for g in doc.skill_groups), "")
+    if doc.languages:
+        yield _lines("## Languages", "", *(f"- {_md(e.title)} — {e.subtitle}" for e in doc.languages), "")
+    if doc.certificates:
+        yield _lines("## Certificates", "")
+        for e in doc.certificates:
+            heading = _md(e.title) + (f" — {_md(e.subtitle)}" if e.subtitle else "")
+            yield _md_entry(e, heading)
+    for e in doc.custom_sections:
+        yield _md_entry(e, _md(e.title), level="##")
+
+
+# ---------------------------------------------------------------------------
+# JSON Resume
+# ---------------------------------------------------------------------------
+
+def _compact(**fields) -> dict:
+    """Drop empty fields, as JSON Resume documents omit what is unknown."""
+    return {key: value for key, value in fields.items() if value not in (None, "", [], {})}
+
+
+def _json_resume_sections(resume: ResumeSnapshot) -> Dict[str, object]:
+    name = " ".join(part for part in (clean(resume.first_name), clean(resume.last_name)) if part)
+    skills = []
+    for category, label in SKILL_GROUPS:
+        keywords = [kw for kw in (clean(s.name) for s in resume.skills if s.category == category) if kw]
+        if keywords:
+            skills.append({"name": label, "keywords": keywords})
+    return _compact(
+        basics=_compact(
+            name=name,
+            label=clean(resume.professional_title),
+            image=resume.photo_url,
+            email=clean(resume.email),
+            phone=clean(resume.phone),
+            summary=clean(resume.summary),
+            location=_compact(address=clean(resume.location)),
+        ),
+        work=[
+            _compact(
+                name=clean(e.company),
+                position=clean(e.job_title),
+                location=clean(e.location),
+                startDate=e.start_date,
+                endDate=None if e.currently_working else e.end_date,
+                summary=clean(e.description),
+            )
+            for e in resume.experiences
+        ],
+        education=[
+            _compact(
+                institution=clean(e.institution),
+                studyType=clean(e.degree),
+                area=clean(e.field_of_study),
+                startDate=e.start_date,
+                endDate=None if e.currently_studying else e.end_date,
+                summary=clean(e.description),
+            )
+            for e in resume.educations
+        ],
+        skills=skills,
+        languages=[
+            _compact(language=clean(lang.name), fluency=lang.proficiency) for lang in resume.languages
+        ],
+        certificates=[
+            _compact(
+                name=clean(c.name),
+                issuer=clean(c.organization),
+                date=c.issue_date,
+                url=c.credential_link,
+            )
+            for c in resume.certificates
+        ],
+        projects=[
+            _compact(
+                name=clean(s.title),
+                description=clean(s.description),
+                startDate=s.start_date,
+                endDate=s.end_date,
+            )
+            for s in resume.custom_sections
+        ],
+        meta=_compact(lastModified=resume.updated_at.isoformat() if resume.updated_at else None),
+    )
+
+
+def iter_json_resume(resume) -> Iterator[bytes]:
+    if isinstance(resume, ResumeDocument):
+        raise TypeError("JSON Resume is built from the snapshot, not the document")
+    separator = b"{"
+    for key, value in _json_resume_sections(resume).items():
+        yield separator + orjson.dumps(key) + b":" + orjson.dumps(value)
+        separator = b","
+    yield b"}" if separator == b"," else b"{}"
+
+
+SERIALIZERS: Dict[str, Callable[..., Iterator[bytes]]] = {
+    "txt": iter_text,
+    "markdown": iter_markdown,
+    "json-resume": iter_json_resume,
+}
+TEXT_FORMATS = frozenset(SERIALIZERS)
+
+
+def serialize(resume, fmt: str) -> bytes:
+    return b"".join(SERIALIZERS[fmt](resume))
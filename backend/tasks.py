@@ -12,6 +12,9 @@ import re
 from app.core.database import Database
 from app.models.performer import Performer, PerformerReview, PerformerSpecialization, PerformerVideo, PerformerSpecializationFeatureValue, PerformerService
 from app.services.s3_service import S3Service
+from app.schemas.export import ResumeSnapshot
+from app.services.export_service import ExportService, MEDIA_TYPES
+from app.services.export_storage import create_export_storage
 from openai import OpenAI
 
 
@@ -422,3 +425,11 @@ async def _moderate_order(order_id: int):
         # notify user about order status
 
 
+@shared_task(bind=True, retry_kwargs={'max_retries': 1, 'countdown': 1})
+def render_export(self, snapshot: dict, fmt: str, storage_key: str):
+    resume = ResumeSnapshot.model_validate(snapshot)
+    storage = create_export_storage()
+    if not storage.exists(storage_key):
+        data = ExportService.render(resume, fmt)
+        storage.save(storage_key, data, MEDIA_TYPES[fmt])
+    return storage_key
@@ -0,0 +1,115 @@
+"""
+Shared fixtures for the backend tests.
+
+The tests run from a checkout, where the package folder is named
+``backend`` rather than ``app``; it is aliased the same way
+``alembic/env.py`` and the benchmarks do it. Settings that are required
+at import time get harmless defaults, so the suite needs neither a
+database nor Redis.
+"""
+
+import importlib
+import io
+import os
+import sys
+
+import pytest
+
+backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(backend_dir))
+if os.path.basename(backend_dir) != "app":
+    sys.modules["app"] = importlib.import_module(os.path.basename(backend_dir))
+
+for name, value in {
+    "DB_USER": "test",
+    "DB_PASSWORD": "test",
+    "DB_HOST": "localhost",
+    "DB_PORT": "5432",
+    "SECRET_KEY": "test",
+    "AWS_SECRET_ACCESS_KEY": "test",
+    "AWS_STORAGE_BUCKET_NAME": "test",
+    "AWS_S3_REGION_NAME": "test",
+    "AWS_S3_ENDPOINT_URL": "http://localhost",
+    "AWS_S3_CUSTOM_DOMAIN": "localhost",
+    "AWS_DEFAULT_ACL": "private",
+}.items():
+    os.environ.setdefault(name, value)
+
+from PIL import Image  # noqa: E402
+
+from app.schemas.export import (  # noqa: E402
+    CertificateSnapshot,
+    EducationSnapshot,
+    ExperienceSnapshot,
+    LanguageSnapshot,
+    ResumeSnapshot,
+    SkillSnapshot,
+)
+from app.services import photo_variants  # noqa: E402
+from app.services.export_storage import LocalExportStorage  # noqa: E402
+
+_SENTENCE = "Designed, built and operated services used by millions of people. "
+
+
+def make_resume(
+    experiences: int = 4,
+    educations: int = 1,
+    skills: int = 12,
+    languages: int = 2,
+    certificates: int = 2,
+    summary_sentences: int = 4,
+    **fields,
+) -> ResumeSnapshot:
+    """Deterministic resume snapshot with sections of the given sizes."""
+    values = dict(
+        id=1,
+        color_hex="#1f4e79",
+        first_name="Jane",
+        last_name="Doe",
+        professional_title="Senior Backend Engineer",
+        email="jane@example.com",
+        phone="+1 555 0100",
+        location="Berlin, Germany",
+        summary=_SENTENCE * summary_sentences or None,
+        experiences=tuple(
+            ExperienceSnapshot(
+                job_title=f"Engineer {i}",
+                company=f"Company {i}",
+                start_date="2015-01",
+                end_date="2016-06",
+                description=_SENTENCE * 6,
+                sort_order=i,
+            )
+            for i in range(experiences)
+        ),
+        educations=tuple(
+            EducationSnapshot(institution=f"University {i}", degree="MSc", description=_SENTENCE * 2, sort_order=i)
+            for i in range(educations)
+        ),
+        skills=tuple(
+            SkillSnapshot(name=f"Skill {i}", category="soft" if i % 4 == 0 else "technical", sort_order=i)
+            for i in range(skills)
+        ),
+        languages=tuple(
+            LanguageSnapshot(name=f"Language {i}", proficiency="fluent", sort_order=i)
+            for i in range(languages)
+        ),
+        certificates=tuple(
+            CertificateSnapshot(name=f"Certificate {i}", organization="Example Org", issue_date="2020-01", sort_order=i)
+            for i in range(certificates)
+        ),
+    )
+    values.update(fields)
+    return ResumeSnapshot(**values)
+
+
+@pytest.fixture(scope="session")
+def photo_hash(tmp_path_factory) -> str:
+    """Hash of a photo whose print variant is stored in a scratch storage."""
+    storage = LocalExportStorage(str(tmp_path_factory.mktemp("photos")))
+    buf = io.BytesIO()
+    Image.new("RGB", photo_variants.PHOTO_VARIANTS["print"], (120, 140, 160)).save(buf, format="JPEG")
+    digest = photo_variants.photo_digest(buf.getvalue())
+    storage.save(photo_variants.photo_key(digest, "print"), buf.getvalue(), photo_variants.PHOTO_CONTENT_TYPE)
+    photo_variants._cache = photo_variants.PhotoCache(storage)
+    return digest
@@ -0,0 +1,39 @@
+import os
+import time
+
+from app.services.export_artifact import ExportArtifact, sweep_spool_dir
+from app.services.export_executor import ExportExecutor
+
+
+def _age(path: str, seconds: float) -> None:
+    then = time.time() - seconds
+    os.utime(path, (then, then))
+
+
+async def test_spool_file_is_removed_once_streamed(tmp_path):
+    artifact = ExportArtifact.from_bytes(b"x" * 100, spool_threshold=10, spool_dir=str(tmp_path))
+    path = artifact.path
+    assert artifact.spooled and os.path.exists(path)
+    assert b"".join([chunk async for chunk in artifact.chunks(chunk_size=32)]) == b"x" * 100
+    assert not os.path.exists(path)
+    artifact.discard()  # idempotent, e.g. from the response's background task
+
+
+def test_sweep_removes_only_old_spool_files(tmp_path):
+    old = ExportArtifact.from_bytes(b"old" * 10, 1, str(tmp_path)).path
+    fresh = ExportArtifact.from_bytes(b"new" * 10, 1, str(tmp_path)).path
+    other = tmp_path / "unrelated.txt"
+    other.write_text("keep")
+    _age(old, 3600)
+    _age(str(other), 3600)
+    assert sweep_spool_dir(str(tmp_path), max_age=600) == 1
+    assert not os.path.exists(old)
+    assert os.path.exists(fresh) and other.exists()
+    assert sweep_spool_dir(str(tmp_path / "missing"), max_age=600) == 0
+
+
+def test_retiring_a_pool_runs_the_hook():
+    calls = []
+    executor = ExportExecutor(on_retire=lambda: calls.append(1))
+    executor._retire_pool()
+    assert calls == [1]
@@ -0,0 +1,72 @@
+from datetime import datetime, timezone
+
+from redis.exceptions import RedisError
+
+from app.services.export_cache import ExportArtifactCache
+
+from conftest import make_resume
+
+make_key = ExportArtifactCache.make_key
+
+
+def test_same_content_same_key():
+    assert make_key(make_resume(), "pdf") == make_key(make_resume(), "pdf")
+
+
+def test_key_ignores_updated_at_for_rendered_formats():
+    saved = make_resume(updated_at=datetime(2026, 1, 1, tzinfo=timezone.utc))
+    assert make_key(saved, "pdf") == make_key(make_resume(), "pdf")
+    assert make_key(saved, "markdown") == make_key(make_resume(), "markdown")
+
+
+def test_key_includes_updated_at_for_json_resume():
+    # The JSON Resume export prints it as meta.lastModified.
+    saved = make_resume(updated_at=datetime(2026, 1, 1, tzinfo=timezone.utc))
+    assert make_key(saved, "json-resume") != make_key(make_resume(), "json-resume")
+
+
+def test_key_changes_with_content():
+    assert make_key(make_resume(), "pdf") != make_key(make_resume(summary="Changed"), "pdf")
+    assert make_key(make_resume(), "pdf") != make_key(make_resume(skills=3), "pdf")
+
+
+def test_key_changes_with_presentation_and_format():
+    base = make_key(make_resume(), "pdf")
+    assert base != make_key(make_resume(color_hex="#000000"), "pdf")
+    assert base != make_key(make_resume(template_name="cba2"), "pdf")
+    assert base != make_key(make_resume(), "docx")
+    assert make_key(make_resume(), "docx").startswith("docx:")
+
+
+class UnreachableRedis:
+    """CacheService stand-in whose every call fails like a Redis outage."""
+
+    def __getattr__(self, name):
+        async def fail(*args, **kwargs):
+            raise RedisError("unreachable")
+
+        return fail
+
+
+async def test_in_process_index_only_holds_cached_keys():
+    cache = ExportArtifactCache(UnreachableRedis(), max_bytes=3000, max_entry_bytes=1000)
+    for resume_id in range(50):
+        await cache.put(make_resume(id=resume_id), "pdf", b"x" * 1000)
+    # Three entries fit; evicted ones leave no trace in the index.
+    assert len(cache._lru) == 3
+    assert set(cache._keys_by_resume) == {47, 48, 49}
+    assert len(cache._resume_by_key) == 3
+
+
+async def test_invalidation_clears_memory_tier_without_redis():
+    cache = ExportArtifactCache(UnreachableRedis())
+    resume = make_resume(id=7)
+    await cache.put(resume, "pdf", b"pdf")
+    await cache.put(resume, "docx", b"docx")
+    await cache.put(make_resume(id=8), "pdf", b"other")
+    assert await cache.get(resume, "pdf") == b"pdf"
+    await cache.invalidate_resumes([7])
+    assert await cache.get(resume, "pdf") is None
+    assert await cache.get(resume, "docx") is None
+    assert await cache.get(make_resume(id=8), "pdf") == b"other"
+    assert set(cache._keys_by_resume) == {8}
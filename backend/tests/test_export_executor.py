@@ -0,0 +1,52 @@
+import asyncio
+import os
+import sys
+import time
+
+import pytest
+
+from app.core.exceptions import ServiceUnavailableError
+from app.services.export_executor import ExportExecutor
+
+
+@pytest.fixture(scope="module")
+def executor(tmp_path_factory):
+    # Spawned workers import jobs as app.*; they inherit sys.path but not
+    # the conftest alias, so expose the checkout under that name.
+    backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    path = tmp_path_factory.mktemp("worker_path")
+    os.symlink(backend_dir, path / "app")
+    sys.path.insert(0, str(path))
+    executor = ExportExecutor(max_workers=1, queue_size=2, job_timeout=30)
+    yield executor
+    executor.shutdown()
+    sys.path.remove(str(path))
+
+
+async def test_runs_jobs(executor):
+    assert await executor.run(abs, -3) == 3
+    assert executor.pending == 0
+
+
+async def test_crashed_worker_replaces_the_pool(executor):
+    assert await executor.run(abs, -1) == 1
+    crashed = executor._pool
+    with pytest.raises(ServiceUnavailableError) as e:
+        await executor.run(os._exit, 1)
+    assert e.value.status_code == 503 and "Retry-After" in e.value.headers
+    assert executor._pool is None and executor.pending == 0
+    # The next job gets a fresh pool instead of BrokenProcessPool.
+    assert await executor.run(abs, -3) == 3
+    assert executor._pool is not crashed
+
+
+async def test_cancelled_callers_keep_their_running_job_counted(executor):
+    await executor.run(abs, 0)  # start the worker
+    running = asyncio.ensure_future(executor.run(time.sleep, 0.5))
+    await asyncio.sleep(0.2)
+    running.cancel()
+    await asyncio.sleep(0.05)
+    # The worker is still busy with the job its caller gave up on.
+    assert executor.pending == 1
+    await asyncio.sleep(0.6)
+    assert executor.pending == 0
@@ -0,0 +1,53 @@
+import io
+
+import pytest
+from pypdf import PdfReader
+
+from app.services.export_service import ExportService
+from app.services.layout_estimator import LayoutEstimator
+from app.services.template_registry import TemplateRegistry
+
+from conftest import make_resume
+
+SIZES = {
+    "minimal": dict(experiences=0, educations=0, skills=0, languages=0, certificates=0, summary_sentences=0),
+    "typical": dict(),
+    "large": dict(experiences=15, educations=3, skills=30, languages=4, certificates=10, summary_sentences=12),
+    "heavy": dict(experiences=50, educations=5, skills=60, languages=6, certificates=30, summary_sentences=40),
+}
+
+
+@pytest.fixture(scope="module")
+def estimator():
+    registry = TemplateRegistry()
+    registry.warm_up()
+    return LayoutEstimator(registry)
+
+
+def _pages(pdf: bytes) -> int:
+    return len(PdfReader(io.BytesIO(pdf)).pages)
+
+
+@pytest.mark.slow
+@pytest.mark.parametrize("template", [None, "cba2"])
+@pytest.mark.parametrize("profile", list(SIZES))
+def test_page_count_matches_pdf(estimator, photo_hash, profile, template):
+    with_photo = profile in ("large", "heavy")
+    resume = make_resume(
+        template_name=template, photo_hash=photo_hash if with_photo else None, **SIZES[profile]
+    )
+    assert estimator.estimate(resume).page_count == _pages(ExportService.generate_pdf(resume))
+
+
+def test_sections_are_in_flow_order(estimator):
+    estimate = estimator.estimate(make_resume(**SIZES["large"]))
+    positions = [(s.start_page - 1) * estimate.page_height_pt + s.top_pt for s in estimate.sections]
+    assert positions == sorted(positions)
+    assert 0 < estimate.last_page_fill <= 1
+
+
+def test_estimate_grows_with_content(estimator):
+    small = estimator.estimate(make_resume(**SIZES["minimal"]))
+    large = estimator.estimate(make_resume(**SIZES["heavy"]))
+    assert small.page_count == 1
+    assert large.page_count > small.page_count
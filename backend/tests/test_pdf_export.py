@@ -0,0 +1,58 @@
+import io
+
+import pytest
+from pypdf import PdfReader
+from reportlab import rl_config
+from xhtml2pdf import pisa
+
+from app.services import pdf_engine
+from app.services.export_service import ExportService
+
+from conftest import make_resume
+
+
+@pytest.fixture
+def invariant():
+    """Make reportlab output reproducible (fixed document id and dates)."""
+    previous = rl_config.invariant
+    rl_config.invariant = 1
+    yield
+    rl_config.invariant = previous
+
+
+def _plain_pdf(resume) -> bytes:
+    buf = io.BytesIO()
+    assert not pisa.CreatePDF(io.StringIO(ExportService.render_html(resume)), dest=buf).err
+    return buf.getvalue()
+
+
+@pytest.mark.parametrize("template", [None, "cba2"])
+def test_pdf_contains_resume(photo_hash, template):
+    resume = make_resume(template_name=template, photo_hash=photo_hash)
+    reader = PdfReader(io.BytesIO(ExportService.generate_pdf(resume)))
+    text = " ".join(page.extract_text() for page in reader.pages)
+    for value in ("Jane", "Senior Backend Engineer", "Company 3", "University 0", "Certificate 1"):
+        assert value in text
+
+
+def test_style_caching_is_supported():
+    # Fails when a new xhtml2pdf pin moves the internals pdf_engine copies;
+    # rendering would silently fall back to the uncached path.
+    assert pdf_engine.STYLE_CACHING
+
+
+@pytest.mark.parametrize("color", [None, "#7a1f1f"])
+@pytest.mark.parametrize("template", [None, "cba2"])
+def test_cached_styles_match_plain_pisa_render(invariant, photo_hash, template, color):
+    resume = make_resume(template_name=template, photo_hash=photo_hash, color_hex=color)
+    expected = _plain_pdf(resume)
+    pdf_engine.stylesheet_cache.clear()
+    misses = pdf_engine.stylesheet_cache.misses
+    assert ExportService.generate_pdf(resume) == expected
+    assert pdf_engine.stylesheet_cache.misses == misses + 1
+    # Renders of other resumes in between must not leak state into a hit.
+    ExportService.generate_pdf(make_resume(template_name=template, experiences=12, color_hex="#1f7a3a"))
+    ExportService.generate_pdf(make_resume(template_name="cba2" if template is None else None))
+    hits = pdf_engine.stylesheet_cache.hits
+    assert ExportService.generate_pdf(resume) == expected
+    assert pdf_engine.stylesheet_cache.hits == hits + 1
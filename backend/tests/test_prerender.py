@@ -0,0 +1,73 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.schemas.export import ResumeDocument
+from app.services.prerender import SpeculativeRenderer
+
+from conftest import make_resume
+
+
+class FakeExecutor:
+    def __init__(self, max_workers: int = 2, pending: int = 0):
+        self.max_workers = max_workers
+        self.pending = pending
+        self.sources = []
+
+    async def run(self, fn, source, fmt):
+        self.sources.append((fmt, source))
+        return fn(source, fmt)
+
+
+class FakeCache:
+    def __init__(self, cached=()):
+        self.stored = {fmt: b"" for fmt in cached}
+
+    async def contains(self, snapshot, fmt):
+        return fmt in self.stored
+
+    async def put(self, snapshot, fmt, data, speculative=False):
+        assert speculative
+        self.stored[fmt] = data
+
+
+def _renderer(executor, cache, formats):
+    resume = make_resume()
+
+    class Uow:
+        cv = SimpleNamespace(get_resume=lambda resume_id, user_id: asyncio.sleep(0, resume))
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, *exc):
+            return False
+
+    return SpeculativeRenderer(Uow, executor, cache, formats=formats, delay=0)
+
+
+async def test_formats_render_in_parallel_from_one_document():
+    executor, cache = FakeExecutor(), FakeCache()
+    await _renderer(executor, cache, ["pdf", "docx", "markdown"])._run(1, 1)
+    assert set(cache.stored) == {"pdf", "docx", "markdown"}
+    assert cache.stored["pdf"].startswith(b"%PDF")
+    # Only the pooled formats go through the executor, sharing a document.
+    assert [fmt for fmt, _ in executor.sources] == ["pdf", "docx"]
+    pdf_source, docx_source = (source for _, source in executor.sources)
+    assert isinstance(pdf_source, ResumeDocument) and pdf_source is docx_source
+
+
+async def test_only_idle_workers_and_uncached_formats_are_used():
+    executor, cache = FakeExecutor(max_workers=2, pending=1), FakeCache(cached=["pdf"])
+    await _renderer(executor, cache, ["pdf", "docx", "txt"])._run(1, 1)
+    assert [fmt for fmt, _ in executor.sources] == ["docx"]
+    assert set(cache.stored) == {"pdf", "docx", "txt"}
+
+    executor, cache = FakeExecutor(max_workers=2, pending=1), FakeCache()
+    await _renderer(executor, cache, ["pdf", "docx"])._run(1, 1)
+    assert set(cache.stored) == {"pdf"}
+
+
+async def test_busy_pool_is_skipped():
+    executor, cache = FakeExecutor(max_workers=2, pending=2), FakeCache()
+    await _renderer(executor, cache, ["pdf"])._run(1, 1)
+    assert not executor.sources and not cache.stored
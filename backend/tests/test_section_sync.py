@@ -0,0 +1,45 @@
+from types import SimpleNamespace
+
+from app.repositories.section_sync import _match
+
+
+def _rows(*ids):
+    # As sync_section loads them: in display order.
+    return [SimpleNamespace(id=row_id, name=f"row {row_id}") for row_id in ids]
+
+
+def _ids(matches):
+    return [row.id if row is not None else None for row in matches]
+
+
+def test_items_match_their_rows_by_id():
+    rows = _rows(1, 2, 3)
+    # Reordered by the client: each item keeps its own row.
+    assert _ids(_match(rows, [{"id": 3}, {"id": 1}, {"id": 2}])) == [3, 1, 2]
+
+
+def test_duplicated_id_matches_once():
+    rows = _rows(1, 2)
+    # The second copy is new; row 2 is not handed to it and gets deleted.
+    assert _ids(_match(rows, [{"id": 1}, {"id": 1}])) == [1, None]
+
+
+def test_unknown_id_is_inserted_not_given_a_free_row():
+    rows = _rows(1, 2)
+    # 99 is a deleted row or one of another resume: it must not take row 2.
+    assert _ids(_match(rows, [{"id": 1}, {"id": 99}])) == [1, None]
+    assert _ids(_match(rows, [{"id": 99}])) == [None]
+
+
+def test_items_without_id_take_free_rows_by_position():
+    rows = _rows(1, 2, 3)
+    assert _ids(_match(rows, [{}, {}])) == [1, 2]
+    assert _ids(_match(rows, [{}, {}, {}, {}])) == [1, 2, 3, None]
+    # Rows claimed by id are skipped by the positional fallback.
+    assert _ids(_match(rows, [{}, {"id": 1}, {"id": None}])) == [2, 1, 3]
+
+
+def test_empty_list_matches_nothing():
+    # No row is kept, so sync_section deletes them all.
+    assert _match(_rows(1, 2, 3), []) == []
+    assert _match([], [{}, {"id": 5}]) == [None, None]
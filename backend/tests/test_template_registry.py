@@ -0,0 +1,49 @@
+import pytest
+from pydantic import ValidationError
+
+from app.schemas.cv import ResumePatch, TemplateUpdate
+from app.services.export_service import ExportService
+from app.services.template_registry import DEFAULT_COLOR
+
+from conftest import make_resume
+
+
+def test_user_fields_are_escaped():
+    resume = make_resume(
+        first_name="<script>alert(1)</script>",
+        summary='<img src=x onerror="alert(2)">',
+        color_hex="red}</style><script>alert(document.cookie)</script><style>",
+    )
+    for html in (ExportService.render_preview(resume), ExportService.render_html(resume)):
+        assert "<script>alert(1)" not in html
+        assert "&lt;script&gt;alert(1)&lt;/script&gt;" in html
+        assert "<img src=x" not in html
+        assert "<script>alert(document.cookie)" not in html
+        assert "alert(document.cookie)" not in html
+        assert DEFAULT_COLOR in html
+
+
+def test_template_update_rejects_invalid_colors():
+    assert TemplateUpdate(color_hex="#1f4E79").color_hex == "#1f4E79"
+    for value in ("red", "#12345", "#1234567", "red}</style><script>", "#12345g"):
+        with pytest.raises(ValidationError):
+            TemplateUpdate(color_hex=value)
+    with pytest.raises(ValidationError):
+        ResumePatch.model_validate({"template": {"color_hex": "red}</style>"}})
+
+
+def test_preview_and_pdf_photos_are_cached_separately(photo_hash):
+    resume = make_resume(photo_hash=photo_hash)
+    # Rendering one first must not hand its header to the other.
+    preview = ExportService.render_preview(resume)
+    html = ExportService.render_html(resume)
+    assert "data:image/jpeg;base64," in html
+    assert "data:image/" not in preview
+    assert f"/resumes/photos/{photo_hash}/print.jpg" in preview
+    assert ExportService.render_preview(resume) == preview
+
+
+def test_missing_photo_is_not_cached(photo_hash):
+    missing = make_resume(photo_hash="0" * len(photo_hash))
+    assert "data:image/" not in ExportService.render_html(missing)
+    assert "data:image/" in ExportService.render_html(make_resume(photo_hash=photo_hash))